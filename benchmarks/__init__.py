@@ -0,0 +1 @@
+"""Offline benchmarks for the datasheet pipeline (see benchmarks/run.py)."""
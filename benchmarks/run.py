@@ -0,0 +1,415 @@
+#!/usr/bin/env python3
+"""
+Datasheet pipeline benchmark
+
+Runs detection, content extraction and filtering, LLM pin extraction,
+vision layout extraction, package normalization and the schematic build
+over a corpus of PDFs, with the LLM and vision endpoints answered from
+recorded responses (see benchmarks/standins.py), either in-process or over
+HTTP from the stand-in server (--server). Every datasheet runs in a
+fresh process, which reports wall time, CPU time, peak RSS and per-stage
+times; results are compared against a stored baseline JSON.
+
+The schematic stage is skipped when CadQuery is not installed.
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_CORPUS = REPO_ROOT / "pdfs"
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+
+# Stages (span name: column label) reported and compared against the baseline
+STAGES = {
+    "detect": "detect",
+    "extract": "extract",
+    "extract.filter": "filter",
+    "extract.pack": "pack",
+    "extract.pin_table": "table",
+    "llm.extract_pin_data": "llm",
+    "layout": "layout",
+    "normalize_package": "normalize",
+    "schematic": "schematic",
+}
+
+# Relative slowdown that counts as a regression
+DEFAULT_TOLERANCE = 0.25
+
+# Differences below these are noise, whatever the ratio
+MIN_SECONDS_DELTA = 0.05
+MIN_RSS_DELTA_MB = 10.0
+
+
+def find_pdfs(corpus: Path, only: Optional[List[str]] = None) -> List[Path]:
+    """
+    List the corpus PDFs (any case of the .pdf extension), sorted by name.
+
+    Args:
+        corpus: Directory of PDFs
+        only: Optional file stems to keep
+
+    Returns:
+        List of PDF paths
+    """
+    pdfs = sorted(p for p in corpus.iterdir() if p.suffix.lower() == ".pdf")
+    if only:
+        pdfs = [p for p in pdfs if p.stem in only]
+    return pdfs
+
+
+def _peak_rss_mb() -> float:
+    """Peak resident set size of this process, in MB."""
+    import resource
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_datasheet(
+    pdf_path: str,
+    min_confidence: int = 5,
+    prefilter_min_score: int = 2,
+    use_server: bool = False
+) -> Dict[str, Any]:
+    """
+    Run every pipeline stage on one datasheet (called in a fresh process).
+
+    Args:
+        pdf_path: PDF to process
+        min_confidence: Page detection threshold
+        prefilter_min_score: Page detection prefilter threshold
+        use_server: Send requests to the endpoints in the environment (the
+                    stand-in server) instead of answering them in-process
+
+    Returns:
+        Metrics dict with wall, cpu, peak_rss_mb, stages and outcome fields
+    """
+    from contextlib import nullcontext
+
+    from benchmarks.standins import load_recording, standins
+    from src.llm import LLMClient
+    from src.main_layout import parse_layout_text, run_layout_extraction
+    from src.pdf_extractor import (
+        ContentExtractor,
+        ContentPacker,
+        DatasheetDocument,
+        PageDetector,
+        PinTableParser,
+    )
+    from src.utils import PackageDetector, tracing
+
+    recording = load_recording(Path(pdf_path).stem)
+    has_cadquery = importlib.util.find_spec("cadquery") is not None
+    result = {"pdf": Path(pdf_path).name, "recording": recording.name}
+
+    tracing.enable()
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+
+    with nullcontext() if use_server else standins(recording):
+        with DatasheetDocument(pdf_path) as document:
+            candidates = PageDetector(document).detect_relevant_pages(
+                min_confidence=min_confidence,
+                prefilter_min_score=prefilter_min_score
+            )
+            result["pages"] = [c.page_number for c in candidates]
+
+            if candidates:
+                content = ContentExtractor(document).extract_content(candidates)
+                packed = ContentPacker().pack(content, candidates)
+                pin_data = PinTableParser().parse(content).pin_data
+                result["pin_table"] = pin_data is not None
+                if pin_data is None:
+                    pin_data = LLMClient(api_key="standin").extract_pin_data(packed.text)
+                layout_text = run_layout_extraction(
+                    document, candidates[0].page_number, False, None, None, False
+                )
+
+        if candidates:
+            with tracing.span("normalize_package"):
+                pin_data.package.type = PackageDetector().normalize_package_name(pin_data.package.type)
+
+            layout = parse_layout_text(layout_text) if layout_text else {}
+            custom_layout = {
+                name: section["pins"] for name, section in layout.get("sections", {}).items()
+            } or None
+            result["pins"] = len(pin_data.pins)
+
+            if has_cadquery:
+                from src.schematic_generator import build_schematic_from_pin_data
+
+                with tempfile.TemporaryDirectory() as tmp_dir, \
+                        tracing.span("schematic", "cad", pins=len(pin_data.pins)):
+                    result["schematic_ok"] = build_schematic_from_pin_data(
+                        pin_data=pin_data,
+                        output_path=str(Path(tmp_dir) / "out.glb"),
+                        custom_layout=custom_layout
+                    )
+
+    result.update({
+        "wall": time.perf_counter() - wall_start,
+        "cpu": time.process_time() - cpu_start,
+        "peak_rss_mb": _peak_rss_mb(),
+        "stages": {row["name"]: row["total"] for row in tracing.get_tracer().summary()},
+        "schematic_skipped": not has_cadquery,
+    })
+    return result
+
+
+def _run_isolated(pdf_path: Path, args) -> Dict[str, Any]:
+    """Run one datasheet in a freshly spawned process so RSS and imports are its own."""
+    with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+        return pool.submit(
+            run_datasheet, str(pdf_path), args.min_confidence, args.prefilter_min_score, args.server
+        ).result()
+
+
+def aggregate(runs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Combine repeated runs of one datasheet.
+
+    Times are medians; peak RSS is the maximum.
+    """
+    combined = dict(runs[-1])
+    combined["runs"] = len(runs)
+    combined["wall"] = statistics.median(r["wall"] for r in runs)
+    combined["cpu"] = statistics.median(r["cpu"] for r in runs)
+    combined["peak_rss_mb"] = max(r["peak_rss_mb"] for r in runs)
+    stage_names = {name for r in runs for name in r["stages"]}
+    combined["stages"] = {
+        name: statistics.median(r["stages"].get(name, 0.0) for r in runs)
+        for name in sorted(stage_names)
+    }
+    return combined
+
+
+def compare_to_baseline(
+    results: Dict[str, Dict[str, Any]],
+    baseline: Dict[str, Dict[str, Any]],
+    tolerance: float = DEFAULT_TOLERANCE
+) -> List[str]:
+    """
+    Find metrics that got worse than the baseline by more than the tolerance.
+
+    Args:
+        results: Current results keyed by PDF name
+        baseline: Baseline results keyed by PDF name
+        tolerance: Allowed relative increase (0.25 = 25%)
+
+    Returns:
+        One message per regression
+    """
+    regressions = []
+
+    def check(pdf: str, metric: str, current: float, previous: float, min_delta: float, unit: str):
+        if current - previous > min_delta and current > previous * (1 + tolerance):
+            regressions.append(
+                f"{pdf}: {metric} {previous:.3f}{unit} -> {current:.3f}{unit} "
+                f"(+{100 * (current / previous - 1) if previous else float('inf'):.0f}%)"
+            )
+
+    for pdf, current in results.items():
+        previous = baseline.get(pdf)
+        if previous is None:
+            continue
+        check(pdf, "wall", current["wall"], previous["wall"], MIN_SECONDS_DELTA, "s")
+        check(pdf, "cpu", current["cpu"], previous["cpu"], MIN_SECONDS_DELTA, "s")
+        check(pdf, "peak_rss", current["peak_rss_mb"], previous["peak_rss_mb"], MIN_RSS_DELTA_MB, "MB")
+        for stage in STAGES:
+            if stage in current["stages"] and stage in previous.get("stages", {}):
+                check(
+                    pdf, stage, current["stages"][stage], previous["stages"][stage],
+                    MIN_SECONDS_DELTA, "s"
+                )
+
+    return regressions
+
+
+def format_results(results: Dict[str, Dict[str, Any]]) -> str:
+    """Format results as a table (one row per datasheet)."""
+    header = ["PDF", "Wall s", "CPU s", "RSS MB"] + [f"{label} ms" for label in STAGES.values()]
+    rows = []
+    for pdf, r in results.items():
+        rows.append(
+            [pdf, f"{r['wall']:.2f}", f"{r['cpu']:.2f}", f"{r['peak_rss_mb']:.0f}"]
+            + [f"{1000 * r['stages'][s]:.0f}" if s in r["stages"] else "-" for s in STAGES]
+        )
+    widths = [max(len(row[i]) for row in [header] + rows) for i in range(len(header))]
+    lines = ["  ".join(
+        cell.ljust(widths[i]) if i == 0 else cell.rjust(widths[i]) for i, cell in enumerate(row)
+    ) for row in [header] + rows]
+    lines.insert(1, "-" * len(lines[0]))
+    return "\n".join(lines)
+
+
+def parse_arguments():
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark the pipeline over a PDF corpus with recorded LLM/vision responses",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Whole corpus, compare against benchmarks/baseline.json
+  python -m benchmarks.run
+
+  # Two datasheets, three runs each, then store the result as the new baseline
+  python -m benchmarks.run --only NE555 MC74HC595A --repeat 3 --update-baseline
+        """
+    )
+
+    parser.add_argument(
+        "--corpus",
+        default=str(DEFAULT_CORPUS),
+        help="Directory of PDFs (default: %(default)s)"
+    )
+
+    parser.add_argument(
+        "--only",
+        nargs="+",
+        help="Only benchmark these PDFs (file names without extension)"
+    )
+
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=1,
+        help="Runs per datasheet; times are medians (default: %(default)s)"
+    )
+
+    parser.add_argument(
+        "--baseline",
+        default=str(DEFAULT_BASELINE),
+        help="Baseline JSON to compare against (default: %(default)s)"
+    )
+
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="Write this run's results to the baseline file"
+    )
+
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help="Relative slowdown reported as a regression (default: %(default)s)"
+    )
+
+    parser.add_argument(
+        "--output",
+        help="Also write this run's results to a JSON file"
+    )
+
+    parser.add_argument(
+        "--server",
+        action="store_true",
+        help="Serve the recordings over HTTP with the stand-in server, so the "
+             "real LLM and vision clients are exercised"
+    )
+
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.0,
+        help="Stand-in server seconds per request (with --server)"
+    )
+
+    parser.add_argument(
+        "--min-confidence",
+        type=int,
+        default=5,
+        help="Minimum confidence score for page detection (default: %(default)s)"
+    )
+
+    parser.add_argument(
+        "--prefilter-min-score",
+        type=int,
+        default=2,
+        help="Page detection prefilter threshold (default: %(default)s)"
+    )
+
+    return parser.parse_args()
+
+
+def main():
+    """Benchmark entry point."""
+    args = parse_arguments()
+
+    pdfs = find_pdfs(Path(args.corpus), args.only)
+    if not pdfs:
+        print(f"Error: No PDFs found in {args.corpus}")
+        sys.exit(1)
+
+    if importlib.util.find_spec("cadquery") is None:
+        print("Note: CadQuery is not installed; the schematic stage is skipped")
+
+    server = None
+    if args.server:
+        from benchmarks.standin_server import StandinConfig, start_in_thread
+
+        server = start_in_thread(StandinConfig(latency=args.latency))
+        # Spawned workers inherit the environment
+        os.environ["DATASHEET_PARSER_LLM_BASE_URL"] = f"{server.base_url}/v1"
+        os.environ["DATASHEET_PARSER_VISION_URL"] = f"{server.base_url}/describe_image/"
+        os.environ.setdefault("FASTCHAT_API_KEY", "standin")
+        print(f"Stand-in server on {server.base_url}")
+
+    results = {}
+    for pdf in pdfs:
+        print(f"Benchmarking {pdf.name}...", flush=True)
+        runs = [_run_isolated(pdf, args) for _ in range(args.repeat)]
+        results[pdf.name] = aggregate(runs)
+
+    if server is not None:
+        server.shutdown()
+        server.server_close()
+
+    print()
+    print(format_results(results))
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": results,
+    }
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+
+    baseline_path = Path(args.baseline)
+    regressions = []
+    if baseline_path.exists():
+        baseline = json.loads(baseline_path.read_text(encoding="utf-8"))["results"]
+        regressions = compare_to_baseline(results, baseline, args.tolerance)
+        print()
+        if regressions:
+            print(f"{len(regressions)} regression(s) against {baseline_path}:")
+            for message in regressions:
+                print(f"  {message}")
+        else:
+            print(f"No regressions against {baseline_path}")
+    elif not args.update_baseline:
+        print(f"\nNo baseline at {baseline_path} (create one with --update-baseline)")
+
+    if args.update_baseline:
+        baseline_path.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+        print(f"Baseline written to {baseline_path}")
+    elif regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
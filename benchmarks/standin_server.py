@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""
+Stand-in LLM and vision server
+
+Local HTTP server that speaks the subset of the upstream APIs the pipeline
+uses, answering from the recordings in benchmarks/recordings:
+
+    POST /v1/chat/completions   OpenAI chat completions (chat_bot.py)
+    POST /describe_image/       Multipart image + prompt (ImageOCRClient)
+    GET  /stats                 Request and injected-error counts
+
+Latency and errors can be injected to load test the clients' concurrency
+and retry handling. Point the pipeline at it with:
+
+    export DATASHEET_PARSER_LLM_BASE_URL=http://127.0.0.1:8800/v1
+    export DATASHEET_PARSER_VISION_URL=http://127.0.0.1:8800/describe_image/
+
+Chat requests get the recording whose part number appears in the prompt
+(default.json if none does). Vision requests carry no part number unless
+the prompt names a target component, so they otherwise get the most
+recently matched recording.
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from benchmarks.standins import RECORDINGS_DIR, Recording, list_recordings, load_recording
+from src.utils.tokens import estimate_tokens
+
+
+@dataclass
+class StandinConfig:
+    """Latency and error injection settings."""
+
+    latency: float = 0.0  # Seconds per chat completion
+    vision_latency: Optional[float] = None  # Seconds per vision request (latency if None)
+    jitter: float = 0.0  # Uniform +/- seconds added to each delay
+    error_rate: float = 0.0  # Fraction of requests answered with error_status
+    error_status: int = 503
+    fail_first: int = 0  # Answer the first N requests with error_status
+    seed: Optional[int] = None
+
+
+class RecordingIndex:
+    """Picks the recording that matches a prompt."""
+
+    def __init__(self, recordings_dir: Union[str, Path] = RECORDINGS_DIR):
+        self.default = load_recording("default", recordings_dir)
+        # Match on file names and component names, longest first so that
+        # "MC74HC595A" wins over a shorter key it contains
+        keys: List[Tuple[str, Recording]] = []
+        for recording in list_recordings(recordings_dir):
+            keys.append((recording.name.upper(), recording))
+            try:
+                component = json.loads(recording.chat).get("component_name")
+            except (ValueError, AttributeError):
+                component = None
+            if component and component != "Unknown":
+                keys.append((component.upper(), recording))
+        self._keys = sorted(keys, key=lambda item: len(item[0]), reverse=True)
+        self._last = self.default
+        self._lock = threading.Lock()
+
+    def match(self, text: str) -> Optional[Recording]:
+        """Recording whose key occurs in the text, or None."""
+        upper = text.upper()
+        for key, recording in self._keys:
+            if key in upper:
+                return recording
+        return None
+
+    def _remember(self, recording: Recording) -> Recording:
+        with self._lock:
+            self._last = recording
+        return recording
+
+    def for_chat(self, text: str) -> Recording:
+        """Recording for a chat prompt (remembered for later vision requests)."""
+        return self._remember(self.match(text) or self.default)
+
+    def for_vision(self, prompt: str) -> Recording:
+        """Recording for a vision prompt: its target component, else the last match."""
+        target = re.search(r"Target component:\s*(\S+)", prompt)
+        if target:
+            return self._remember(self.match(target.group(1)) or self.default)
+        with self._lock:
+            return self._last
+
+
+def chat_answer(messages: List[Dict[str, Any]], index: RecordingIndex) -> str:
+    """
+    Build the assistant reply for a chat request.
+
+    Page verification prompts get YES verdicts; everything else gets the
+    matching recording's pin data.
+    """
+    text = "\n".join(str(m.get("content") or "") for m in messages)
+
+    if "Page <number>: YES" in text:
+        pages = sorted({int(n) for n in re.findall(r"--- Page (\d+) ---", text)})
+        return "\n".join(f"Page {page}: YES" for page in pages)
+    if 'Answer with either "YES" or "NO"' in text:
+        return "YES - stand-in verdict"
+
+    return index.for_chat(text).chat
+
+
+def vision_answer(prompt: str, index: RecordingIndex) -> Dict[str, Any]:
+    """
+    Build the describe_image reply.
+
+    Pinout prompts (which ask for JSON) get the recording's pins in the
+    extraction format; layout prompts get its layout description.
+    """
+    recording = index.for_vision(prompt)
+    if "Return ONLY valid JSON" not in prompt:
+        return {"description": recording.vision}
+
+    data = json.loads(recording.chat)
+    package = data.get("package", {})
+    return {
+        "description": {
+            "component_name": data.get("component_name", ""),
+            "package_type": f"{package.get('type', '')}-{package.get('pin_count', 0)}",
+            "pin_count": package.get("pin_count", 0),
+            "pins": data.get("pins", []),
+            "extraction_confidence": 0.95,
+            "notes": "stand-in response",
+        }
+    }
+
+
+class StandinServer(ThreadingHTTPServer):
+    """HTTP server holding the recordings, settings and counters."""
+
+    daemon_threads = True
+
+    def __init__(self, address, config: Optional[StandinConfig] = None,
+                 recordings_dir: Union[str, Path] = RECORDINGS_DIR):
+        super().__init__(address, StandinHandler)
+        self.config = config or StandinConfig()
+        self.index = RecordingIndex(recordings_dir)
+        self.random = random.Random(self.config.seed)
+        self.stats = {"chat": 0, "vision": 0, "errors": 0}
+        self._lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        """Root URL of the running server."""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def admit(self, kind: str) -> Tuple[bool, float]:
+        """
+        Count a request and decide its fate.
+
+        Returns:
+            Tuple of (inject_error, delay_seconds)
+        """
+        config = self.config
+        with self._lock:
+            self.stats[kind] += 1
+            total = self.stats["chat"] + self.stats["vision"]
+            fail = total <= config.fail_first or self.random.random() < config.error_rate
+            if fail:
+                self.stats["errors"] += 1
+            delay = config.latency
+            if kind == "vision" and config.vision_latency is not None:
+                delay = config.vision_latency
+            if config.jitter:
+                delay = max(0.0, delay + self.random.uniform(-config.jitter, config.jitter))
+        return fail, delay
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def _send_json(self, status: int, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_injected_error(self):
+        status = self.server.config.error_status
+        headers = {"Retry-After": "0"} if status in (429, 503) else None
+        error = {"message": "Injected stand-in error", "type": "standin_error"}
+        self._send_json(status, {"error": error}, headers)
+
+    def _read_body(self) -> bytes:
+        return self.rfile.read(int(self.headers.get("Content-Length") or 0))
+
+    def do_GET(self):
+        if self.path.rstrip("/") == "/stats":
+            return self._send_json(200, dict(self.server.stats))
+        self._send_json(404, {"error": {"message": "Not found"}})
+
+    def do_POST(self):
+        path = self.path.split("?")[0].rstrip("/")
+        body = self._read_body()
+
+        if path.endswith("/chat/completions"):
+            return self._chat(body)
+        if path == "/describe_image":
+            return self._vision(body)
+        self._send_json(404, {"error": {"message": "Not found"}})
+
+    def _chat(self, body: bytes):
+        fail, delay = self.server.admit("chat")
+        time.sleep(delay)
+        if fail:
+            return self._send_injected_error()
+
+        try:
+            request = json.loads(body or b"{}")
+        except ValueError:
+            return self._send_json(400, {"error": {"message": "Invalid JSON"}})
+
+        messages = request.get("messages") or []
+        content = chat_answer(messages, self.server.index)
+        prompt_tokens = estimate_tokens("\n".join(str(m.get("content") or "") for m in messages))
+        completion_tokens = estimate_tokens(content)
+        self._send_json(200, {
+            "id": f"chatcmpl-{uuid.uuid4().hex}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "standin"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        })
+
+    def _vision(self, body: bytes):
+        from src.service import parse_multipart
+
+        fail, delay = self.server.admit("vision")
+        time.sleep(delay)
+        if fail:
+            return self._send_injected_error()
+
+        form = parse_multipart(body, self.headers.get("Content-Type", ""))
+        if not isinstance(form.get("file"), bytes):
+            return self._send_json(422, {"detail": 'Missing "file" upload'})
+        self._send_json(200, vision_answer(form.get("text", ""), self.server.index))
+
+    def log_message(self, format, *args):
+        if getattr(self.server, "verbose", False):
+            super().log_message(format, *args)
+
+
+def start_in_thread(
+    config: Optional[StandinConfig] = None, host: str = "127.0.0.1", port: int = 0
+) -> StandinServer:
+    """
+    Start a stand-in server on a background thread.
+
+    Args:
+        config: Latency and error settings
+        host: Address to bind
+        port: Port (0 picks a free one)
+
+    Returns:
+        Running StandinServer (call shutdown() and server_close() to stop)
+    """
+    server = StandinServer((host, port), config)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def parse_arguments():
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Serve recorded LLM and vision responses for offline load testing",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # 500 ms per LLM call, 2 s per vision call, 10% of requests fail with 503
+  python -m benchmarks.standin_server --latency 0.5 --vision-latency 2 --error-rate 0.1
+        """
+    )
+
+    parser.add_argument("--host", default="127.0.0.1", help="Address to bind (default: %(default)s)")
+    parser.add_argument("--port", type=int, default=8800, help="Port to listen on (default: %(default)s)")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds per chat completion")
+    parser.add_argument("--vision-latency", type=float, help="Seconds per vision request (default: --latency)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Random +/- seconds added to each delay")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests that fail")
+    parser.add_argument("--error-status", type=int, default=503, help="Status of injected errors (default: %(default)s)")
+    parser.add_argument("--fail-first", type=int, default=0, help="Fail the first N requests")
+    parser.add_argument("--seed", type=int, help="Random seed for jitter and errors")
+    parser.add_argument("--verbose", "-v", action="store_true", help="Log requests")
+
+    return parser.parse_args()
+
+
+def main():
+    """Stand-in server entry point."""
+    args = parse_arguments()
+    config = StandinConfig(
+        latency=args.latency,
+        vision_latency=args.vision_latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        fail_first=args.fail_first,
+        seed=args.seed,
+    )
+
+    server = StandinServer((args.host, args.port), config)
+    server.verbose = args.verbose
+    print(f"Stand-in server on {server.base_url}")
+    print(f"  export DATASHEET_PARSER_LLM_BASE_URL={server.base_url}/v1")
+    print(f"  export DATASHEET_PARSER_VISION_URL={server.base_url}/describe_image/")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
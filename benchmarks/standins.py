@@ -0,0 +1,131 @@
+"""
+Recorded-response stand-ins for the LLM and vision endpoints.
+
+Each datasheet in the corpus can have a recording in benchmarks/recordings
+named after the PDF (e.g. NE555.json) holding the chat completion and the
+vision layout description returned for it; datasheets without one use
+default.json. While standins() is active the clients answer from the
+recording instead of the network, so benchmarks run offline and always see
+the same responses.
+"""
+
+import json
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional, Union
+
+RECORDINGS_DIR = Path(__file__).parent / "recordings"
+
+
+@dataclass
+class Recording:
+    """Recorded endpoint responses for one datasheet."""
+
+    name: str
+    chat: str  # Chat completion content (pin data JSON)
+    vision: str  # describe_image "description" text (layout)
+
+
+def load_recording(name: str, recordings_dir: Union[str, Path] = RECORDINGS_DIR) -> Recording:
+    """
+    Load the recording for a datasheet.
+
+    Args:
+        name: Datasheet name (PDF file stem)
+        recordings_dir: Directory of recording JSON files
+
+    Returns:
+        Recording for the datasheet, or the default recording
+    """
+    recordings_dir = Path(recordings_dir)
+    path = recordings_dir / f"{name}.json"
+    if not path.exists():
+        path = recordings_dir / "default.json"
+
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+
+    chat = data["chat"]
+    return Recording(
+        name=path.stem,
+        chat=chat if isinstance(chat, str) else json.dumps(chat, indent=2),
+        vision=data.get("vision", ""),
+    )
+
+
+def list_recordings(recordings_dir: Union[str, Path] = RECORDINGS_DIR) -> List[Recording]:
+    """Load every recording except the default one."""
+    return [
+        load_recording(path.stem, recordings_dir)
+        for path in sorted(Path(recordings_dir).glob("*.json"))
+        if path.stem != "default"
+    ]
+
+
+class RecordedResponse:
+    """Minimal requests.Response stand-in for the describe_image endpoint."""
+
+    def __init__(self, payload: dict, status_code: int = 200):
+        self.status_code = status_code
+        self.text = json.dumps(payload)
+        self.content = self.text.encode("utf-8")
+
+    def json(self):
+        return json.loads(self.text)
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            import requests
+            raise requests.HTTPError(f"{self.status_code} Error", response=self)
+
+
+@contextmanager
+def standins(recording: Recording, latency: float = 0.0, vision_latency: Optional[float] = None):
+    """
+    Answer LLM and vision requests from a recording.
+
+    Args:
+        recording: Responses to return
+        latency: Simulated seconds per chat completion
+        vision_latency: Simulated seconds per vision request (latency if None)
+    """
+    import asyncio
+
+    from src.llm import client as llm_client_module
+    from src.llm import page_verifier as page_verifier_module
+    from src.llm.image_ocr_client import ImageOCRClient
+    from src.utils import tracing
+
+    vision_latency = latency if vision_latency is None else vision_latency
+
+    def get_completion_from_messages(messages, model="llama-3", temperature=0, **kwargs):
+        time.sleep(latency)
+        return recording.chat
+
+    async def aget_completion_from_messages(messages, model="llama-3", temperature=0, **kwargs):
+        await asyncio.sleep(latency)
+        return recording.chat
+
+    def describe_image(self, image_data, prompt, output_token=None, filename=None):
+        # Same span as the real request so traces stay comparable
+        with tracing.span("vision.request", "vision", image_bytes=len(image_data)):
+            time.sleep(vision_latency)
+            return RecordedResponse({"description": recording.vision})
+
+    patches = [
+        (llm_client_module, "get_completion_from_messages", get_completion_from_messages),
+        (llm_client_module, "aget_completion_from_messages", aget_completion_from_messages),
+        (page_verifier_module, "get_completion_from_messages", get_completion_from_messages),
+        (page_verifier_module, "aget_completion_from_messages", aget_completion_from_messages),
+        (ImageOCRClient, "describe_image", describe_image),
+    ]
+    originals = [(target, attr, getattr(target, attr)) for target, attr, _ in patches]
+    for target, attr, replacement in patches:
+        setattr(target, attr, replacement)
+    try:
+        yield recording
+    finally:
+        for target, attr, original in originals:
+            setattr(target, attr, original)
@@ -0,0 +1,446 @@
+#!/usr/bin/env python3
+"""
+Datasheet Parser batch CLI
+
+Process a directory, glob or manifest of datasheets across a pool of worker
+processes, writing one status record per datasheet to a JSONL file.
+"""
+
+import argparse
+import contextlib
+import csv
+import glob
+import io
+import json
+import os
+import sys
+import time
+import traceback
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from . import config
+from .config import Settings
+from .pipeline import PipelineOptions, process_datasheet
+from .utils.tokens import DEFAULT_PROMPT_TOKEN_BUDGET
+
+# Batch CLI flags backed by settings (flag dest -> field)
+BATCH_ARG_FIELDS = {"model": "llm_model", "jobs": "batch_jobs"}
+
+
+@dataclass
+class BatchItem:
+    """One datasheet to process."""
+
+    pdf: str
+    output: str
+    part_number: Optional[str] = None
+
+
+def _resolve(path: str, base_dir: Path) -> str:
+    """Resolve a manifest path relative to the manifest's directory."""
+    candidate = Path(path).expanduser()
+    return str(candidate if candidate.is_absolute() else base_dir / candidate)
+
+
+def _read_manifest(manifest: Path) -> List[Dict[str, str]]:
+    """Read CSV or JSONL manifest rows with pdf/part_number/output fields."""
+    if manifest.suffix.lower() == ".csv":
+        with open(manifest, newline="", encoding="utf-8") as f:
+            return [dict(row) for row in csv.DictReader(f)]
+
+    rows = []
+    with open(manifest, encoding="utf-8") as f:
+        for line_num, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                rows.append(json.loads(line))
+            except ValueError as e:
+                raise ValueError(f"{manifest}:{line_num}: invalid JSON ({e})")
+    return rows
+
+
+def load_items(source: str, output_dir: Path) -> List[BatchItem]:
+    """
+    Build the list of datasheets to process.
+
+    Args:
+        source: Directory of PDFs, glob pattern, or .csv/.jsonl manifest
+                with "pdf" and optional "part_number" and "output" columns
+        output_dir: Directory for outputs not given by the manifest
+
+    Returns:
+        List of BatchItem objects
+    """
+    source_path = Path(source).expanduser()
+
+    if source_path.is_file() and source_path.suffix.lower() in (".csv", ".jsonl"):
+        base_dir = source_path.parent
+        rows = [
+            (
+                _resolve(row["pdf"], base_dir),
+                row.get("part_number") or None,
+                _resolve(row["output"], base_dir) if row.get("output") else None,
+            )
+            for row in _read_manifest(source_path)
+            if row.get("pdf")
+        ]
+    else:
+        if source_path.is_dir():
+            pdfs = [p for p in source_path.iterdir() if p.suffix.lower() == ".pdf"]
+        else:
+            pdfs = [Path(p) for p in glob.glob(source, recursive=True)]
+        rows = [(str(p), None, None) for p in sorted(pdfs) if p.is_file()]
+
+    # Default output names come from the PDF name; number repeats so outputs never collide
+    items = []
+    used = set()
+    for pdf, part_number, output in rows:
+        if output is None:
+            stem = Path(pdf).stem
+            output = str(output_dir / f"{stem}.glb")
+            suffix = 2
+            while output in used:
+                output = str(output_dir / f"{stem}-{suffix}.glb")
+                suffix += 1
+        used.add(output)
+        items.append(BatchItem(pdf=pdf, output=output, part_number=part_number))
+
+    return items
+
+
+def process_item(
+    item: BatchItem,
+    api_key: Optional[str],
+    options: PipelineOptions,
+    log_dir: Optional[str] = None
+) -> Dict:
+    """
+    Process one datasheet, turning any failure into an error record.
+
+    Runs in a worker process. Pipeline output is captured into a per-item
+    log file instead of interleaving on the console.
+
+    Args:
+        item: Datasheet to process
+        api_key: LLM API key
+        options: Pipeline settings
+        log_dir: Directory for per-item logs (None to discard output)
+
+    Returns:
+        Status record dict
+    """
+    record = asdict(item)
+    started = time.time()
+    log = io.StringIO()
+
+    try:
+        with contextlib.redirect_stdout(log):
+            result = process_datasheet(
+                item.pdf,
+                item.output,
+                api_key=api_key,
+                options=options,
+                part_number=item.part_number
+            )
+        pin_data = result.pin_data
+        record.update({
+            "status": "ok",
+            "component_name": pin_data.component_name,
+            "package": pin_data.package.type,
+            "pin_count": len(pin_data.pins),
+            "pages": result.pages,
+        })
+    except BaseException as e:  # Includes SystemExit from library code
+        if isinstance(e, KeyboardInterrupt):
+            raise
+        log.write(traceback.format_exc())
+        record.update({
+            "status": "error",
+            "error_type": type(e).__name__,
+            "error": str(e),
+        })
+
+    record["seconds"] = round(time.time() - started, 3)
+
+    if log_dir:
+        log_path = Path(log_dir) / f"{Path(item.output).stem}.log"
+        log_path.parent.mkdir(parents=True, exist_ok=True)
+        log_path.write_text(log.getvalue(), encoding="utf-8")
+        record["log"] = str(log_path)
+
+    return record
+
+
+def _crash_record(item: BatchItem, error: BaseException) -> Dict:
+    """Status record for an item whose worker process died."""
+    record = asdict(item)
+    record.update({
+        "status": "error",
+        "error_type": type(error).__name__,
+        "error": "Worker process crashed while processing this datasheet",
+        "seconds": None,
+    })
+    return record
+
+
+def run_batch(
+    items: List[BatchItem],
+    status_file: Path,
+    jobs: int,
+    api_key: Optional[str],
+    options: PipelineOptions,
+    log_dir: Optional[str] = None
+) -> Dict[str, int]:
+    """
+    Process datasheets across a process pool.
+
+    Each finished item is appended to status_file as one JSON line right
+    away, so a partial run still leaves a usable record. If a worker dies
+    (e.g. a crash inside OCC), the items that were in flight are rerun one
+    by one in fresh processes and only the culprit is recorded as crashed.
+
+    Args:
+        items: Datasheets to process
+        status_file: JSONL file to append status records to
+        jobs: Number of worker processes (1 runs in this process)
+        api_key: LLM API key
+        options: Pipeline settings
+        log_dir: Directory for per-item logs
+
+    Returns:
+        Counts of "ok" and "error" items
+    """
+    counts = {"ok": 0, "error": 0}
+    status_file.parent.mkdir(parents=True, exist_ok=True)
+
+    with open(status_file, "a", encoding="utf-8") as status:
+        def report(record: Dict) -> None:
+            counts[record["status"]] += 1
+            status.write(json.dumps(record) + "\n")
+            status.flush()
+            detail = record.get("component_name") if record["status"] == "ok" else record.get("error")
+            print(f"[{sum(counts.values())}/{len(items)}] {record['status']}: {record['pdf']} ({detail})")
+
+        if jobs <= 1:
+            for item in items:
+                report(process_item(item, api_key, options, log_dir))
+            return counts
+
+        # Workers start with this process's settings, CLI flags included
+        pool_options = {"initializer": config.configure, "initargs": (config.get_settings(),)}
+        queue = deque(items)
+        suspects = []
+        while queue or suspects:
+            if suspects:
+                # After a crash, rerun each item that was in flight on its own
+                # so only the one that kills its worker is reported as crashed
+                item = suspects.pop(0)
+                with ProcessPoolExecutor(max_workers=1, **pool_options) as pool:
+                    try:
+                        report(pool.submit(process_item, item, api_key, options, log_dir).result())
+                    except BrokenProcessPool as e:
+                        report(_crash_record(item, e))
+                continue
+
+            with ProcessPoolExecutor(max_workers=min(jobs, len(queue)), **pool_options) as pool:
+                # Keep at most one item per worker in flight, so a crash only
+                # leaves a handful of items unaccounted for
+                pending = {}
+                while queue or pending:
+                    while queue and len(pending) < jobs:
+                        item = queue.popleft()
+                        pending[pool.submit(process_item, item, api_key, options, log_dir)] = item
+
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    broken = False
+                    for future in done:
+                        item = pending.pop(future)
+                        try:
+                            report(future.result())
+                        except BrokenProcessPool:
+                            suspects.append(item)
+                            broken = True
+
+                    if broken:
+                        suspects.extend(pending.values())
+                        break
+
+    return counts
+
+
+def parse_arguments():
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Process many datasheets with a pool of worker processes",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Every PDF in a directory, 4 workers
+  python -m src.batch datasheets/ --output-dir output/ --jobs 4
+
+  # Glob pattern
+  python -m src.batch "datasheets/**/*.pdf" --output-dir output/
+
+  # Manifest with pdf, part_number and output columns (CSV or JSONL)
+  python -m src.batch manifest.csv --status-file nightly.jsonl
+        """
+    )
+
+    parser.add_argument(
+        "source",
+        help="Directory of PDFs, glob pattern, or .csv/.jsonl manifest"
+    )
+
+    parser.add_argument(
+        "--output-dir",
+        default="output",
+        help="Directory for GLB files not named by the manifest (default: %(default)s)"
+    )
+
+    parser.add_argument(
+        "--status-file",
+        help="JSONL file to append per-datasheet status to (default: <output-dir>/status.jsonl)"
+    )
+
+    parser.add_argument(
+        "--log-dir",
+        help="Directory for per-datasheet logs (default: <output-dir>/logs)"
+    )
+
+    parser.add_argument(
+        "--jobs", "-j",
+        type=int,
+        help="Number of worker processes (default: batch_jobs setting, else CPU count)"
+    )
+
+    parser.add_argument(
+        "--skip-existing",
+        action="store_true",
+        help="Skip datasheets whose output file already exists"
+    )
+
+    parser.add_argument(
+        "--api-key",
+        help="LLM API key (or set FASTCHAT_API_KEY env var)"
+    )
+
+    parser.add_argument(
+        "--model",
+        help=f"LLM model to use (default: llm_model setting, {Settings.llm_model})"
+    )
+
+    parser.add_argument(
+        "--min-confidence",
+        type=int,
+        default=5,
+        help="Minimum confidence score for page detection (default: %(default)s)"
+    )
+
+    parser.add_argument(
+        "--prefilter-min-score",
+        type=int,
+        default=2,
+        help="Minimum text-only score before a page gets full table/diagram "
+             "analysis; 0 disables the prefilter (default: %(default)s)"
+    )
+
+    parser.add_argument(
+        "--cache-dir",
+        help="Directory for cached detection results "
+             "(default: $DATASHEET_PARSER_CACHE_DIR or ~/.cache/datasheet-parser)"
+    )
+
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Do not read or write cached detection results or LLM responses"
+    )
+
+    parser.add_argument(
+        "--llm-cache-ttl",
+        type=float,
+        default=168,
+        help="Hours before a cached LLM response expires (default: %(default)s)"
+    )
+
+    parser.add_argument(
+        "--prompt-token-budget",
+        type=int,
+        default=DEFAULT_PROMPT_TOKEN_BUDGET,
+        help="Estimated-token budget for datasheet content in the pin extraction prompt; "
+             "the most pinout-relevant blocks are kept, 0 sends everything (default: %(default)s)"
+    )
+
+    parser.add_argument(
+        "--no-table-fast-path",
+        action="store_true",
+        help="Always extract pins with the LLM, even when a pin table can be read directly"
+    )
+
+    parser.add_argument(
+        "--map-reduce",
+        action="store_true",
+        help="Extract pins page by page with concurrent LLM requests and merge the results "
+             "(for pinouts spanning many pages; --prompt-token-budget is not applied)"
+    )
+
+    config.add_config_arguments(parser)
+
+    return parser.parse_args()
+
+
+def main():
+    """Batch CLI entry point."""
+    args = parse_arguments()
+
+    try:
+        config.configure_from_args(args, BATCH_ARG_FIELDS)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    args.jobs = args.jobs or os.cpu_count() or 1
+
+    output_dir = Path(args.output_dir)
+    status_file = Path(args.status_file) if args.status_file else output_dir / "status.jsonl"
+    log_dir = args.log_dir or str(output_dir / "logs")
+
+    try:
+        items = load_items(args.source, output_dir)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Error: Could not read {args.source}: {e}")
+        sys.exit(1)
+
+    if args.skip_existing:
+        items = [item for item in items if not Path(item.output).exists()]
+
+    if not items:
+        print("Nothing to process")
+        return
+
+    # Workers inherit the environment, so the key only has to be set once
+    if args.api_key:
+        os.environ["FASTCHAT_API_KEY"] = args.api_key
+
+    options = PipelineOptions.from_args(args)
+    print(f"Processing {len(items)} datasheet(s) with {args.jobs} worker(s)...")
+
+    started = time.time()
+    counts = run_batch(items, status_file, args.jobs, args.api_key, options, log_dir)
+
+    print(
+        f"\nDone in {time.time() - started:.1f}s: {counts['ok']} succeeded, "
+        f"{counts['error']} failed (status: {status_file})"
+    )
+    if counts["error"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
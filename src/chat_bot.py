@@ -1,46 +1,181 @@
 """Chat bot for LLM interactions - FastChat API client."""
 
-from openai import OpenAI
+import asyncio
+import random
+import weakref
+
 import os
 from dotenv import load_dotenv
 
+from .config import get_settings
+
 load_dotenv()
 
-import nest_asyncio
 
-nest_asyncio.apply()
+# Endpoint, timeout and token limit come from src.config (llm_* settings)
+API_KEY = os.getenv("FASTCHAT_API_KEY")
 
 
-BASE_URL = "https://fastchat.ideeza.com/v1"
-#BASE_URL = "https://fastchattest.ideeza.com/v1"
-API_KEY = os.getenv("FASTCHAT_API_KEY")
+# Created on first use so importing this module (e.g. for a cached run)
+# does not require credentials or load the openai package
+client = None
 
 
-#
-client = OpenAI(
-    api_key=API_KEY,
-    base_url=BASE_URL
-)
+def _get_client():
+    global client
+    if client is None:
+        from openai import OpenAI
+        settings = get_settings()
+        options = {"max_retries": settings.llm_max_retries}
+        if settings.llm_timeout is not None:
+            options["timeout"] = settings.llm_timeout
+        client = OpenAI(
+            api_key=os.getenv("FASTCHAT_API_KEY", API_KEY),
+            base_url=settings.llm_base_url,
+            **options
+        )
+    return client
 
 
-def get_completion_from_messages(messages, model="llama-3", temperature=0):
-    response = client.chat.completions.create(
-        model=model,
+def get_completion_from_messages(messages, model=None, temperature=0):
+    settings = get_settings()
+    response = _get_client().chat.completions.create(
+        model=model or settings.llm_model,
         messages=messages,
         temperature=temperature,
-        max_tokens=8192
+        max_tokens=settings.llm_max_tokens
     )
 
     return response.choices[0].message.content
 
 
-def build_pin_extraction_prompt(datasheet_content: str, part_number: str = None) -> list:
+# One AsyncOpenAI client per event loop: its connection pool is bound to the
+# loop it was first used on
+_async_clients = weakref.WeakKeyDictionary()
+
+# Errors worth retrying: timeouts, connection failures, 429 and 5xx
+# (resolved on first use, see _retryable_errors)
+RETRYABLE_ERRORS = None
+
+
+def _retryable_errors():
+    global RETRYABLE_ERRORS
+    if RETRYABLE_ERRORS is None:
+        import openai
+        RETRYABLE_ERRORS = (
+            asyncio.TimeoutError,
+            openai.APIConnectionError,
+            openai.RateLimitError,
+            openai.InternalServerError,
+        )
+    return RETRYABLE_ERRORS
+
+
+def _get_async_client():
+    loop = asyncio.get_running_loop()
+    async_client = _async_clients.get(loop)
+    if async_client is None:
+        from openai import AsyncOpenAI
+        async_client = AsyncOpenAI(
+            api_key=os.getenv("FASTCHAT_API_KEY", API_KEY),
+            base_url=get_settings().llm_base_url,
+            max_retries=0  # Retries are handled by aget_completion_from_messages
+        )
+        _async_clients[loop] = async_client
+    return async_client
+
+
+async def aclose_async_client():
+    """Close the running loop's AsyncOpenAI client, if one was created."""
+    async_client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if async_client is not None:
+        await async_client.close()
+
+
+def run_async(coro):
+    """
+    Run a coroutine on a new event loop, like asyncio.run().
+
+    The loop's AsyncOpenAI client is closed before the loop ends, so its
+    connection pool does not outlive the loop it is bound to.
+
+    Args:
+        coro: Coroutine to run
+
+    Returns:
+        The coroutine's result
+    """
+    async def main():
+        try:
+            return await coro
+        finally:
+            await aclose_async_client()
+
+    return asyncio.run(main())
+
+
+async def aget_completion_from_messages(
+    messages,
+    model=None,
+    temperature=0,
+    timeout=None,
+    max_retries=None,
+    backoff=1.0
+):
+    """
+    Async variant of get_completion_from_messages.
+
+    Args:
+        messages: Chat messages
+        model: Model name (default: llm_model setting)
+        temperature: Sampling temperature
+        timeout: Per-attempt timeout in seconds (default: llm_timeout setting;
+                 None there means no limit)
+        max_retries: Retries after a timeout, connection error, 429 or 5xx
+                     (default: llm_max_retries setting)
+        backoff: Base delay in seconds; doubles per attempt with +/-50% jitter
+
+    Returns:
+        Response message content
+    """
+    settings = get_settings()
+    model = model or settings.llm_model
+    timeout = settings.llm_timeout if timeout is None else timeout
+    max_retries = settings.llm_max_retries if max_retries is None else max_retries
+
+    retryable = _retryable_errors()
+    attempt = 0
+    while True:
+        try:
+            response = await asyncio.wait_for(
+                _get_async_client().chat.completions.create(
+                    model=model,
+                    messages=messages,
+                    temperature=temperature,
+                    max_tokens=settings.llm_max_tokens
+                ),
+                timeout
+            )
+            return response.choices[0].message.content
+        except retryable:
+            if attempt >= max_retries:
+                raise
+            delay = backoff * (2 ** attempt) * random.uniform(0.5, 1.5)
+            attempt += 1
+            await asyncio.sleep(delay)
+
+
+def build_pin_extraction_prompt(
+    datasheet_content: str, part_number: str = None, excerpt: str = None
+) -> list:
     """
     Build messages for PinData extraction from datasheet content.
 
     Args:
         datasheet_content: The extracted text/content from relevant datasheet pages
         part_number: Optional specific part number to match (e.g., "STM32F103RBT7")
+        excerpt: Optional description of the part of the pinout this content
+                 covers (e.g., "page 29, chunk 2 of 6"), for map-reduce extraction
 
     Returns:
         List of message dictionaries for LLM API call
@@ -70,6 +205,16 @@ def build_pin_extraction_prompt(datasheet_content: str, part_number: str = None)
             f"- If PDIP-40 is the expected package, IGNORE TQFP/QFN variants even if they appear first\n"
         )
 
+    if excerpt:
+        extraction_tasks += (
+            f"\n"
+            f"PARTIAL CONTENT: The content below is only one excerpt ({excerpt}) of a pinout "
+            f"that spans several pages; the other excerpts are processed separately.\n"
+            f"- Return ONLY the pins listed in this excerpt (an empty list if there are none)\n"
+            f"- Do NOT guess pins that are not shown here\n"
+            f"- Still report the package type and the TOTAL pin count of the whole package\n"
+        )
+
     messages = [
         {
             "role": "system",
@@ -0,0 +1,314 @@
+"""
+Runtime settings.
+
+Endpoint URLs, model names, timeouts, pool sizes and concurrency limits
+come from one Settings object, read once at startup. Each value is taken
+from the first of these that sets it:
+
+1. Command-line flags (see add_config_arguments and configure_from_args)
+2. DATASHEET_PARSER_<NAME> environment variables, e.g.
+   DATASHEET_PARSER_LLM_BASE_URL or DATASHEET_PARSER_LLM_TIMEOUT
+3. A TOML or JSON config file: --config, $DATASHEET_PARSER_CONFIG, or
+   ./datasheet-parser.toml if it exists
+4. The defaults below
+
+Example datasheet-parser.toml:
+
+    llm_base_url = "http://inference.local:8000/v1"
+    llm_timeout = 60
+    vision_url = "http://cache-proxy.local/describe_image/"
+"""
+
+import json
+import os
+import typing
+from dataclasses import asdict, dataclass, fields, replace
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional, Union
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
+
+ENV_PREFIX = "DATASHEET_PARSER_"
+CONFIG_ENV_VAR = "DATASHEET_PARSER_CONFIG"
+DEFAULT_CONFIG_FILE = "datasheet-parser.toml"
+
+
+@dataclass(frozen=True)
+class Settings:
+    """Deployment settings shared by the CLIs, the clients and the workers."""
+
+    # Chat LLM (OpenAI-compatible API)
+    llm_base_url: str = "https://fastchat.ideeza.com/v1"
+    llm_model: str = "llama-3"
+    llm_timeout: Optional[float] = None  # Seconds per request (None = no limit)
+    llm_max_retries: int = 2
+    llm_max_tokens: int = 8192
+    llm_max_concurrency: int = 4  # In-flight async requests per LLMClient
+
+    # Vision API (describe_image)
+    vision_url: str = "https://qwen.ideeza.com/describe_image/"
+    vision_timeout: float = 120
+    vision_pool_size: int = 8  # Pooled connections per host
+    vision_max_in_flight: int = 4  # Concurrent images per extraction
+    layout_url: Optional[str] = None  # Layout extraction endpoint (None = vision_url)
+    layout_timeout: float = 120
+
+    # Pools and concurrency
+    detect_workers: int = 1  # Processes for page detection
+    verify_workers: int = 4  # Concurrent page verification requests
+    batch_jobs: Optional[int] = None  # Batch worker processes (None = CPU count)
+    service_workers: Optional[int] = None  # Service worker processes (None = CPU count)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a JSON-serializable dict."""
+        return asdict(self)
+
+
+# Settings fields behind the flags every entry point adds (flag dest -> field)
+COMMON_ARG_FIELDS = {
+    "llm_base_url": "llm_base_url",
+    "llm_timeout": "llm_timeout",
+    "vision_url": "vision_url",
+}
+
+# Pipeline CLI flags backed by settings (src.main, src.main_layout)
+PIPELINE_ARG_FIELDS = {
+    "model": "llm_model",
+    "workers": "detect_workers",
+    "verify_workers": "verify_workers",
+}
+
+_settings: Optional[Settings] = None
+
+
+def _field_type(name: str) -> type:
+    """Concrete type of a Settings field (Optional[X] -> X)."""
+    hint = typing.get_type_hints(Settings)[name]
+    args = [arg for arg in getattr(hint, "__args__", ()) if arg is not type(None)]
+    return args[0] if args else hint
+
+
+def _coerce(name: str, value: Any, source: str) -> Any:
+    """
+    Convert a raw value (config file entry or environment string) to the
+    field's type.
+
+    Raises:
+        ValueError: If the field is unknown or the value does not convert
+    """
+    known = {f.name for f in fields(Settings)}
+    if name not in known:
+        raise ValueError(f"Unknown setting '{name}' in {source}")
+
+    if value is None or (isinstance(value, str) and value.strip() == ""):
+        return None
+
+    kind = _field_type(name)
+    try:
+        if kind is int and isinstance(value, float) and not value.is_integer():
+            raise ValueError
+        return kind(value)
+    except (TypeError, ValueError):
+        raise ValueError(
+            f"Invalid value for '{name}' in {source}: {value!r} (expected {kind.__name__})"
+        ) from None
+
+
+def _find_config_file(
+    config_file: Optional[Union[str, Path]], environ: Mapping[str, str]
+) -> Optional[Path]:
+    """Pick the config file: explicit path, $DATASHEET_PARSER_CONFIG, ./datasheet-parser.toml."""
+    if config_file:
+        return Path(config_file).expanduser()
+    env_file = environ.get(CONFIG_ENV_VAR)
+    if env_file:
+        return Path(env_file).expanduser()
+    default = Path(DEFAULT_CONFIG_FILE)
+    return default if default.is_file() else None
+
+
+def read_config_file(path: Union[str, Path]) -> Dict[str, Any]:
+    """
+    Read settings from a TOML (.toml) or JSON file.
+
+    Args:
+        path: Config file
+
+    Returns:
+        Raw values by setting name
+
+    Raises:
+        ValueError: If the file is missing, cannot be parsed or is not a table
+    """
+    path = Path(path)
+    try:
+        raw = path.read_bytes()
+    except OSError as e:
+        raise ValueError(f"Cannot read config file {path}: {e}") from None
+
+    try:
+        if path.suffix.lower() == ".json":
+            data = json.loads(raw)
+        else:
+            if tomllib is None:
+                raise ValueError(
+                    "Reading TOML config files needs Python 3.11+ or: pip install tomli"
+                )
+            data = tomllib.loads(raw.decode("utf-8"))
+    except ValueError as e:
+        raise ValueError(f"Cannot parse config file {path}: {e}") from None
+
+    if not isinstance(data, dict):
+        raise ValueError(f"Config file {path} must contain a table of settings")
+    return data
+
+
+def load_settings(
+    config_file: Optional[Union[str, Path]] = None,
+    overrides: Optional[Mapping[str, Any]] = None,
+    environ: Optional[Mapping[str, str]] = None
+) -> Settings:
+    """
+    Build settings from defaults, the config file, the environment and overrides.
+
+    Args:
+        config_file: Config file path (default: $DATASHEET_PARSER_CONFIG or
+                     ./datasheet-parser.toml if present)
+        overrides: Values that win over everything else (e.g. CLI flags);
+                   None values are ignored
+        environ: Environment to read (default: os.environ, after loading .env)
+
+    Returns:
+        Settings
+
+    Raises:
+        ValueError: If the config file is unreadable or a value is invalid
+    """
+    if environ is None:
+        try:
+            from dotenv import load_dotenv
+            load_dotenv()
+        except ImportError:
+            pass
+        environ = os.environ
+
+    values: Dict[str, Any] = {}
+
+    path = _find_config_file(config_file, environ)
+    if path is not None:
+        for name, value in read_config_file(path).items():
+            values[name] = _coerce(name, value, str(path))
+
+    for f in fields(Settings):
+        env_name = ENV_PREFIX + f.name.upper()
+        if env_name in environ:
+            values[f.name] = _coerce(f.name, environ[env_name], env_name)
+
+    for name, value in (overrides or {}).items():
+        if value is not None:
+            values[name] = _coerce(name, value, "overrides")
+
+    # Empty values (e.g. DATASHEET_PARSER_LLM_TIMEOUT=) restore the default
+    defaults = Settings()
+    values = {
+        name: getattr(defaults, name) if value is None else value
+        for name, value in values.items()
+    }
+    return replace(defaults, **values)
+
+
+def get_settings() -> Settings:
+    """
+    Get the active settings.
+
+    Loaded from the config file and environment on first use unless an
+    entry point has already called configure().
+    """
+    global _settings
+    if _settings is None:
+        _settings = load_settings()
+    return _settings
+
+
+def configure(settings: Optional[Settings] = None) -> Optional[Settings]:
+    """
+    Set the active settings.
+
+    Args:
+        settings: Settings to use from now on (None reloads them on next use)
+
+    Returns:
+        The settings passed in
+    """
+    global _settings
+    _settings = settings
+    return settings
+
+
+def add_config_arguments(parser) -> None:
+    """
+    Add --config and the endpoint flags shared by every entry point.
+
+    Args:
+        parser: argparse.ArgumentParser
+    """
+    parser.add_argument(
+        "--config",
+        help="Settings file, TOML or JSON "
+             f"(default: ${CONFIG_ENV_VAR} or ./{DEFAULT_CONFIG_FILE} if present)"
+    )
+
+    parser.add_argument(
+        "--llm-base-url",
+        help=f"OpenAI-compatible LLM endpoint (default: {Settings.llm_base_url})"
+    )
+
+    parser.add_argument(
+        "--llm-timeout",
+        type=float,
+        help="Seconds before an LLM request times out (default: no limit)"
+    )
+
+    parser.add_argument(
+        "--vision-url",
+        help=f"Vision describe_image endpoint (default: {Settings.vision_url})"
+    )
+
+
+def configure_from_args(args, arg_fields: Optional[Mapping[str, str]] = None) -> Settings:
+    """
+    Load settings with CLI flags on top and make them active.
+
+    Flags left at None fall through to the environment, config file and
+    defaults. The resolved values of arg_fields are written back to args,
+    so code reading e.g. args.model sees the effective setting.
+
+    Args:
+        args: argparse Namespace (from a parser given add_config_arguments)
+        arg_fields: Entry-point flags backed by settings (flag dest -> field)
+
+    Returns:
+        The active Settings
+
+    Raises:
+        ValueError: If the config file is unreadable or a value is invalid
+    """
+    arg_fields = dict(arg_fields or {})
+    overrides = {
+        name: getattr(args, dest)
+        for dest, name in {**COMMON_ARG_FIELDS, **arg_fields}.items()
+        if getattr(args, dest, None) is not None
+    }
+
+    settings = load_settings(getattr(args, "config", None), overrides)
+    configure(settings)
+
+    for dest, name in arg_fields.items():
+        setattr(args, dest, getattr(settings, name))
+    return settings
@@ -1,6 +1,36 @@
 """LLM modules for pin data extraction and page verification."""
 
-from .client import LLMClient
-from .page_verifier import PageVerifier
+import importlib
 
-__all__ = ["LLMClient", "PageVerifier"]
+from .pin_merge import PinConflict, PinMerger, merge_pin_data
+from .response_cache import ResponseCache, FileResponseCache, make_cache_key
+
+# Loaded on first access (PEP 562) so importing the package for the cache
+# classes does not pull in the LLM client stack
+_LAZY_ATTRS = {
+    "LLMClient": ".client",
+    "PageVerifier": ".page_verifier",
+}
+
+__all__ = [
+    "LLMClient",
+    "PageVerifier",
+    "PinConflict",
+    "PinMerger",
+    "merge_pin_data",
+    "ResponseCache",
+    "FileResponseCache",
+    "make_cache_key",
+]
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRS:
+        value = getattr(importlib.import_module(_LAZY_ATTRS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,10 +1,78 @@
 """LLM API Client for pin data extraction using FastChat."""
 
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
+import asyncio
 import json
+import re
+import weakref
 
 from ..models.pin_data import PinData, Pin, PackageInfo
-from ..chat_bot import get_completion_from_messages, build_pin_extraction_prompt
+from ..chat_bot import (
+    aget_completion_from_messages,
+    build_pin_extraction_prompt,
+    get_completion_from_messages,
+    run_async,
+)
+from ..config import get_settings
+from .pin_merge import PinMerger
+from .response_cache import ResponseCache, make_cache_key
+from ..utils import tracing
+from ..utils.tokens import estimate_tokens
+
+
+# Page markers the content extractor puts before each page's text
+_PAGE_MARKER = re.compile(r"^--- Page (\d+) ---$", re.MULTILINE)
+
+# Pages smaller than this (estimated tokens) are sent with the previous page
+MIN_CHUNK_TOKENS = 60
+
+
+def split_page_chunks(content: str) -> List[Tuple[str, str]]:
+    """
+    Split extracted content into per-page chunks for map-reduce extraction.
+
+    Args:
+        content: Text with "--- Page N ---" markers
+
+    Returns:
+        (label, text) per chunk in document order, e.g. ("page 29", ...);
+        pages under MIN_CHUNK_TOKENS are folded into the previous chunk
+    """
+    matches = list(_PAGE_MARKER.finditer(content))
+    if not matches:
+        return [("all pages", content)] if content.strip() else []
+
+    chunks: List[Tuple[str, str]] = []
+    head = content[:matches[0].start()].strip()
+    if head:
+        chunks.append(("preamble", head))
+    for i, match in enumerate(matches):
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(content)
+        text = content[match.start():end].strip()
+        if chunks and estimate_tokens(text) < MIN_CHUNK_TOKENS:
+            label, previous = chunks[-1]
+            chunks[-1] = (f"{label}-{match.group(1)}", previous + "\n\n" + text)
+        else:
+            chunks.append((f"page {match.group(1)}", text))
+    return chunks
+
+
+def _completion_span(model: str, messages: List[Dict[str, str]]):
+    """Open an "llm.completion" span sized by the prompt."""
+    span = tracing.span("llm.completion", "llm", model=model)
+    if tracing.is_enabled():
+        prompt = "\n".join(m.get("content") or "" for m in messages)
+        span.set(prompt_bytes=len(prompt.encode("utf-8")), prompt_tokens=estimate_tokens(prompt))
+    return span
+
+
+def _record_response(span, response: Optional[str]) -> None:
+    """Attach response size to a completion span."""
+    if response is not None and tracing.is_enabled():
+        span.set(
+            response_bytes=len(response.encode("utf-8")),
+            response_tokens=estimate_tokens(response),
+        )
 
 
 class LLMClient:
@@ -15,7 +83,12 @@ class LLMClient:
     def __init__(
         self,
         api_key: Optional[str] = None,
-        model: str = "llama-3",
+        model: Optional[str] = None,
+        temperature: float = 0,
+        cache: Optional[ResponseCache] = None,
+        max_concurrency: Optional[int] = None,
+        timeout: Optional[float] = None,
+        max_retries: Optional[int] = None,
         **kwargs
     ):
         """
@@ -23,15 +96,36 @@ class LLMClient:
 
         Args:
             api_key: API key for LLM service (uses FASTCHAT_API_KEY env var if None)
-            model: Model name to use (default: llama-3)
+            model: Model name to use (default: llm_model setting)
+            temperature: Sampling temperature (default: 0)
+            cache: Optional ResponseCache; responses are keyed by model,
+                   temperature and a hash of the messages
+            max_concurrency: Maximum in-flight async requests per event loop
+                             (default: llm_max_concurrency setting)
+            timeout: Per-request timeout in seconds for async calls
+                     (default: llm_timeout setting)
+            max_retries: Retries (with jittered backoff) for async calls
+                         (default: llm_max_retries setting)
             **kwargs: Additional configuration options
         """
         # API key is handled by chat_bot.py via FASTCHAT_API_KEY env var
         # api_key parameter is kept for interface compatibility
+        settings = get_settings()
         self.api_key = api_key
-        self.model = model
+        self.model = model or settings.llm_model
+        self.temperature = temperature
+        self.cache = cache
+        self.max_concurrency = max_concurrency or settings.llm_max_concurrency
+        self.timeout = settings.llm_timeout if timeout is None else timeout
+        self.max_retries = settings.llm_max_retries if max_retries is None else max_retries
         self.config = kwargs
 
+        # asyncio.Semaphore is bound to a loop, so keep one per event loop
+        self._semaphores = weakref.WeakKeyDictionary()
+
+        # Merger of the last extract_pin_data_map_reduce() call (see .conflicts)
+        self.last_merge: Optional[PinMerger] = None
+
     def extract_pin_data(
         self,
         content: str,
@@ -55,14 +149,175 @@ class LLMClient:
         Raises:
             ValueError: If LLM response cannot be parsed
         """
-        # Build messages for pin extraction with part number if provided
-        messages = build_pin_extraction_prompt(content, part_number=part_number)
+        with tracing.span("llm.extract_pin_data", "llm") as span:
+            # Build messages for pin extraction with part number if provided
+            messages = build_pin_extraction_prompt(content, part_number=part_number)
+
+            # Replay an identical earlier request from the cache
+            cache_key = self._cache_key(messages)
+            if self.cache is not None:
+                cached = self.cache.get(cache_key)
+                if cached is not None:
+                    span.set(cache_hit=True)
+                    return self._parse_llm_response(cached)
+            span.set(cache_hit=False)
+
+            # Call LLM
+            with _completion_span(self.model, messages) as completion:
+                response = get_completion_from_messages(
+                    messages, model=self.model, temperature=self.temperature
+                )
+                _record_response(completion, response)
+
+            # Parse response into PinData (only cache responses that parse)
+            pin_data = self._parse_llm_response(response)
+            if self.cache is not None:
+                self.cache.set(cache_key, response)
+            return pin_data
+
+    async def aextract_pin_data(
+        self,
+        content: str,
+        images: Optional[List[bytes]] = None,
+        part_number: Optional[str] = None,
+        excerpt: Optional[str] = None,
+        **kwargs
+    ) -> PinData:
+        """
+        Async variant of extract_pin_data.
+
+        Requests share the client's concurrency limit, so many datasheets can
+        be processed with asyncio.gather() without flooding the endpoint.
+
+        Args:
+            content: Text content extracted from datasheet
+            images: Optional list of image data (currently not used)
+            part_number: Optional specific part number to match package variant
+            excerpt: Optional label of the part of the pinout the content
+                     covers (map-reduce chunks)
+            **kwargs: Additional parameters
+
+        Returns:
+            PinData object with extracted information
+
+        Raises:
+            ValueError: If LLM response cannot be parsed
+        """
+        messages = build_pin_extraction_prompt(content, part_number=part_number, excerpt=excerpt)
+
+        cache_key = self._cache_key(messages)
+        if self.cache is not None:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return self._parse_llm_response(cached)
+
+        response = await self.acomplete(messages)
+
+        pin_data = self._parse_llm_response(response)
+        if self.cache is not None:
+            self.cache.set(cache_key, response)
+        return pin_data
+
+    def extract_pin_data_map_reduce(
+        self,
+        content: str,
+        part_number: Optional[str] = None
+    ) -> PinData:
+        """
+        Extract pin data page by page and merge the results.
+
+        Each page chunk is sent concurrently (up to max_concurrency in
+        flight), so latency follows the largest chunk rather than the whole
+        pinout and no single response has to hold every pin. The chunk
+        results are combined with PinMerger; its conflicts are available
+        as self.last_merge.conflicts.
+
+        Args:
+            content: Text content with "--- Page N ---" markers
+            part_number: Optional specific part number to match package variant
+
+        Returns:
+            Merged PinData (content with a single chunk gets one regular call)
+
+        Raises:
+            ValueError: If no chunk response can be parsed
+        """
+        chunks = split_page_chunks(content)
+        if len(chunks) <= 1:
+            self.last_merge = None
+            return self.extract_pin_data(content, part_number=part_number)
+
+        with tracing.span("llm.map_reduce", "llm", chunks=len(chunks)) as span:
+            results = run_async(self._amap_chunks(chunks, part_number))
+
+            # Unparseable chunks are skipped; other errors propagate
+            parsed = []
+            for result in results:
+                if isinstance(result, ValueError):
+                    continue
+                if isinstance(result, BaseException):
+                    raise result
+                parsed.append(result)
+            if not parsed:
+                raise results[0]
+
+            with tracing.span("llm.merge", "llm", chunks=len(parsed)):
+                self.last_merge = PinMerger()
+                pin_data = self.last_merge.merge(parsed)
+            span.set(
+                failed_chunks=len(results) - len(parsed),
+                conflicts=len(self.last_merge.conflicts),
+            )
+            return pin_data
+
+    async def _amap_chunks(self, chunks: List[Tuple[str, str]], part_number: Optional[str]) -> List:
+        """Run the per-chunk extractions concurrently (results in chunk order)."""
+        return await asyncio.gather(
+            *(
+                self.aextract_pin_data(
+                    text,
+                    part_number=part_number,
+                    excerpt=f"{label}, chunk {i} of {len(chunks)}"
+                )
+                for i, (label, text) in enumerate(chunks, 1)
+            ),
+            return_exceptions=True
+        )
+
+    async def acomplete(self, messages: List[Dict[str, str]]) -> str:
+        """
+        Run one chat completion under the client's concurrency limit.
+
+        Args:
+            messages: Chat messages
+
+        Returns:
+            Response message content
+        """
+        async with self._get_semaphore():
+            with _completion_span(self.model, messages) as completion:
+                response = await aget_completion_from_messages(
+                    messages,
+                    model=self.model,
+                    temperature=self.temperature,
+                    timeout=self.timeout,
+                    max_retries=self.max_retries
+                )
+                _record_response(completion, response)
+                return response
 
-        # Call LLM
-        response = get_completion_from_messages(messages, model=self.model)
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Get the concurrency semaphore for the running event loop."""
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphores[loop] = semaphore
+        return semaphore
 
-        # Parse response into PinData
-        return self._parse_llm_response(response)
+    def _cache_key(self, messages: List[Dict[str, str]]) -> str:
+        """Build the response cache key for a request."""
+        return make_cache_key("chat", self.model, self.temperature, messages)
 
     def _parse_llm_response(self, response: str) -> PinData:
         """
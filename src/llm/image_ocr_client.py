@@ -6,18 +6,45 @@ pinout information from PDF page images.
 """
 
 import base64
+import hashlib
 import io
 import json
 import mimetypes
-from dataclasses import dataclass
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass
 from typing import List, Optional, Dict, Any
 
+from .response_cache import ResponseCache, make_cache_key
+from ..config import get_settings
+from ..utils import tracing
+
 try:
     import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
 except ImportError:
     requests = None
 
 
+def sniff_image_type(image_data: bytes) -> str:
+    """
+    Detect an image's MIME type from its magic bytes.
+
+    Args:
+        image_data: Image data as bytes
+
+    Returns:
+        MIME type string (defaults to "image/png")
+    """
+    if image_data[:3] == b"\xff\xd8\xff":
+        return "image/jpeg"
+    if image_data[:4] == b"RIFF" and image_data[8:12] == b"WEBP":
+        return "image/webp"
+    if image_data[:6] in (b"GIF87a", b"GIF89a"):
+        return "image/gif"
+    return "image/png"
+
+
 @dataclass
 class PinoutExtractionResult:
     """Result of pinout extraction from an image."""
@@ -35,10 +62,17 @@ class ImageOCRClient:
     API client for image-based pinout extraction using qwen.ideeza.com.
     """
 
-    # API configuration
-    API_URL = "https://qwen.ideeza.com/describe_image/"
+    # Endpoint, timeout, pool size and in-flight limit come from src.config
+    # (vision_* settings)
     DEFAULT_OUTPUT_TOKEN = 4096
-    DEFAULT_TIMEOUT = 120
+
+    # Retry configuration
+    DEFAULT_MAX_RETRIES = 3
+    DEFAULT_BACKOFF_FACTOR = 0.5
+    RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+    # Multi-image extraction
+    DEFAULT_CONFIDENCE_THRESHOLD = 0.9
 
     # Default prompt for pinout extraction
     DEFAULT_PROMPT = """You are an expert at reading electronic component pinout diagrams from datasheet images.
@@ -95,24 +129,179 @@ Return ONLY valid JSON (no markdown code blocks, no additional text):
         self,
         api_url: str = None,
         output_token: int = None,
-        timeout: int = None
+        timeout: int = None,
+        pool_size: int = None,
+        max_retries: int = None,
+        backoff_factor: float = None,
+        session=None,
+        cache: Optional[ResponseCache] = None,
+        bypass_cache: bool = False
     ):
         """
         Initialize the OCR client.
 
+        The client keeps one pooled requests.Session, so connections (and
+        their TLS handshakes) are reused across calls. It can be shared
+        between threads; pool_size bounds the open connections per host.
+
         Args:
-            api_url: Optional custom API URL
+            api_url: Optional custom API URL (default: vision_url setting)
             output_token: Optional max output tokens
-            timeout: Optional request timeout in seconds
+            timeout: Optional request timeout in seconds (default: vision_timeout setting)
+            pool_size: Optional max pooled connections per host
+                       (default: vision_pool_size setting)
+            max_retries: Optional number of retries for 429/5xx responses
+                         and connection errors
+            backoff_factor: Optional exponential backoff factor in seconds
+            session: Optional preconfigured requests.Session to use instead
+            cache: Optional ResponseCache for parsed results, keyed by image
+                   hash, prompt, output_token and api_url
+            bypass_cache: Ignore cached results (fresh results are still stored)
         """
         if requests is None:
             raise ImportError(
                 "requests library is required. Install with: pip install requests"
             )
 
-        self.api_url = api_url or self.API_URL
+        settings = get_settings()
+        self.api_url = api_url or settings.vision_url
         self.output_token = output_token or self.DEFAULT_OUTPUT_TOKEN
-        self.timeout = timeout or self.DEFAULT_TIMEOUT
+        self.timeout = timeout or settings.vision_timeout
+        self.cache = cache
+        self.bypass_cache = bypass_cache
+        self.session = session or self._create_session(
+            pool_size or settings.vision_pool_size,
+            self.DEFAULT_MAX_RETRIES if max_retries is None else max_retries,
+            self.DEFAULT_BACKOFF_FACTOR if backoff_factor is None else backoff_factor
+        )
+
+    def _create_session(self, pool_size: int, max_retries: int, backoff_factor: float):
+        """
+        Create a keep-alive session with a connection pool and retry policy.
+
+        Args:
+            pool_size: Max pooled connections per host
+            max_retries: Retries for 429/5xx responses and connection errors
+            backoff_factor: Exponential backoff factor in seconds
+
+        Returns:
+            Configured requests.Session
+        """
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=self.RETRY_STATUS_CODES,
+            # The describe_image endpoint is a POST; repeating it is safe
+            allowed_methods=frozenset({"POST"}),
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            max_retries=retry
+        )
+
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers.update({
+            "accept": "application/json",
+            "Connection": "keep-alive"
+        })
+        return session
+
+    def cache_key(self, image_data: bytes, prompt: str, output_token: int = None) -> str:
+        """
+        Build the cache key for a vision request.
+
+        Args:
+            image_data: Image data as bytes
+            prompt: Prompt text
+            output_token: Max output tokens (client default if None)
+
+        Returns:
+            Cache key string
+        """
+        return make_cache_key(
+            "vision",
+            hashlib.sha256(image_data).hexdigest(),
+            prompt,
+            output_token or self.output_token,
+            self.api_url
+        )
+
+    def get_cached(self, key: str) -> Optional[str]:
+        """Look up a cached response (None if caching is off or bypassed)."""
+        if self.cache is None or self.bypass_cache:
+            return None
+        return self.cache.get(key)
+
+    def set_cached(self, key: str, value: str) -> None:
+        """Store a response if caching is enabled."""
+        if self.cache is not None:
+            self.cache.set(key, value)
+
+    def describe_image(
+        self,
+        image_data: bytes,
+        prompt: str,
+        output_token: int = None,
+        filename: str = None
+    ):
+        """
+        Send one image and prompt to the describe_image endpoint.
+
+        Args:
+            image_data: Image data as bytes (PNG/JPEG)
+            prompt: Prompt text
+            output_token: Optional max output tokens (client default if None)
+            filename: Optional upload filename (derived from the image type if None)
+
+        Returns:
+            requests.Response (status is not checked)
+        """
+        mime_type = sniff_image_type(image_data)
+        if filename is None:
+            filename = f"image{mimetypes.guess_extension(mime_type) or '.png'}"
+
+        # The API expects:
+        # - file: image file upload
+        # - text: prompt
+        # - output_token: integer
+        files = {
+            "file": (filename, io.BytesIO(image_data), mime_type)
+        }
+        data = {
+            "text": prompt,
+            "output_token": str(output_token or self.output_token)
+        }
+
+        with tracing.span("vision.request", "vision", image_bytes=len(image_data)) as span:
+            response = self.session.post(
+                self.api_url,
+                files=files,
+                data=data,
+                timeout=self.timeout
+            )
+            span.set(
+                status=response.status_code,
+                prompt_bytes=len(prompt.encode("utf-8")),
+                response_bytes=len(response.content),
+            )
+            return response
+
+    def close(self) -> None:
+        """Close pooled connections."""
+        self.session.close()
+
+    def __enter__(self):
+        """Context manager entry."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit."""
+        self.close()
 
     def _build_prompt(self, part_number: str = None) -> str:
         """
@@ -155,29 +344,30 @@ Return ONLY valid JSON (no markdown code blocks, no additional text):
         # Build prompt
         prompt_text = prompt or self._build_prompt(part_number)
 
-        # Create multipart form data
-        # The API expects:
-        # - file: image file upload
-        # - text: prompt
-        # - output_token: integer
-
-        files = {
-            "file": ("image.png", io.BytesIO(image_data), "image/png")
-        }
-        data = {
-            "text": prompt_text,
-            "output_token": str(self.output_token)
-        }
-
+        with tracing.span("vision.extract_pinout", "vision", page=page_number) as span:
+            # Same image and prompt give the same answer; skip the network on a hit
+            cache_key = self.cache_key(image_data, prompt_text)
+            cached = self.get_cached(cache_key)
+            if cached is not None:
+                try:
+                    result = PinoutExtractionResult(**json.loads(cached))
+                    span.set(cache_hit=True, pins=len(result.pins))
+                    return result
+                except (TypeError, ValueError):
+                    pass
+
+            span.set(cache_hit=False)
+            result = self._request_pinout(image_data, prompt_text, cache_key)
+            span.set(pins=len(result.pins))
+            return result
+
+    def _request_pinout(
+        self, image_data: bytes, prompt_text: str, cache_key: str
+    ) -> PinoutExtractionResult:
+        """Call the vision API for a pinout and cache usable results."""
         try:
-            # Call API
-            response = requests.post(
-                self.api_url,
-                headers={"accept": "application/json"},
-                files=files,
-                data=data,
-                timeout=self.timeout
-            )
+            # Call API (pooled connection, retried on 429/5xx)
+            response = self.describe_image(image_data, prompt_text)
 
             # Raise error on non-2xx
             response.raise_for_status()
@@ -186,7 +376,12 @@ Return ONLY valid JSON (no markdown code blocks, no additional text):
             result = response.json()
 
             # Try to parse the response text for pinout data
-            return self._parse_api_response(result)
+            parsed = self._parse_api_response(result)
+
+            # Only cache usable results so failures are retried next run
+            if parsed.pins:
+                self.set_cached(cache_key, json.dumps(asdict(parsed)))
+            return parsed
 
         except requests.HTTPError as e:
             print(f"[ImageOCRClient] HTTP Error: {e}")
@@ -315,37 +510,104 @@ Return ONLY valid JSON (no markdown code blocks, no additional text):
     def extract_pinout_from_images(
         self,
         images: List[tuple],
-        part_number: str = None
+        part_number: str = None,
+        max_in_flight: int = None,
+        confidence_threshold: float = None
     ) -> PinoutExtractionResult:
         """
         Extract pinout information from multiple page images.
 
+        Images are sent concurrently (at most max_in_flight at a time). As
+        soon as one result is conclusive - confidence at or above the
+        threshold and a pin list as long as its pin_count - it is returned
+        and the images not yet sent are cancelled.
+
         Args:
             images: List of (page_number, image_data) tuples
             part_number: Optional part number to match
+            max_in_flight: Optional max concurrent requests
+                           (default: vision_max_in_flight setting)
+            confidence_threshold: Optional confidence for an early exit
 
         Returns:
             PinoutExtractionResult with best extraction from all images
         """
         print(f"[ImageOCRClient] Processing {len(images)} images...")
+        if not images:
+            return self._empty_result()
 
-        # Process each image and return the best result
-        best_result = None
-        best_confidence = 0.0
+        max_in_flight = max(1, max_in_flight or get_settings().vision_max_in_flight)
+        if confidence_threshold is None:
+            confidence_threshold = self.DEFAULT_CONFIDENCE_THRESHOLD
 
-        for page_num, img_data in images:
-            result = self.extract_pinout_from_image(
-                img_data,
-                page_number=page_num,
-                part_number=part_number
-            )
+        # Keep the best result; ties go to the earlier image, as when run in order
+        best_result = None
+        best_key = (0.0, 0)
 
-            if result.confidence > best_confidence:
-                best_result = result
-                best_confidence = result.confidence
+        executor = ThreadPoolExecutor(max_workers=min(max_in_flight, len(images)))
+        try:
+            queued = iter(enumerate(images))
+            pending = {}
+
+            def submit_next() -> None:
+                while len(pending) < max_in_flight:
+                    item = next(queued, None)
+                    if item is None:
+                        return
+                    index, (page_num, img_data) = item
+                    future = executor.submit(
+                        self.extract_pinout_from_image,
+                        img_data,
+                        page_number=page_num,
+                        part_number=part_number
+                    )
+                    pending[future] = index
+
+            submit_next()
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = pending.pop(future)
+                    result = future.result()
+
+                    key = (result.confidence, -index)
+                    if result.confidence > 0 and key > best_key:
+                        best_result = result
+                        best_key = key
+
+                    if self._is_conclusive(result, confidence_threshold):
+                        print(
+                            f"[ImageOCRClient] Conclusive result from image {index + 1} "
+                            f"(confidence {result.confidence:.2f}); skipping the rest"
+                        )
+                        return result
+                submit_next()
+        finally:
+            # Drop queued work; requests already in flight finish in the background
+            # (no shutdown(cancel_futures=True): that needs Python 3.9)
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=False)
 
         return best_result or self._empty_result()
 
+    def _is_conclusive(self, result: PinoutExtractionResult, confidence_threshold: float) -> bool:
+        """
+        Check whether a result is good enough to stop processing other images.
+
+        Args:
+            result: Extraction result
+            confidence_threshold: Minimum confidence
+
+        Returns:
+            True if confident and the pin list is complete
+        """
+        return (
+            result.confidence >= confidence_threshold
+            and result.pin_count > 0
+            and len(result.pins) == result.pin_count
+        )
+
     def encode_image_base64(self, image_data: bytes) -> str:
         """
         Encode image data as base64 string.
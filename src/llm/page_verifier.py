@@ -5,8 +5,13 @@ Uses LLM to verify if pages contain pinout information when
 rules-based detection has medium confidence or encounters unusual structure.
 """
 
-from typing import List, Optional
-from ..chat_bot import get_completion_from_messages
+import asyncio
+import re
+from typing import Callable, Dict, List, Optional, Tuple
+
+from ..chat_bot import aget_completion_from_messages, get_completion_from_messages, run_async
+from ..config import get_settings
+from ..utils.tokens import estimate_tokens, truncate_to_tokens
 
 
 class PageVerifier:
@@ -17,8 +22,20 @@ class PageVerifier:
     - Page has medium confidence (3-4 score)
     - Unusual structure detected
     - Low overall pattern matches across datasheet
+
+    In batch mode several truncated pages are packed into one prompt and
+    the LLM answers YES/NO per page, falling back to per-page calls only
+    for pages whose answer could not be parsed.
+
+    With max_concurrency > 1 or an early-stop rule, pages (or batches) are
+    verified concurrently in order of confidence score, and outstanding
+    requests are cancelled once enough pages have been confirmed.
     """
 
+    # Default size limits for batch mode (estimated tokens)
+    DEFAULT_BATCH_TOKEN_BUDGET = 6000
+    DEFAULT_PAGE_TOKEN_LIMIT = 1000
+
     def __init__(self, llm_client):
         """
         Initialize page verifier.
@@ -27,12 +44,18 @@ class PageVerifier:
             llm_client: LLMClient instance for making API calls
         """
         self.llm_client = llm_client
-        self.model = llm_client.model if llm_client else "llama-3"
+        self.model = llm_client.model if llm_client else get_settings().llm_model
 
     def verify_pages(
         self,
         candidates: List,
-        content_extractor
+        content_extractor,
+        batch: bool = False,
+        batch_token_budget: int = DEFAULT_BATCH_TOKEN_BUDGET,
+        page_token_limit: int = DEFAULT_PAGE_TOKEN_LIMIT,
+        max_concurrency: int = 1,
+        stop_after: Optional[int] = None,
+        stop_condition: Optional[Callable[[List], bool]] = None
     ) -> List:
         """
         Verify if ambiguous pages contain pinout information.
@@ -40,21 +63,189 @@ class PageVerifier:
         Args:
             candidates: List of PageCandidate objects to verify
             content_extractor: ContentExtractor instance for getting page content
+            batch: Verify several pages per LLM call
+            batch_token_budget: Estimated token limit for one batched prompt
+            page_token_limit: Each page's text is truncated to this many
+                              estimated tokens in batch mode
+            max_concurrency: Number of verification requests in flight;
+                             above 1 the requests run concurrently
+            stop_after: Stop once this many ambiguous pages are confirmed
+            stop_condition: Stop once this returns True for the list of
+                            accepted candidates (unambiguous + confirmed)
+
+        Returns:
+            Updated list of PageCandidate objects with verification results.
+            Ambiguous pages left unverified after an early stop are dropped.
+        """
+        if max_concurrency > 1 or stop_after is not None or stop_condition is not None:
+            return run_async(self.averify_pages(
+                candidates,
+                content_extractor,
+                batch=batch,
+                batch_token_budget=batch_token_budget,
+                page_token_limit=page_token_limit,
+                max_concurrency=max_concurrency,
+                stop_after=stop_after,
+                stop_condition=stop_condition
+            ))
+
+        ambiguous = [
+            candidate for candidate in candidates
+            if getattr(candidate, 'needs_verification', False)
+        ]
+        page_contents = {
+            candidate.page_number: content_extractor.extract_single_page(candidate.page_number)
+            for candidate in ambiguous
+        }
+
+        if batch:
+            verdicts = {}
+            for page_batch in self._make_batches(
+                ambiguous, page_contents, batch_token_budget, page_token_limit
+            ):
+                verdicts.update(self._verify_batch(page_batch, page_contents))
+        else:
+            verdicts = {
+                candidate.page_number: self._ask_llm_about_page(page_contents[candidate.page_number])
+                for candidate in ambiguous
+            }
+
+        return self._apply_verdicts(candidates, verdicts)
+
+    async def averify_pages(
+        self,
+        candidates: List,
+        content_extractor,
+        batch: bool = False,
+        batch_token_budget: int = DEFAULT_BATCH_TOKEN_BUDGET,
+        page_token_limit: int = DEFAULT_PAGE_TOKEN_LIMIT,
+        max_concurrency: int = 4,
+        stop_after: Optional[int] = None,
+        stop_condition: Optional[Callable[[List], bool]] = None
+    ) -> List:
+        """
+        Verify ambiguous pages concurrently, highest confidence first.
+
+        Takes the same arguments as verify_pages(). Once stop_after pages are
+        confirmed, or stop_condition returns True, outstanding requests are
+        cancelled and the remaining ambiguous pages are dropped.
 
         Returns:
             Updated list of PageCandidate objects with verification results
         """
+        ambiguous = sorted(
+            (c for c in candidates if getattr(c, 'needs_verification', False)),
+            key=lambda c: c.confidence_score,
+            reverse=True
+        )
+        by_page = {c.page_number: c for c in ambiguous}
+        page_contents = {
+            candidate.page_number: content_extractor.extract_single_page(candidate.page_number)
+            for candidate in ambiguous
+        }
+
+        if batch:
+            units = self._make_batches(
+                ambiguous, page_contents, batch_token_budget, page_token_limit
+            )
+        else:
+            units = [[(c.page_number, page_contents[c.page_number])] for c in ambiguous]
+
+        accepted = [c for c in candidates if not getattr(c, 'needs_verification', False)]
+        confirmed = []
+        verdicts = {}
+
+        def should_stop() -> bool:
+            if stop_after is not None and len(confirmed) >= stop_after:
+                return True
+            if stop_condition is not None and stop_condition(accepted + confirmed):
+                return True
+            return False
+
+        remaining = iter(units)
+        pending = set()
+
+        def launch() -> None:
+            while len(pending) < max(1, max_concurrency):
+                unit = next(remaining, None)
+                if unit is None:
+                    return
+                pending.add(asyncio.ensure_future(self._averify_unit(unit, page_contents)))
+
+        launch()
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                for page_num, is_relevant in task.result().items():
+                    verdicts[page_num] = is_relevant
+                    if is_relevant:
+                        confirmed.append(by_page[page_num])
+
+            if should_stop():
+                for task in pending:
+                    task.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
+                break
+            launch()
+
+        return self._apply_verdicts(candidates, verdicts)
+
+    async def _averify_unit(
+        self,
+        page_batch: List[Tuple[int, str]],
+        page_contents: Dict[int, str]
+    ) -> Dict[int, bool]:
+        """Async counterpart of _verify_batch() for one page or one batch."""
+        verdicts = {}
+        if len(page_batch) > 1:
+            messages = self._build_batch_messages(page_batch)
+            try:
+                response = await self._acomplete(messages)
+                verdicts = self._parse_batch_response(response, [num for num, _ in page_batch])
+            except Exception as e:
+                print(f"Warning: Batched LLM verification failed: {e}. Verifying pages one by one.")
+
+        missing = [page_num for page_num, _ in page_batch if page_num not in verdicts]
+        results = await asyncio.gather(
+            *(self._aask_llm_about_page(page_contents[page_num]) for page_num in missing)
+        )
+        verdicts.update(zip(missing, results))
+        return verdicts
+
+    async def _aask_llm_about_page(self, page_content: str) -> bool:
+        """Async counterpart of _ask_llm_about_page()."""
+        messages = self._build_verification_messages(page_content)
+        try:
+            response = await self._acomplete(messages)
+            return self._parse_verification_response(response)
+        except Exception as e:
+            # On error, conservatively include page
+            print(f"Warning: LLM verification failed: {e}. Including page by default.")
+            return True
+
+    async def _acomplete(self, messages: list) -> str:
+        """Run a completion, through the LLM client's concurrency limit if available."""
+        if self.llm_client is not None and hasattr(self.llm_client, "acomplete"):
+            return await self.llm_client.acomplete(messages)
+        return await aget_completion_from_messages(messages, model=self.model)
+
+    def _apply_verdicts(self, candidates: List, verdicts: Dict[int, bool]) -> List:
+        """
+        Build the verified candidate list, preserving input order.
+
+        Args:
+            candidates: Original candidates
+            verdicts: Verification result by page number (pages without a
+                      verdict were not verified and are dropped)
+
+        Returns:
+            Candidates that are unambiguous or were confirmed by the LLM
+        """
         verified_candidates = []
 
         for candidate in candidates:
-            if hasattr(candidate, 'needs_verification') and candidate.needs_verification:
-                # Get page content
-                page_content = content_extractor.extract_single_page(
-                    candidate.page_number
-                )
-
-                # Use LLM to verify
-                is_relevant = self._ask_llm_about_page(page_content)
+            if getattr(candidate, 'needs_verification', False):
+                is_relevant = verdicts.get(candidate.page_number, False)
 
                 # Update candidate based on LLM judgment
                 if is_relevant:
@@ -68,6 +259,139 @@ class PageVerifier:
 
         return verified_candidates
 
+    def _make_batches(
+        self,
+        candidates: List,
+        page_contents: Dict[int, str],
+        token_budget: int,
+        page_token_limit: int
+    ) -> List[List[Tuple[int, str]]]:
+        """
+        Split pages into batches that fit the token budget.
+
+        Args:
+            candidates: Candidates to verify
+            page_contents: Full page text by page number
+            token_budget: Estimated token limit per batched prompt
+            page_token_limit: Per-page truncation limit
+
+        Returns:
+            List of batches of (page_number, truncated_text) tuples
+        """
+        overhead = estimate_tokens(self._build_batch_messages([])[1]["content"])
+        budget = max(token_budget - overhead, page_token_limit)
+
+        batches = []
+        current = []
+        current_tokens = 0
+        for candidate in candidates:
+            text = truncate_to_tokens(page_contents[candidate.page_number], page_token_limit)
+            tokens = estimate_tokens(text) + 10  # Page marker and separators
+            if current and current_tokens + tokens > budget:
+                batches.append(current)
+                current = []
+                current_tokens = 0
+            current.append((candidate.page_number, text))
+            current_tokens += tokens
+
+        if current:
+            batches.append(current)
+        return batches
+
+    def _verify_batch(
+        self,
+        page_batch: List[Tuple[int, str]],
+        page_contents: Dict[int, str]
+    ) -> Dict[int, bool]:
+        """
+        Verify a batch of pages with one LLM call.
+
+        Pages missing from the parsed answer (or all pages, if the call
+        fails) are verified individually with their full text.
+
+        Args:
+            page_batch: (page_number, truncated_text) tuples
+            page_contents: Full page text by page number
+
+        Returns:
+            Dict mapping page number to verification result
+        """
+        verdicts = {}
+        if len(page_batch) > 1:
+            messages = self._build_batch_messages(page_batch)
+            try:
+                response = get_completion_from_messages(messages, model=self.model)
+                verdicts = self._parse_batch_response(response, [num for num, _ in page_batch])
+            except Exception as e:
+                print(f"Warning: Batched LLM verification failed: {e}. Verifying pages one by one.")
+
+        for page_num, _ in page_batch:
+            if page_num not in verdicts:
+                verdicts[page_num] = self._ask_llm_about_page(page_contents[page_num])
+
+        return verdicts
+
+    def _build_batch_messages(self, page_batch: List[Tuple[int, str]]) -> list:
+        """
+        Build messages for verifying several pages in one call.
+
+        Args:
+            page_batch: (page_number, text) tuples
+
+        Returns:
+            List of message dictionaries
+        """
+        system_prompt = (
+            "You are verifying which pages from an electronic component datasheet "
+            "contain pinout/pin configuration information."
+        )
+
+        pages = "\n\n".join(
+            f"--- Page {page_num} ---\n{text}" for page_num, text in page_batch
+        )
+
+        user_prompt = f"""Pages:
+{pages}
+
+For each page above, decide whether it contains pinout information such as:
+- Pin numbers and their names
+- Pin descriptions or functions
+- Package configuration diagrams
+- Mechanical/pin drawing specifications
+
+Answer with exactly one line per page, in this form and nothing else:
+Page <number>: YES
+Page <number>: NO"""
+
+        return [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt}
+        ]
+
+    def _parse_batch_response(
+        self,
+        response: str,
+        page_numbers: List[int]
+    ) -> Dict[int, bool]:
+        """
+        Parse a batched verification response.
+
+        Args:
+            response: LLM response text
+            page_numbers: Pages that were asked about
+
+        Returns:
+            Dict of page number to result, for the pages that could be parsed
+        """
+        verdicts = {}
+        for match in re.finditer(
+            r"page\s*(\d+)\s*[:\-=]?\s*\**\s*(yes|no)\b", response, re.IGNORECASE
+        ):
+            page_num = int(match.group(1))
+            if page_num in page_numbers and page_num not in verdicts:
+                verdicts[page_num] = match.group(2).upper() == "YES"
+        return verdicts
+
     def verify_single_page(
         self,
         candidate,
@@ -0,0 +1,174 @@
+"""
+Deterministic merge of per-chunk pin extraction results.
+
+In map-reduce extraction each page (chunk) of the pinout is sent to the LLM
+separately. The chunk results overlap (a pin table row repeated on a
+continuation page, a package summary on every page) and can disagree.
+PinMerger combines them into one PinData; the result depends only on the
+chunk results and their order, never on which request finished first.
+"""
+
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from ..models.pin_data import PackageInfo, Pin, PinData
+
+_UNKNOWN = ("", "unknown", "none", "null", "n/a")
+
+
+@dataclass
+class PinConflict:
+    """A pin number that the chunks named differently."""
+
+    number: int
+    chosen: str
+    names: List[str] = field(default_factory=list)  # Every distinct name, in chunk order
+
+
+def _known(value: Optional[str]) -> bool:
+    return value is not None and str(value).strip().lower() not in _UNKNOWN
+
+
+def _name_key(name: str) -> str:
+    """Voting key for a pin name (case and spacing ignored)."""
+    return " ".join(str(name).upper().split())
+
+
+def _vote(values: List[Tuple[str, int]]) -> Optional[str]:
+    """
+    Most common value; ties go to the longer (more specific) value, then
+    to the one seen first.
+
+    Args:
+        values: (value, chunk index) pairs
+    """
+    if not values:
+        return None
+    counts = Counter(value for value, _ in values)
+    first_seen: Dict[str, int] = {}
+    for value, index in values:
+        first_seen.setdefault(value, index)
+    return min(counts, key=lambda v: (-counts[v], -len(v), first_seen[v]))
+
+
+class PinMerger:
+    """
+    Merge chunk PinData results into one.
+
+    Rules:
+        - component_name: most common known name
+        - package type: most common known type; pin_count: most common
+          non-zero count (larger on ties); dimensions from the first chunk
+          that reports them for the chosen type
+        - pins: deduplicated by number; the name is voted across chunks
+          (ties to the more specific name, then the earlier chunk) and the
+          function comes from the first chunk using that name. Pins
+          numbered above the chosen pin_count are dropped.
+        - extraction_method: shared method, else "Mixed"
+
+    After merge(), conflicts lists the pin numbers whose names disagreed.
+    """
+
+    def __init__(self):
+        self.conflicts: List[PinConflict] = []
+
+    def merge(self, chunks: List[PinData]) -> PinData:
+        """
+        Merge chunk results (in document order).
+
+        Args:
+            chunks: PinData per chunk
+
+        Returns:
+            Merged PinData with pins sorted by number
+
+        Raises:
+            ValueError: If chunks is empty
+        """
+        if not chunks:
+            raise ValueError("No chunk results to merge")
+
+        self.conflicts = []
+        package = self._merge_package(chunks)
+
+        names = [
+            (c.component_name.strip(), i) for i, c in enumerate(chunks) if _known(c.component_name)
+        ]
+        methods = {c.extraction_method for c in chunks if _known(c.extraction_method)}
+        if len(methods) == 1:
+            method = methods.pop()
+        else:
+            method = "Mixed" if methods else "Unknown"
+
+        return PinData(
+            component_name=_vote(names) or "Unknown",
+            package=package,
+            pins=self._merge_pins(chunks, package.pin_count),
+            extraction_method=method,
+        )
+
+    def _merge_package(self, chunks: List[PinData]) -> PackageInfo:
+        """Vote the package type and pin count; take dimensions from the first match."""
+        types = [
+            (c.package.type.strip(), i) for i, c in enumerate(chunks) if _known(c.package.type)
+        ]
+        package_type = _vote(types) or "Unknown"
+
+        counts = Counter(c.package.pin_count for c in chunks if (c.package.pin_count or 0) > 0)
+        pin_count = min(counts, key=lambda n: (-counts[n], -n)) if counts else 0
+
+        same_type = [c.package for c in chunks if c.package.type.strip() == package_type]
+        dimensioned = next((p for p in same_type if p.width > 0 and p.height > 0), None)
+        return PackageInfo(
+            type=package_type,
+            pin_count=pin_count,
+            width=dimensioned.width if dimensioned else 0.0,
+            height=dimensioned.height if dimensioned else 0.0,
+            pitch=next((p.pitch for p in same_type if p.pitch), None),
+            thickness=next((p.thickness for p in same_type if p.thickness), None),
+        )
+
+    def _merge_pins(self, chunks: List[PinData], pin_count: int) -> List[Pin]:
+        """Deduplicate pins by number and resolve naming conflicts."""
+        by_number: Dict[int, List[Tuple[Pin, int]]] = {}
+        for index, chunk in enumerate(chunks):
+            for pin in chunk.pins:
+                if pin.number <= 0 or not str(pin.name).strip():
+                    continue
+                if pin_count and pin.number > pin_count:
+                    continue
+                by_number.setdefault(pin.number, []).append((pin, index))
+
+        merged = []
+        for number in sorted(by_number):
+            entries = by_number[number]
+            chosen_key = _vote([(_name_key(pin.name), index) for pin, index in entries])
+            agreeing = [pin for pin, _ in entries if _name_key(pin.name) == chosen_key]
+
+            distinct = []
+            for pin, _ in entries:
+                if _name_key(pin.name) not in [_name_key(n) for n in distinct]:
+                    distinct.append(pin.name.strip())
+            if len(distinct) > 1:
+                self.conflicts.append(PinConflict(number, agreeing[0].name.strip(), distinct))
+
+            merged.append(Pin(
+                number=number,
+                name=agreeing[0].name.strip(),
+                function=next((pin.function for pin in agreeing if pin.function), None),
+            ))
+        return merged
+
+
+def merge_pin_data(chunks: List[PinData]) -> PinData:
+    """
+    Merge chunk results with the default rules (see PinMerger).
+
+    Args:
+        chunks: PinData per chunk, in document order
+
+    Returns:
+        Merged PinData
+    """
+    return PinMerger().merge(chunks)
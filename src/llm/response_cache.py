@@ -0,0 +1,132 @@
+"""
+Content-addressed cache for LLM responses.
+
+At temperature 0 a chat completion is effectively a pure function of the
+model and the messages, so responses can be replayed from disk instead of
+paying another 20-60 s round-trip.
+"""
+
+import hashlib
+import json
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+from ..utils.disk_cache import DEFAULT_MAX_BYTES, DiskCache, default_cache_dir
+
+
+def make_cache_key(*parts: Any) -> str:
+    """
+    Build a stable cache key from JSON-serializable parts.
+
+    Args:
+        *parts: Values identifying the request (model, temperature, messages...)
+
+    Returns:
+        SHA-256 hex digest of the canonical JSON encoding of the parts
+    """
+    canonical = json.dumps(parts, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class ResponseCache(ABC):
+    """
+    Base class for response caches.
+
+    Subclasses implement _load() and _store(); this class keeps hit/miss
+    counters so every backend reports them the same way.
+    """
+
+    def __init__(self):
+        """Initialize counters."""
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Get a cached response.
+
+        Args:
+            key: Cache key (see make_cache_key)
+
+        Returns:
+            Cached response text, or None on a miss
+        """
+        value = self._load(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        """
+        Store a response.
+
+        Args:
+            key: Cache key (see make_cache_key)
+            value: Response text
+        """
+        self._store(key, value)
+
+    def stats(self) -> Dict[str, int]:
+        """Get hit/miss counters."""
+        return {"hits": self.hits, "misses": self.misses}
+
+    @abstractmethod
+    def _load(self, key: str) -> Optional[str]:
+        """Return the stored response for key, or None."""
+
+    @abstractmethod
+    def _store(self, key: str, value: str) -> None:
+        """Store the response for key."""
+
+
+class FileResponseCache(ResponseCache):
+    """
+    Response cache stored as files in a local directory.
+
+    Entries expire after ttl_seconds (if set); the directory is kept under
+    max_bytes by evicting least-recently-used entries.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[Union[str, Path]] = None,
+        ttl_seconds: Optional[float] = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory for entries (default: <default_cache_dir()>/llm)
+            ttl_seconds: Maximum entry age in seconds (None = never expire)
+            max_bytes: Size limit for the cache directory
+        """
+        super().__init__()
+        directory = Path(cache_dir) if cache_dir else default_cache_dir() / "llm"
+        self.store = DiskCache(directory, max_bytes=max_bytes)
+        self.ttl_seconds = ttl_seconds
+
+    def _load(self, key: str) -> Optional[str]:
+        data = self.store.get(key)
+        if data is None:
+            return None
+
+        try:
+            entry = json.loads(data.decode("utf-8"))
+        except (UnicodeDecodeError, ValueError):
+            self.store.delete(key)
+            return None
+
+        if self.ttl_seconds is not None and time.time() - entry["created"] > self.ttl_seconds:
+            self.store.delete(key)
+            return None
+
+        return entry["value"]
+
+    def _store(self, key: str, value: str) -> None:
+        entry = {"created": time.time(), "value": value}
+        self.store.set(key, json.dumps(entry).encode("utf-8"))
@@ -10,15 +10,10 @@ import argparse
 from pathlib import Path
 from typing import Optional
 
-# Import project modules
-from .pdf_extractor import PageDetector, ContentExtractor
-from .llm import LLMClient
-from .llm.image_ocr_client import ImageOCRClient
-from .schematic_generator import build_schematic_from_pin_data
-from .utils import PackageDetector
-from .models import PinData, Pin, PackageInfo
-import io
-import pdfplumber
+from . import config
+from .config import Settings
+from .utils.tokens import DEFAULT_PROMPT_TOKEN_BUDGET
+from .utils import tracing
 
 
 def parse_arguments():
@@ -59,8 +54,7 @@ Examples:
 
     parser.add_argument(
         "--model",
-        default="llama-3",
-        help="LLM model to use (default: %(default)s)"
+        help=f"LLM model to use (default: llm_model setting, {Settings.llm_model})"
     )
 
     parser.add_argument(
@@ -70,18 +64,112 @@ Examples:
         help="Minimum confidence score for page detection (default: %(default)s)"
     )
 
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Number of processes for page detection "
+             f"(default: detect_workers setting, {Settings.detect_workers})"
+    )
+
+    parser.add_argument(
+        "--prefilter-min-score",
+        type=int,
+        default=2,
+        help="Minimum text-only score before a page gets full table/diagram "
+             "analysis; 0 disables the prefilter (default: %(default)s)"
+    )
+
+    parser.add_argument(
+        "--cache-dir",
+        help="Directory for cached detection results "
+             "(default: $DATASHEET_PARSER_CACHE_DIR or ~/.cache/datasheet-parser)"
+    )
+
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Do not read or write cached detection results or LLM responses"
+    )
+
+    parser.add_argument(
+        "--llm-cache-ttl",
+        type=float,
+        default=168,
+        help="Hours before a cached LLM response expires (default: %(default)s)"
+    )
+
+    parser.add_argument(
+        "--prompt-token-budget",
+        type=int,
+        default=DEFAULT_PROMPT_TOKEN_BUDGET,
+        help="Estimated-token budget for datasheet content in the pin extraction prompt; "
+             "the most pinout-relevant blocks are kept, 0 sends everything (default: %(default)s)"
+    )
+
+    parser.add_argument(
+        "--no-table-fast-path",
+        action="store_true",
+        help="Always extract pins with the LLM, even when a pin table can be read directly"
+    )
+
+    parser.add_argument(
+        "--map-reduce",
+        action="store_true",
+        help="Extract pins page by page with concurrent LLM requests and merge the results "
+             "(for pinouts spanning many pages; --prompt-token-budget is not applied)"
+    )
+
+    parser.add_argument(
+        "--verify-ambiguity",
+        action="store_true",
+        help="Verify ambiguous pages with the LLM before extraction"
+    )
+
+    parser.add_argument(
+        "--verify-batch",
+        action="store_true",
+        help="Verify several ambiguous pages per LLM call"
+    )
+
+    parser.add_argument(
+        "--verify-workers",
+        type=int,
+        help="Concurrent page verification requests "
+             f"(default: verify_workers setting, {Settings.verify_workers})"
+    )
+
+    parser.add_argument(
+        "--verify-stop-after",
+        type=int,
+        default=None,
+        help="Stop verifying once this many ambiguous pages are confirmed"
+    )
+
     parser.add_argument(
         "--verbose", "-v",
         action="store_true",
         help="Enable verbose output"
     )
 
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print a per-stage timing table when the run ends"
+    )
+
+    parser.add_argument(
+        "--trace-file",
+        help="Write a Chrome trace JSON of the run (open in chrome://tracing or ui.perfetto.dev)"
+    )
+
     parser.add_argument(
         "--layout-mode",
         action="store_true",
         help="Use Vision API to extract layout structure (separated flow: LLM for pins, Vision for layout)"
     )
 
+    config.add_config_arguments(parser)
+
     return parser.parse_args()
 
 
@@ -89,6 +177,12 @@ def main():
     """Main CLI entry point."""
     args = parse_arguments()
 
+    try:
+        config.configure_from_args(args, config.PIPELINE_ARG_FIELDS)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
     # Validate input file
     input_path = Path(args.input)
     if not input_path.exists():
@@ -99,105 +193,37 @@ def main():
         print(f"Error: Input file must be a PDF")
         sys.exit(1)
 
-    # Get API key - check DATASHEET_PARSER_API_KEY first, then FASTCHAT_API_KEY
-    import os
-    api_key = args.api_key or os.environ.get("DATASHEET_PARSER_API_KEY") or os.environ.get("FASTCHAT_API_KEY")
-
     # Set FASTCHAT_API_KEY if provided via argument
     if args.api_key:
+        import os
         os.environ["FASTCHAT_API_KEY"] = args.api_key
 
-    # Validate output path
     output_path = Path(args.output)
-    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    if args.profile or args.trace_file:
+        tracing.enable()
+
+    # Imported after argument parsing so --help and bad arguments return at once
+    with tracing.span("import_pipeline"):
+        from .pipeline import PipelineError, PipelineOptions, process_datasheet
 
     if args.verbose:
         print(f"Processing: {input_path}")
         print(f"Output: {output_path}")
 
     try:
-        # Step 1: Detect relevant pages
-        if args.verbose:
-            print("\n[1/3] Detecting relevant pages...")
-
-        with PageDetector(str(input_path)) as detector:
-            candidates = detector.detect_relevant_pages(
-                min_confidence=args.min_confidence
-            )
-
-            if args.verbose:
-                print(f"Found {len(candidates)} relevant pages:")
-                for c in candidates:
-                    print(f"  - Page {c.page_number} (confidence: {c.confidence_score}): {', '.join(c.reasons)}")
-
-        if not candidates:
-            print("Error: No relevant pages found in datasheet")
-            print("Try lowering --min-confidence")
-            sys.exit(1)
-
-        # Step 2: Extract content from relevant pages
-        if args.verbose:
-            print("\n[2/3] Extracting content from relevant pages...")
-
-        with ContentExtractor(str(input_path)) as extractor:
-            content = extractor.extract_content(candidates)
-
-            if args.verbose:
-                print(f"Extracted content from {len(content.pages)} pages")
-                print(f"Found {len(content.tables)} table(s)")
-                print(f"Found {len(content.images)} image(s)")
-
-        # Step 3: Extract pin data with LLM
-        if args.verbose:
-            print("\n[3/3] Extracting pin data with LLM...")
-
-        if not api_key:
-            print("Error: API key required for pin data extraction")
-            print("Set --api-key or FASTCHAT_API_KEY environment variable")
-            sys.exit(1)
-
-        llm_client = LLMClient(api_key=api_key, model=args.model)
-        pin_data = llm_client.extract_pin_data(
-            content=content.text_content,
-            images=[img_data for _, img_data in content.images] if content.images else None
-        )
-
-        if args.verbose:
-            print(f"Extracted pin data:")
-            print(f"  Component: {pin_data.component_name}")
-            print(f"  Package: {pin_data.package.type}-{pin_data.package.pin_count}")
-            if pin_data.package.width > 0:
-                print(f"  Dimensions: {pin_data.package.width}mm x {pin_data.package.height}mm")
-            else:
-                print(f"  Dimensions: N/A (will be estimated from package type)")
-            print(f"  Pin count: {len(pin_data.pins)}")
-            print(f"  Extraction method: {pin_data.extraction_method}")
-
-            if len(pin_data.pins) > 0:
-                print(f"  Pins (all {len(pin_data.pins)} pins):")
-                for i, pin in enumerate(pin_data.pins, 1):
-                    func = f" ({pin.function})" if pin.function else ""
-                    print(f"    {i:2d}. Pin {pin.number}: {pin.name}{func}")
-
-        # Validate and normalize package
-        detector = PackageDetector()
-        normalized_pkg = detector.normalize_package_name(pin_data.package.type)
-        pin_data.package.type = normalized_pkg
-
-        # Step 4: Generate schematic symbol
-        if args.verbose:
-            print("\n[3/3] Generating schematic symbol...")
-
-        result = build_schematic_from_pin_data(
-            pin_data=pin_data,
-            output_path=str(output_path)
+        process_datasheet(
+            input_path,
+            output_path,
+            api_key=args.api_key,
+            options=PipelineOptions.from_args(args)
         )
-        if not result:
-            print(f"Error: Failed to generate schematic")
-            sys.exit(1)
 
         print(f"\nSuccess! Schematic generated: {output_path}")
 
+    except PipelineError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
     except FileNotFoundError as e:
         print(f"Error: File not found - {e}")
         sys.exit(1)
@@ -217,6 +243,8 @@ def main():
             import traceback
             traceback.print_exc()
         sys.exit(1)
+    finally:
+        tracing.report(args.profile, args.trace_file)
 
 
 if __name__ == "__main__":
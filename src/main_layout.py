@@ -8,22 +8,77 @@ NEW: Supports --layout-mode for Vision API layout extraction.
 
 import sys
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Union
 
 # Import project modules
-from .pdf_extractor import PageDetector, ContentExtractor
-from .llm import LLMClient
+from . import config
+from .config import Settings
+from .pdf_extractor import DatasheetDocument, DetectionCache, PageDetector, ContentExtractor
+from .pdf_extractor import RenderOptions, render_pinout_figure
+from .pdf_extractor import ContentPacker, PinTableParser
+from .pdf_extractor.document import open_document
+from .llm import FileResponseCache
 from .llm.image_ocr_client import ImageOCRClient
-from .schematic_generator import build_schematic_from_pin_data
-from .utils import PackageDetector
+from .utils import PackageDetector, default_cache_dir, tracing
+from .utils.tokens import DEFAULT_PROMPT_TOKEN_BUDGET
 from .models import PinData, Pin, PackageInfo
-import io
-import pdfplumber
-import requests
 import re
 
 
+# Vision API output limit for layout extraction (endpoint and timeout come
+# from the layout_url and layout_timeout settings)
+LAYOUT_OUTPUT_TOKEN = 2048
+
+
+def create_layout_client(
+    cache: Optional[FileResponseCache] = None, bypass_cache: bool = False
+) -> ImageOCRClient:
+    """
+    Create the Vision API client used for layout extraction.
+
+    Args:
+        cache: Optional cache for vision responses
+        bypass_cache: Ignore cached responses (fresh ones are still stored)
+
+    Returns:
+        ImageOCRClient for the layout endpoint
+    """
+    settings = config.get_settings()
+    return ImageOCRClient(
+        api_url=settings.layout_url or settings.vision_url,
+        output_token=LAYOUT_OUTPUT_TOKEN,
+        timeout=settings.layout_timeout,
+        cache=cache,
+        bypass_cache=bypass_cache
+    )
+
+
+def run_layout_extraction(
+    document: DatasheetDocument,
+    page_num: int,
+    verbose: bool,
+    render_options: Optional[RenderOptions],
+    vision_cache: Optional[FileResponseCache],
+    bypass_cache: bool
+) -> Optional[str]:
+    """
+    Run layout extraction with its own Vision API client.
+
+    Meant to run on a worker thread while the LLM extracts pin data; the
+    client is closed when the call finishes.
+
+    Returns:
+        Layout text description or None if failed
+    """
+    with tracing.span("layout", "vision", page=page_num), \
+            create_layout_client(vision_cache, bypass_cache) as vision_client:
+        return extract_layout_with_vision(
+            document, page_num, verbose, render_options, vision_client
+        )
+
+
 def parse_layout_text(layout_text: str) -> dict:
     """
     Parse Vision API layout text response into structured format.
@@ -111,32 +166,42 @@ def parse_layout_text(layout_text: str) -> dict:
     return result
 
 
-def extract_layout_with_vision(pdf_path: str, page_num: int, verbose: bool = False) -> Optional[str]:
+def extract_layout_with_vision(
+    pdf_path: Union[str, DatasheetDocument],
+    page_num: int,
+    verbose: bool = False,
+    render_options: Optional[RenderOptions] = None,
+    vision_client: Optional[ImageOCRClient] = None
+) -> Optional[str]:
     """
     Extract layout structure using Vision API.
 
     Args:
-        pdf_path: Path to PDF
+        pdf_path: Path to PDF, or a shared DatasheetDocument
         page_num: Page number with pinout diagram
         verbose: Enable verbose output
+        render_options: Cropping, resolution and encoding of the uploaded
+                        image (defaults if None)
+        vision_client: Shared ImageOCRClient whose pooled session is reused
+                       (a temporary one is created if None)
 
     Returns:
         Layout text description or None if failed
     """
     try:
-        with pdfplumber.open(pdf_path) as pdf:
-            if page_num < 1 or page_num > len(pdf.pages):
+        document, owns_document = open_document(pdf_path)
+        try:
+            if page_num < 1 or page_num > document.total_pages:
                 print(f"Error: Page {page_num} does not exist")
                 return None
 
-            page = pdf.pages[page_num - 1]
-
-            # Convert page to image
-            pil_image = page.to_image()
-            img_bytes = io.BytesIO()
-            pil_image.save(img_bytes, format="PNG")
-            img_bytes.seek(0)
-            img_data = img_bytes.getvalue()
+            # Render just the pinout figure (reuses the page render if already made)
+            with tracing.span("layout.render", "vision", page=page_num) as span:
+                figure = render_pinout_figure(document, page_num, render_options)
+                span.set(bytes=len(figure.data), width=figure.width, height=figure.height)
+        finally:
+            if owns_document:
+                document.close()
 
         # Vision API prompt for layout - FORCE it to find pin positions
         vision_prompt = """You are analyzing an electronic component pinout diagram image.
@@ -198,24 +263,37 @@ CRITICAL:
 """
 
         if verbose:
+            x0, top, x1, bottom = figure.bbox
+            print(
+                f"  Rendered region ({x0:.0f}, {top:.0f})-({x1:.0f}, {bottom:.0f}) at "
+                f"{figure.resolution} DPI: {figure.width}x{figure.height}, {len(figure.data)} bytes"
+            )
             print(f"  Sending page {page_num} to Vision API for layout extraction...")
 
-        vision_client = ImageOCRClient(
-            api_url="https://qwen.ideeza.com/describe_image/",
-            output_token=2048,
-            timeout=120
-        )
+        owns_client = vision_client is None
+        if owns_client:
+            vision_client = create_layout_client()
 
-        files = {"file": (f"page_{page_num}.png", img_data, "image/png")}
-        data = {"text": vision_prompt, "output_token": "2048"}
+        # The same crop of the same page always gets the same answer
+        cache_key = vision_client.cache_key(figure.data, vision_prompt)
+        cached_text = vision_client.get_cached(cache_key)
+        if cached_text is not None:
+            if owns_client:
+                vision_client.close()
+            if verbose:
+                print("  Layout loaded from vision cache")
+            return cached_text
 
-        response = requests.post(
-            vision_client.api_url,
-            headers={"accept": "application/json"},
-            files=files,
-            data=data,
-            timeout=120
-        )
+        extension = "jpg" if figure.mime_type == "image/jpeg" else "png"
+        try:
+            response = vision_client.describe_image(
+                figure.data,
+                vision_prompt,
+                filename=f"page_{page_num}.{extension}"
+            )
+        finally:
+            if owns_client:
+                vision_client.close()
 
         if verbose:
             print(f"  Vision API returned (status: {response.status_code})")
@@ -230,6 +308,7 @@ CRITICAL:
                 layout_text = re.sub(r'```(?:text)?\s*', '', resp_json["description"])
                 if verbose:
                     print(f"  Layout extracted successfully")
+                vision_client.set_cached(cache_key, layout_text)
                 return layout_text
             else:
                 return response.text
@@ -282,8 +361,7 @@ Examples:
 
     parser.add_argument(
         "--model",
-        default="llama-3",
-        help="LLM model to use (default: %(default)s)"
+        help=f"LLM model to use (default: llm_model setting, {Settings.llm_model})"
     )
 
     parser.add_argument(
@@ -293,18 +371,159 @@ Examples:
         help="Minimum confidence score for page detection (default: %(default)s)"
     )
 
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Number of processes for page detection "
+             f"(default: detect_workers setting, {Settings.detect_workers})"
+    )
+
+    parser.add_argument(
+        "--prefilter-min-score",
+        type=int,
+        default=2,
+        help="Minimum text-only score before a page gets full table/diagram "
+             "analysis; 0 disables the prefilter (default: %(default)s)"
+    )
+
+    parser.add_argument(
+        "--cache-dir",
+        help="Directory for cached detection results "
+             "(default: $DATASHEET_PARSER_CACHE_DIR or ~/.cache/datasheet-parser)"
+    )
+
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Do not read or write cached detection results, LLM or vision responses"
+    )
+
+    parser.add_argument(
+        "--llm-cache-ttl",
+        type=float,
+        default=168,
+        help="Hours before a cached LLM or vision response expires (default: %(default)s)"
+    )
+
+    parser.add_argument(
+        "--prompt-token-budget",
+        type=int,
+        default=DEFAULT_PROMPT_TOKEN_BUDGET,
+        help="Estimated-token budget for datasheet content in the pin extraction prompt; "
+             "the most pinout-relevant blocks are kept, 0 sends everything (default: %(default)s)"
+    )
+
+    parser.add_argument(
+        "--no-table-fast-path",
+        action="store_true",
+        help="Always extract pins with the LLM, even when a pin table can be read directly"
+    )
+
+    parser.add_argument(
+        "--map-reduce",
+        action="store_true",
+        help="Extract pins page by page with concurrent LLM requests and merge the results "
+             "(for pinouts spanning many pages; --prompt-token-budget is not applied)"
+    )
+
     parser.add_argument(
         "--layout-mode",
         action="store_true",
         help="Use Vision API to extract layout structure (separated flow: LLM for pins, Vision for layout)"
     )
 
+    parser.add_argument(
+        "--verify-ambiguity",
+        action="store_true",
+        help="Verify ambiguous pages with the LLM before extraction"
+    )
+
+    parser.add_argument(
+        "--verify-batch",
+        action="store_true",
+        help="Verify several ambiguous pages per LLM call"
+    )
+
+    parser.add_argument(
+        "--verify-workers",
+        type=int,
+        help="Concurrent page verification requests "
+             f"(default: verify_workers setting, {Settings.verify_workers})"
+    )
+
+    parser.add_argument(
+        "--verify-stop-after",
+        type=int,
+        default=None,
+        help="Stop verifying once this many ambiguous pages are confirmed"
+    )
+
+    parser.add_argument(
+        "--vision-cache-max-mb",
+        type=float,
+        default=256,
+        help="Size limit for cached vision responses in MB (default: %(default)s)"
+    )
+
+    parser.add_argument(
+        "--refresh-vision-cache",
+        action="store_true",
+        help="Ignore cached vision responses and call the API again (results are re-cached)"
+    )
+
+    parser.add_argument(
+        "--vision-dpi",
+        type=int,
+        default=150,
+        help="Render resolution for the layout image (default: %(default)s)"
+    )
+
+    parser.add_argument(
+        "--vision-max-pixels",
+        type=int,
+        default=4_000_000,
+        help="Pixel-count ceiling for the layout image; DPI is lowered to fit (default: %(default)s)"
+    )
+
+    parser.add_argument(
+        "--vision-color",
+        choices=["rgb", "gray", "palette"],
+        default="rgb",
+        help="Color mode for the layout image (default: %(default)s)"
+    )
+
+    parser.add_argument(
+        "--vision-format",
+        choices=["png", "jpeg"],
+        default="png",
+        help="Encoding for the layout image (default: %(default)s)"
+    )
+
+    parser.add_argument(
+        "--no-vision-crop",
+        action="store_true",
+        help="Send the whole page instead of cropping to the pinout figure"
+    )
+
     parser.add_argument(
         "--verbose", "-v",
         action="store_true",
         help="Enable verbose output"
     )
 
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print a per-stage timing table when the run ends"
+    )
+
+    parser.add_argument(
+        "--trace-file",
+        help="Write a Chrome trace JSON of the run (open in chrome://tracing or ui.perfetto.dev)"
+    )
+
+    config.add_config_arguments(parser)
+
     return parser.parse_args()
 
 
@@ -312,6 +531,12 @@ def main():
     """Main CLI entry point."""
     args = parse_arguments()
 
+    try:
+        config.configure_from_args(args, config.PIPELINE_ARG_FIELDS)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
     # Validate input file
     input_path = Path(args.input)
     if not input_path.exists():
@@ -338,20 +563,53 @@ def main():
         print(f"Processing: {input_path}")
         print(f"Output: {output_path}")
 
+    if args.profile or args.trace_file:
+        tracing.enable()
+
+    document = None
+    layout_executor = None
+    layout_future = None
     try:
+        # Open the datasheet once; detection, extraction and layout share it
+        document = DatasheetDocument(str(input_path))
+        cache = None if args.no_cache else DetectionCache(args.cache_dir)
+
         # Step 1: Detect relevant pages
         if args.verbose:
             print("\n[1/4] Detecting relevant pages...")
-        with PageDetector(str(input_path)) as detector:
+        with PageDetector(document, cache=cache) as detector:
+            # Pages just below the threshold are only kept if the LLM confirms them
             candidates = detector.detect_relevant_pages(
-                min_confidence=args.min_confidence
+                min_confidence=args.min_confidence,
+                workers=args.workers,
+                prefilter_min_score=args.prefilter_min_score,
+                include_ambiguous=args.verify_ambiguity and bool(api_key)
             )
 
             if args.verbose:
+                stats = detector.last_stats
+                print(f"Prefilter skipped {stats.skipped_pages} of {stats.total_pages} pages")
                 print(f"Found {len(candidates)} relevant pages:")
                 for c in candidates:
                     print(f" - Page {c.page_number} (confidence: {c.confidence_score}): {', '.join(c.reasons)}")
 
+        # Optionally confirm ambiguous pages with the LLM, highest confidence first
+        if args.verify_ambiguity and api_key and any(c.needs_verification for c in candidates):
+            if args.verbose:
+                print("Verifying ambiguous pages with LLM...")
+            from .llm import LLMClient, PageVerifier
+            verifier = PageVerifier(LLMClient(api_key=api_key, model=args.model))
+            with ContentExtractor(document) as page_source:
+                candidates = verifier.verify_pages(
+                    candidates,
+                    page_source,
+                    batch=args.verify_batch,
+                    max_concurrency=args.verify_workers,
+                    stop_after=args.verify_stop_after
+                )
+            if args.verbose:
+                print(f"{len(candidates)} page(s) after verification")
+
         if not candidates:
             print("Error: No relevant pages found in datasheet")
             print("Try lowering --min-confidence")
@@ -360,7 +618,7 @@ def main():
         # Step 2: Extract content from relevant pages
         if args.verbose:
             print("\n[2/4] Extracting content from relevant pages...")
-        with ContentExtractor(str(input_path)) as extractor:
+        with ContentExtractor(document, cache=cache) as extractor:
             content = extractor.extract_content(candidates)
 
             if args.verbose:
@@ -368,19 +626,96 @@ def main():
                 print(f"Found {len(content.tables)} table(s)")
                 print(f"Found {len(content.images)} image(s)")
 
-        # Step 3: Extract pin data with LLM (for pin names and numbers)
-        if args.verbose:
-            print("\n[3/4] Extracting pin names and numbers with LLM...")
-        if not api_key:
+        # Keep the most pinout-relevant content that fits the prompt budget
+        # (map-reduce sends every page in its own request instead)
+        prompt_content = content.text_content
+        if args.prompt_token_budget > 0 and not args.map_reduce:
+            packed = ContentPacker(args.prompt_token_budget).pack(content, candidates)
+            prompt_content = packed.text
+            if args.verbose:
+                print(
+                    f"Packed content: {packed.tokens_in} -> {packed.tokens} estimated tokens "
+                    f"({packed.dropped_blocks} block(s) dropped, "
+                    f"{packed.deduped_lines} repeated header/footer line(s) removed)"
+                )
+
+        # Clean pin tables are read directly; the LLM is only needed when they don't validate
+        table_pin_data = None
+        if not args.no_table_fast_path:
+            table_result = PinTableParser().parse(content)
+            table_pin_data = table_result.pin_data
+            if args.verbose and table_result.ok:
+                print(
+                    f"Read {len(table_pin_data.pins)} pins from the pin table "
+                    f"(page(s) {', '.join(map(str, table_result.pages))}), skipping the LLM"
+                )
+            elif args.verbose:
+                print(f"Pin table not used: {'; '.join(table_result.problems)}")
+
+        if table_pin_data is None and not api_key:
             print("Error: API key required for pin data extraction")
             print("Set --api-key or FASTCHAT_API_KEY environment variable")
             sys.exit(1)
 
-        llm_client = LLMClient(api_key=api_key, model=args.model)
-        pin_data = llm_client.extract_pin_data(
-            content=content.text_content,
-            images=[img_data for _, img_data in content.images] if content.images else None
-        )
+        # Step 4 (layout mode) is independent of step 3, so start the Vision API
+        # call now and let it run while the LLM extracts the pins
+        layout_page = candidates[0].page_number if candidates else None
+        layout_future = None
+        if args.layout_mode and layout_page:
+            render_options = RenderOptions(
+                resolution=args.vision_dpi,
+                max_pixels=args.vision_max_pixels,
+                color_mode=args.vision_color,
+                image_format=args.vision_format,
+                crop=not args.no_vision_crop
+            )
+            vision_cache = None
+            if not args.no_cache:
+                vision_cache = FileResponseCache(
+                    Path(args.cache_dir) / "vision" if args.cache_dir else default_cache_dir() / "vision",
+                    ttl_seconds=args.llm_cache_ttl * 3600,
+                    max_bytes=int(args.vision_cache_max_mb * 1024 * 1024)
+                )
+            layout_executor = ThreadPoolExecutor(max_workers=1)
+            layout_future = layout_executor.submit(
+                run_layout_extraction,
+                document,
+                layout_page,
+                args.verbose,
+                render_options,
+                vision_cache,
+                args.refresh_vision_cache
+            )
+
+        # Step 3: Extract pin data with LLM (for pin names and numbers) unless the
+        # pin table was read directly
+        llm_cache = None
+        if table_pin_data is not None:
+            pin_data = table_pin_data
+        else:
+            if args.verbose:
+                print("\n[3/4] Extracting pin names and numbers with LLM...")
+
+            if not args.no_cache:
+                llm_cache = FileResponseCache(
+                    Path(args.cache_dir) / "llm" if args.cache_dir else None,
+                    ttl_seconds=args.llm_cache_ttl * 3600
+                )
+
+            from .llm import LLMClient
+            llm_client = LLMClient(api_key=api_key, model=args.model, cache=llm_cache)
+            if args.map_reduce:
+                pin_data = llm_client.extract_pin_data_map_reduce(content.text_content)
+                if args.verbose and llm_client.last_merge is not None:
+                    conflicts = llm_client.last_merge.conflicts
+                    print(f"Merged page chunks ({len(conflicts)} pin name conflict(s))")
+                    for conflict in conflicts:
+                        print(f"  - Pin {conflict.number}: {' / '.join(conflict.names)} -> {conflict.chosen}")
+            else:
+                pin_data = llm_client.extract_pin_data(
+                    content=prompt_content,
+                    images=[img_data for _, img_data in content.images] if content.images else None
+                )
 
         if args.verbose:
             print(f"Extracted pin data:")
@@ -392,6 +727,8 @@ def main():
                 print(f"  Dimensions: N/A (will be estimated from package type)")
             print(f"  Pin count: {len(pin_data.pins)}")
             print(f"  Extraction method: {pin_data.extraction_method}")
+            if llm_cache is not None:
+                print(f"  LLM cache: {llm_cache.hits} hit(s), {llm_cache.misses} miss(es)")
 
         # Step 4: Extract layout structure with Vision API (if layout mode enabled)
         layout_text = None
@@ -399,14 +736,14 @@ def main():
             if args.verbose:
                 print("\n[4/4] Extracting layout structure with Vision API...")
 
-            # Get pinout pages
-            pinout_pages = [c.page_number for c in candidates]
-
-            # Use first pinout page for layout
-            layout_page = pinout_pages[0] if pinout_pages else None
-
-            if layout_page:
-                layout_text = extract_layout_with_vision(str(input_path), layout_page, args.verbose)
+            if layout_future is not None:
+                # Join the background Vision API call; failures fall back to the standard flow
+                try:
+                    layout_text = layout_future.result()
+                except Exception as e:
+                    if args.verbose:
+                        print(f"  Error in layout extraction: {e}")
+                    layout_text = None
 
                 if args.verbose:
                     print(f"Layout text extracted:")
@@ -435,9 +772,10 @@ def main():
         if args.verbose:
             print("\n[5/4] Validating and normalizing package...")
 
-        detector = PackageDetector()
-        normalized_pkg = detector.normalize_package_name(pin_data.package.type)
-        pin_data.package.type = normalized_pkg
+        with tracing.span("normalize_package"):
+            detector = PackageDetector()
+            normalized_pkg = detector.normalize_package_name(pin_data.package.type)
+            pin_data.package.type = normalized_pkg
 
         if args.verbose:
             print(f"Normalized package type: {normalized_pkg}")
@@ -465,11 +803,14 @@ def main():
         else:
             print("Note: Using standard flow (LLM only)")
 
-        result = build_schematic_from_pin_data(
-            pin_data=pin_data,
-            output_path=str(output_path),
-            custom_layout=custom_layout
-        )
+        # CadQuery is only loaded for this step
+        with tracing.span("schematic", "cad", pins=len(pin_data.pins)):
+            from .schematic_generator import build_schematic_from_pin_data
+            result = build_schematic_from_pin_data(
+                pin_data=pin_data,
+                output_path=str(output_path),
+                custom_layout=custom_layout
+            )
 
         if not result:
             print("Error: Failed to generate schematic")
@@ -502,6 +843,15 @@ def main():
             import traceback
             traceback.print_exc()
         sys.exit(1)
+    finally:
+        # Let an in-flight layout render finish before its document is closed
+        if layout_executor is not None:
+            if layout_future is not None:
+                layout_future.cancel()
+            layout_executor.shutdown(wait=True)
+        if document is not None:
+            document.close()
+        tracing.report(args.profile, args.trace_file)
 
 
 if __name__ == "__main__":
@@ -1,6 +1,24 @@
 """PDF extraction modules for identifying and extracting relevant pages."""
 
-from .page_detector import PageDetector, PageCandidate
+from .document import DatasheetDocument
+from .page_detector import PageDetector, PageCandidate, DetectionStats
 from .content_extractor import ContentExtractor
+from .content_packer import ContentPacker, PackedContent
+from .pin_table_parser import PinTableParser, PinTableResult
+from .detection_cache import DetectionCache
+from .figure_renderer import RenderOptions, render_pinout_figure
 
-__all__ = ["PageDetector", "PageCandidate", "ContentExtractor"]
+__all__ = [
+    "DatasheetDocument",
+    "PageDetector",
+    "PageCandidate",
+    "DetectionStats",
+    "ContentExtractor",
+    "ContentPacker",
+    "PackedContent",
+    "PinTableParser",
+    "PinTableResult",
+    "DetectionCache",
+    "RenderOptions",
+    "render_pinout_figure",
+]
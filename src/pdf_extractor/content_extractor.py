@@ -1,17 +1,16 @@
 """Extract content from identified relevant pages for LLM processing."""
 
-import io
 from dataclasses import dataclass
-from typing import List, Optional, Tuple
-from pathlib import Path
-
-try:
-    import pdfplumber
-except ImportError:
-    pdfplumber = None
+from typing import List, Optional, Set, Tuple, Union
 
+from .document import DatasheetDocument, open_document
+from .image_extraction import extract_page_images
 from .page_detector import PageCandidate
 from .pinout_filter import PinoutFilter
+from ..utils import tracing
+
+# Bump when extraction or filtering changes so cached content is invalidated
+EXTRACTOR_VERSION = "2"
 
 
 @dataclass
@@ -26,24 +25,22 @@ class ExtractedContent:
 class ContentExtractor:
     """Extract text, images, and tables from relevant pages."""
 
-    def __init__(self, pdf_path: str):
+    def __init__(self, pdf_path: Union[str, DatasheetDocument], cache=None):
         """
         Initialize content extractor.
 
         Args:
-            pdf_path: Path to the PDF datasheet
+            pdf_path: Path to the PDF datasheet, or a shared DatasheetDocument
+            cache: Optional DetectionCache for results across runs
         """
-        self.pdf_path = pdf_path
-        self.pdf = None
-        self._open_pdf()
-
-    def _open_pdf(self) -> None:
-        """Open the PDF file."""
-        if pdfplumber is None:
-            raise ImportError(
-                "pdfplumber is required. Install with: pip install pdfplumber"
-            )
-        self.pdf = pdfplumber.open(self.pdf_path)
+        self.document, self._owns_document = open_document(pdf_path)
+        self.pdf_path = self.document.pdf_path
+        self.cache = cache
+
+    @property
+    def pdf(self):
+        """The underlying pdfplumber PDF handle."""
+        return self.document.pdf
 
     def extract_content(
         self, candidates: List[PageCandidate]
@@ -57,6 +54,28 @@ class ContentExtractor:
         Returns:
             ExtractedContent object with extracted data (already filtered)
         """
+        with tracing.span("extract", "pdf", pages=len(candidates)) as span:
+            if self.cache is not None:
+                cached = self.cache.load_content(self.document, candidates)
+                if cached is not None:
+                    span.set(cache_hit=True)
+                    return cached
+
+            result = self._extract(candidates)
+            span.set(
+                cache_hit=False,
+                text_bytes=len(result.text_content.encode("utf-8")),
+                images=len(result.images),
+                tables=len(result.tables),
+            )
+
+        if self.cache is not None:
+            self.cache.store_content(self.document, candidates, result)
+
+        return result
+
+    def _extract(self, candidates: List[PageCandidate]) -> ExtractedContent:
+        """Extract and filter content from the candidate pages."""
         # First extract all content
         extracted = ExtractedContent(
             pages=[c.page_number for c in candidates],
@@ -68,40 +87,55 @@ class ContentExtractor:
         # Sort candidates by page number
         sorted_candidates = sorted(candidates, key=lambda x: x.page_number)
 
-        for candidate in sorted_candidates:
-            page = self.pdf.pages[candidate.page_number - 1]
-
-            # Extract text
-            text = self._extract_text_from_page(page, candidate.page_number)
-            extracted.text_content += text + "\n\n"
+        # Shared per-page analysis records (already computed during detection)
+        analyses = {}
+        seen_images = set()
 
-            # Extract images if page has diagrams
-            if candidate.has_diagram:
-                images = self._extract_images_from_page(page, candidate.page_number)
-                extracted.images.extend(images)
-
-            # Extract tables if page has tables
-            if candidate.has_table:
-                tables = self._extract_tables_from_page(page, candidate.page_number)
-                extracted.tables.extend(tables)
+        for candidate in sorted_candidates:
+            with tracing.span("extract.page", "pdf", page=candidate.page_number):
+                page = self.pdf.pages[candidate.page_number - 1]
+                analyses[candidate.page_number] = self.document.analyze_page(candidate.page_number)
+
+                # Extract text
+                text = self._extract_text_from_page(page, candidate.page_number)
+                extracted.text_content += text + "\n\n"
+
+                # Extract images if page has diagrams
+                if candidate.has_diagram:
+                    with tracing.span("extract.images", "pdf", page=candidate.page_number) as span:
+                        images = self._extract_images_from_page(page, candidate.page_number, seen_images)
+                        span.set(images=len(images), image_bytes=sum(len(data) for _, data in images))
+                    extracted.images.extend(images)
+
+                # Extract tables if page has tables
+                if candidate.has_table:
+                    tables = self._extract_tables_from_page(page, candidate.page_number)
+                    extracted.tables.extend(tables)
 
         # Apply pinout filtering to reduce content to only relevant information
         # TEMPORARILY DISABLED: Some datasheets use different wording that gets filtered out
-        filter = PinoutFilter()
-        filtered = filter.filter_content(extracted)
+        with tracing.span("extract.filter", "pdf") as span:
+            filter = PinoutFilter()
+            filtered = filter.filter_content(extracted, analyses=analyses)
+            span.set(
+                bytes_in=len(extracted.text_content.encode("utf-8")),
+                bytes_out=len(filtered.text_content.encode("utf-8")),
+            )
 
         # If filter removes all content, use unfiltered as fallback
         if not filtered.text_content and extracted.text_content:
             filtered = extracted
 
         # Return filtered content
-        return ExtractedContent(
+        result = ExtractedContent(
             pages=filtered.pages,
             text_content=filtered.text_content,
             tables=filtered.tables,
             images=filtered.images
         )
 
+        return result
+
     def _extract_text_from_page(
         self, page, page_num: int
     ) -> str:
@@ -115,48 +149,30 @@ class ContentExtractor:
         Returns:
             Extracted text with page markers
         """
-        text = page.extract_text() or ""
+        text = self.document.analyze_page(page_num).text
         return f"--- Page {page_num} ---\n{text}"
 
     def _extract_images_from_page(
-        self, page, page_num: int
+        self, page, page_num: int, seen: Optional[Set[str]] = None
     ) -> List[Tuple[int, bytes]]:
         """
         Extract images from a page.
 
+        Embedded images are decoded from their streams where possible and
+        otherwise cropped from a single render of the page.
+
         Args:
             page: pdfplumber Page object
             page_num: Page number for reference
+            seen: Hashes of images already extracted, to skip duplicates
 
         Returns:
             List of (page_number, image_data) tuples
         """
-        images = []
-        for img_index, img_obj in enumerate(page.images):
-            try:
-                # Get the image from the PDF
-                image_data = None
-                if hasattr(img_obj, "stream"):
-                    # For direct stream access (pypdf-style)
-                    stream = img_obj.stream
-                    image_data = stream.get_data()
-                else:
-                    # Fallback - try to get image via page.to_image
-                    try:
-                        pil_image = page.to_image()
-                        image_data = io.BytesIO()
-                        pil_image.save(image_data, format="PNG")
-                        image_data = image_data.getvalue()
-                    except Exception:
-                        continue
-
-                if image_data:
-                    images.append((page_num, image_data))
-            except Exception:
-                # Skip problematic images
-                continue
-
-        return images
+        return [
+            (page_num, image_data)
+            for image_data in extract_page_images(self.document, page_num, seen)
+        ]
 
     def _extract_tables_from_page(
         self, page, page_num: int
@@ -172,7 +188,7 @@ class ContentExtractor:
             List of (page_number, table_data) tuples
         """
         tables = []
-        extracted_tables = page.extract_tables()
+        extracted_tables = self.document.analyze_page(page_num).tables
         if not extracted_tables:
             return tables
 
@@ -241,13 +257,12 @@ class ContentExtractor:
         Returns:
             Extracted text from the page
         """
-        page = self.pdf.pages[page_num - 1]
-        return page.extract_text() or ""
+        return self.document.get_text(page_num)
 
     def close(self) -> None:
-        """Close the PDF file."""
-        if self.pdf:
-            self.pdf.close()
+        """Close the PDF file (only if this extractor opened it)."""
+        if self._owns_document:
+            self.document.close()
 
     def __enter__(self):
         """Context manager entry."""
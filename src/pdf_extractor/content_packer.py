@@ -0,0 +1,306 @@
+"""
+Token-budget packing of extracted content for the pin extraction prompt.
+
+ContentExtractor returns the text of every relevant page; on large MCU
+datasheets that is thousands of tokens of repeated page headers, figure
+lists and electrical tables around the few pages that hold the pinout.
+ContentPacker cuts the text into blocks, drops repeated header/footer
+lines, ranks the blocks by pinout relevance and keeps the best ones that
+fit a token budget, in document order.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import List, Optional, Set, Tuple
+
+from ..utils import tracing
+from ..utils.tokens import DEFAULT_PROMPT_TOKEN_BUDGET, estimate_tokens, truncate_to_tokens
+from .content_extractor import ExtractedContent
+from .page_detector import PageCandidate
+from .pinout_filter import PinoutFilter
+
+# Lines at the top and bottom of a page checked for repeated headers/footers
+EDGE_LINES = 3
+
+# Target size of a ranked block (estimated tokens)
+BLOCK_TOKENS = 200
+
+_PAGE_MARKER = re.compile(r"^--- Page (\d+) ---$", re.MULTILINE)
+
+# Pin-like tokens: port pins (PA0, PB12), supplies, ground, reset, NC
+_PIN_TOKEN = re.compile(
+    r"\b(?:P[A-K]\d{1,2}|V(?:CC|DD|SS|EE|BAT|REF)\w*|A?GND\w*|N?RST|RESET\w*|NC|"
+    r"OSC_?\w+|XTAL\d?|BOOT\d)\b"
+)
+
+# Lines that look like pin table rows: a pin number next to a signal name
+_PIN_ROW = re.compile(r"(?:^|\s)\d{1,3}\s+[A-Z][A-Z0-9_/]{1,}(?:\s|$)")
+
+# Package names ("LQFP48", "SOIC-8", "TSSOP"), which tell variants apart
+_PACKAGE_NAME = re.compile(
+    r"\b(?:P?DIP|SOIC|SOP|SSOP|TSSOP|MSOP|QFN|VQFN|DFN|SON|WSON|TQFP|LQFP|QFP|BGA|LFBGA|"
+    r"TFBGA|UFBGA|WLCSP|SOT)[-\d]*",
+    re.IGNORECASE
+)
+
+# Standalone page-number-like tokens masked in header/footer keys ("21", "21/105")
+_PAGE_NUMBER = re.compile(r"\b\d{1,4}(?:/\d{1,4})?\b")
+
+
+@dataclass
+class ContentBlock:
+    """A run of lines from one page, ranked as a unit."""
+
+    page_number: int
+    index: int  # Position in the document
+    text: str
+    tokens: int
+    score: float = 0.0
+
+
+@dataclass
+class PackedContent:
+    """Content selected for the prompt."""
+
+    text: str
+    pages: List[int]  # Pages with at least one selected block
+    tokens: int  # Estimated tokens of text
+    tokens_in: int  # Estimated tokens of the unpacked content
+    dropped_blocks: int = 0
+    deduped_lines: int = 0  # Repeated header/footer lines removed
+
+
+class ContentPacker:
+    """Rank extracted content by pinout relevance and fit it to a token budget."""
+
+    def __init__(
+        self,
+        token_budget: int = DEFAULT_PROMPT_TOKEN_BUDGET,
+        pinout_filter: Optional[PinoutFilter] = None
+    ):
+        """
+        Initialize the packer.
+
+        Args:
+            token_budget: Estimated-token limit for the packed text
+            pinout_filter: PinoutFilter providing the relevance signals
+        """
+        self.token_budget = token_budget
+        self.filter = pinout_filter or PinoutFilter()
+
+    def pack(
+        self, content: ExtractedContent, candidates: Optional[List[PageCandidate]] = None
+    ) -> PackedContent:
+        """
+        Pack extracted content into the token budget.
+
+        Args:
+            content: ExtractedContent from ContentExtractor
+            candidates: Page candidates, whose confidence scores rank the pages
+
+        Returns:
+            PackedContent with the selected blocks under "--- Page N ---" markers
+        """
+        with tracing.span("extract.pack", "pdf", budget=self.token_budget) as span:
+            packed = self._pack(content, candidates or [])
+            span.set(
+                tokens_in=packed.tokens_in,
+                tokens_out=packed.tokens,
+                dropped_blocks=packed.dropped_blocks,
+                deduped_lines=packed.deduped_lines,
+            )
+            return packed
+
+    def _pack(self, content: ExtractedContent, candidates: List[PageCandidate]) -> PackedContent:
+        tokens_in = estimate_tokens(content.text_content)
+        pages = self.split_pages(content.text_content)
+        pages, deduped = self.remove_repeated_lines(pages)
+        blocks = self.split_blocks(pages)
+        self.score_blocks(blocks, content, candidates)
+
+        # Greedy fill, best blocks first; a page marker is paid for once
+        selected: List[ContentBlock] = []
+        used = 0
+        marked: Set[int] = set()
+        for block in sorted(blocks, key=lambda b: (-b.score, b.index)):
+            cost = block.tokens
+            if block.page_number not in marked:
+                cost += estimate_tokens(f"--- Page {block.page_number} ---")
+            if used + cost > self.token_budget:
+                continue
+            selected.append(block)
+            marked.add(block.page_number)
+            used += cost
+
+        # Budget smaller than any block: keep the start of the best one
+        if not selected and blocks:
+            best = min(blocks, key=lambda b: (-b.score, b.index))
+            text = truncate_to_tokens(best.text, max(1, self.token_budget - 8))
+            selected = [
+                ContentBlock(best.page_number, best.index, text, estimate_tokens(text), best.score)
+            ]
+
+        text = self._join(sorted(selected, key=lambda b: b.index))
+
+        return PackedContent(
+            text=text,
+            pages=sorted({b.page_number for b in selected}),
+            tokens=estimate_tokens(text),
+            tokens_in=tokens_in,
+            dropped_blocks=len(blocks) - len(selected),
+            deduped_lines=deduped,
+        )
+
+    @staticmethod
+    def split_pages(text: str) -> List[Tuple[int, List[str]]]:
+        """
+        Split combined content on its "--- Page N ---" markers.
+
+        Returns:
+            (page_number, lines) per page, in order; text before the first
+            marker is attributed to page 0
+        """
+        pages: List[Tuple[int, List[str]]] = []
+        matches = list(_PAGE_MARKER.finditer(text))
+        if not matches or matches[0].start() > 0:
+            head = text[:matches[0].start()] if matches else text
+            if head.strip():
+                pages.append((0, head.strip("\n").split("\n")))
+        for i, match in enumerate(matches):
+            end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
+            body = text[match.end():end].strip("\n")
+            pages.append((int(match.group(1)), body.split("\n") if body else []))
+        return pages
+
+    @staticmethod
+    def _line_key(line: str) -> str:
+        """
+        Header/footer identity of a line.
+
+        Standalone numbers (page numbers, revisions) are masked, but digits
+        inside words ("LQFP48") and long digit runs (pin-number rows) are
+        kept. Words are sorted, since datasheets often mirror running heads
+        on odd and even pages ("DocID13587 Rev 16 21/105" vs
+        "22/105 DocID13587 Rev 16").
+        """
+        words = _PAGE_NUMBER.sub("#", line.lower()).split()
+        return " ".join(sorted(words))
+
+    @staticmethod
+    def _is_pinout_line(line: str) -> bool:
+        """Whether a line carries pin or package information (never deduplicated)."""
+        return bool(
+            _PIN_TOKEN.search(line) or _PIN_ROW.search(line) or _PACKAGE_NAME.search(line)
+        )
+
+    def remove_repeated_lines(
+        self, pages: List[Tuple[int, List[str]]]
+    ) -> Tuple[List[Tuple[int, List[str]]], int]:
+        """
+        Drop running headers and footers.
+
+        A line in the first or last EDGE_LINES lines of a page that already
+        appeared near the edge of an earlier page is removed; the first
+        occurrence is kept. Lines with pin names, pin rows or package names
+        are always kept.
+
+        Returns:
+            Tuple of (pages without the repeats, number of lines removed)
+        """
+        seen: Set[str] = set()
+        removed = 0
+        result = []
+        for page_number, lines in pages:
+            edge = set(range(min(EDGE_LINES, len(lines))))
+            edge.update(range(max(0, len(lines) - EDGE_LINES), len(lines)))
+
+            kept = []
+            page_keys = set()
+            for i, line in enumerate(lines):
+                key = self._line_key(line)
+                if i in edge and key and not self._is_pinout_line(line):
+                    if key in seen:
+                        removed += 1
+                        continue
+                    page_keys.add(key)
+                kept.append(line)
+            seen.update(page_keys)
+            result.append((page_number, kept))
+        return result, removed
+
+    @staticmethod
+    def split_blocks(pages: List[Tuple[int, List[str]]]) -> List[ContentBlock]:
+        """Cut each page into blocks of about BLOCK_TOKENS, preferring breaks at blank lines."""
+        blocks: List[ContentBlock] = []
+        for page_number, lines in pages:
+            current: List[str] = []
+            tokens = 0
+            for line in lines:
+                line_tokens = estimate_tokens(line)
+                full = current and tokens + line_tokens > BLOCK_TOKENS
+                paragraph = current and not line.strip() and tokens > BLOCK_TOKENS // 2
+                if full or paragraph:
+                    text = "\n".join(current).strip("\n")
+                    if text:
+                        blocks.append(
+                            ContentBlock(page_number, len(blocks), text, estimate_tokens(text))
+                        )
+                    current, tokens = [], 0
+                current.append(line)
+                tokens += line_tokens
+            text = "\n".join(current).strip("\n")
+            if text:
+                blocks.append(ContentBlock(page_number, len(blocks), text, estimate_tokens(text)))
+        return blocks
+
+    def score_blocks(
+        self,
+        blocks: List[ContentBlock],
+        content: ExtractedContent,
+        candidates: List[PageCandidate]
+    ) -> None:
+        """
+        Score blocks by pinout relevance (higher is better).
+
+        Combines the page's detection confidence with the PinoutFilter
+        signals (pinout section keywords, pinout tables on the page,
+        non-pinout section keywords) and the density of pin-like tokens.
+        """
+        confidence = {c.page_number: c.confidence_score for c in candidates}
+        top_confidence = max(confidence.values(), default=0) or 1
+        table_pages = {page for page, _ in self.filter.filter_tables(content.tables)}
+
+        for block in blocks:
+            lower = block.text.lower()
+            words = block.text.split()
+
+            score = 4.0 * confidence.get(block.page_number, 0) / top_confidence
+            if block.page_number in table_pages:
+                score += 2.0
+            if self.filter.is_pinout_section(block.text):
+                score += 2.0
+
+            pin_tokens = len(_PIN_TOKEN.findall(block.text))
+            score += 3.0 * min(1.0, 4.0 * pin_tokens / max(1, len(words)))
+            pin_rows = sum(1 for line in block.text.split("\n") if _PIN_ROW.search(line))
+            score += min(1.0, pin_rows / 10)
+
+            off_topic = sum(1 for kw in self.filter.NON_PINOUT_KEYWORDS if kw in lower)
+            score -= min(3.0, float(off_topic))
+
+            block.score = score
+
+    @staticmethod
+    def _join(blocks: List[ContentBlock]) -> str:
+        """Join blocks in document order under page markers."""
+        parts = []
+        current_page = None
+        for block in blocks:
+            if block.page_number != current_page:
+                if current_page is not None:
+                    parts.append("")
+                if block.page_number:
+                    parts.append(f"--- Page {block.page_number} ---")
+                current_page = block.page_number
+            parts.append(block.text)
+        return "\n".join(parts)
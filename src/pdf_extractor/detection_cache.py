@@ -0,0 +1,154 @@
+"""
+Persistent cache of page detection and content extraction results.
+
+Entries are keyed by the SHA-256 of the PDF bytes plus the detector/extractor
+version and settings, so rerunning an unchanged datasheet (e.g. to tune
+--min-confidence after an LLM failure) skips PDF parsing entirely.
+"""
+
+import base64
+import json
+from dataclasses import asdict
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
+
+from ..utils.disk_cache import DEFAULT_MAX_BYTES, DiskCache, default_cache_dir
+from .content_extractor import EXTRACTOR_VERSION, ExtractedContent
+from .document import DatasheetDocument
+from .page_detector import DETECTOR_VERSION, DetectionStats, PageCandidate
+
+
+class DetectionCache:
+    """Cache PageDetector candidates and ContentExtractor output on disk."""
+
+    def __init__(
+        self,
+        cache_dir: Optional[Union[str, Path]] = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Base cache directory (default: default_cache_dir())
+            max_bytes: Size limit before least-recently-used entries are evicted
+        """
+        base_dir = Path(cache_dir) if cache_dir else default_cache_dir()
+        self.store = DiskCache(base_dir / "detection", max_bytes=max_bytes)
+
+    def _key(self, kind: str, document: DatasheetDocument, version: str, settings) -> str:
+        """Build a cache key from the PDF hash, component version and settings."""
+        return json.dumps(
+            {
+                "kind": kind,
+                "pdf_sha256": document.content_hash,
+                "version": version,
+                "settings": settings,
+            },
+            sort_keys=True,
+        )
+
+    def _load_json(self, key: str):
+        """Load and decode a JSON entry, treating corrupt entries as misses."""
+        data = self.store.get(key)
+        if data is None:
+            return None
+        try:
+            return json.loads(data.decode("utf-8"))
+        except (UnicodeDecodeError, ValueError):
+            self.store.delete(key)
+            return None
+
+    def _store_json(self, key: str, payload) -> None:
+        """Encode and store a JSON entry."""
+        self.store.set(key, json.dumps(payload).encode("utf-8"))
+
+    def load_candidates(
+        self, document: DatasheetDocument, settings: dict
+    ) -> Optional[Tuple[List[PageCandidate], DetectionStats]]:
+        """
+        Load cached detection results.
+
+        Args:
+            document: Document being processed
+            settings: Detector settings that affect the result
+
+        Returns:
+            Tuple of (candidates, stats), or None on a miss
+        """
+        payload = self._load_json(self._key("candidates", document, DETECTOR_VERSION, settings))
+        if payload is None:
+            return None
+        candidates = [PageCandidate(**c) for c in payload["candidates"]]
+        stats = DetectionStats(**payload["stats"])
+        return candidates, stats
+
+    def store_candidates(
+        self,
+        document: DatasheetDocument,
+        settings: dict,
+        candidates: List[PageCandidate],
+        stats: DetectionStats,
+    ) -> None:
+        """Store detection results."""
+        self._store_json(
+            self._key("candidates", document, DETECTOR_VERSION, settings),
+            {
+                "candidates": [asdict(c) for c in candidates],
+                "stats": asdict(stats),
+            },
+        )
+
+    def _content_settings(self, candidates: List[PageCandidate]) -> list:
+        """The parts of the candidate list that determine extracted content."""
+        return sorted(
+            [c.page_number, c.has_table, c.has_diagram] for c in candidates
+        )
+
+    def load_content(
+        self, document: DatasheetDocument, candidates: List[PageCandidate]
+    ) -> Optional[ExtractedContent]:
+        """
+        Load cached extracted content for a set of candidates.
+
+        Args:
+            document: Document being processed
+            candidates: Candidates the content was extracted from
+
+        Returns:
+            ExtractedContent, or None on a miss
+        """
+        payload = self._load_json(
+            self._key("content", document, EXTRACTOR_VERSION, self._content_settings(candidates))
+        )
+        if payload is None:
+            return None
+        return ExtractedContent(
+            pages=payload["pages"],
+            text_content=payload["text_content"],
+            images=[
+                (page_num, base64.b64decode(data))
+                for page_num, data in payload["images"]
+            ],
+            tables=[(page_num, table) for page_num, table in payload["tables"]],
+        )
+
+    def store_content(
+        self,
+        document: DatasheetDocument,
+        candidates: List[PageCandidate],
+        content: ExtractedContent,
+    ) -> None:
+        """Store extracted content."""
+        self._store_json(
+            self._key("content", document, EXTRACTOR_VERSION, self._content_settings(candidates)),
+            {
+                "pages": content.pages,
+                "text_content": content.text_content,
+                "images": [
+                    [page_num, base64.b64encode(data).decode("ascii")]
+                    for page_num, data in content.images
+                ],
+                "tables": [[page_num, table] for page_num, table in content.tables],
+            },
+        )
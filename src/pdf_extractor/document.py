@@ -0,0 +1,328 @@
+"""Shared PDF document session so one datasheet is parsed once per run."""
+
+import io
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple, Union
+
+from ..utils.disk_cache import hash_file
+
+try:
+    import pdfplumber
+except ImportError:
+    pdfplumber = None
+
+try:
+    import pypdfium2
+except ImportError:
+    pypdfium2 = None
+
+
+# (x0, top, x1, bottom) in PDF points, top-left origin as used by pdfplumber
+BBox = Tuple[float, float, float, float]
+
+
+@dataclass
+class PageAnalysis:
+    """Layout analysis of one page, computed once and shared by all stages."""
+
+    page_number: int
+    width: float
+    height: float
+    text: str = ""
+    tables: List = field(default_factory=list)
+    image_boxes: List[BBox] = field(default_factory=list)
+    word_boxes: List[dict] = field(default_factory=list)  # {text, x0, top, x1, bottom}
+
+    @property
+    def image_area(self) -> float:
+        """Total area covered by images on the page."""
+        return sum((x1 - x0) * (bottom - top) for x0, top, x1, bottom in self.image_boxes)
+
+    @property
+    def image_area_ratio(self) -> float:
+        """Fraction of the page area covered by images."""
+        page_area = self.width * self.height
+        return self.image_area / page_area if page_area > 0 else 0.0
+
+
+class DatasheetDocument:
+    """
+    A single open datasheet shared by every pipeline stage.
+
+    Owns one pdfplumber handle and memoizes per-page text, tables, images
+    and renders, so PageDetector, ContentExtractor and the vision layout
+    step never re-run pdfplumber's layout analysis on the same page.
+
+    The PDF is opened lazily on first page access, so a run served entirely
+    from the detection cache never parses the file.
+    """
+
+    def __init__(self, pdf_path: str):
+        """
+        Open a datasheet document.
+
+        Args:
+            pdf_path: Path to the PDF datasheet
+        """
+        self.pdf_path = pdf_path
+        self._pdf = None
+        self._total_pages = None
+        self._content_hash = None
+
+        self._pdfium = None
+        self._raw_text: Dict[int, str] = {}
+        self._text: Dict[int, str] = {}
+        self._tables: Dict[int, List] = {}
+        self._images: Dict[int, List[dict]] = {}
+        self._vector_boxes: Dict[int, List[BBox]] = {}
+        self._renders: Dict[Tuple[int, Optional[int]], object] = {}
+        self._analyses: Dict[int, PageAnalysis] = {}
+
+        if pdfplumber is None:
+            raise ImportError(
+                "pdfplumber is required. Install with: pip install pdfplumber"
+            )
+
+    def _open_pdf(self) -> None:
+        """Open the PDF file."""
+        self._pdf = pdfplumber.open(self.pdf_path)
+        self._total_pages = len(self._pdf.pages)
+
+    @property
+    def pdf(self):
+        """The pdfplumber PDF handle (opened on first access)."""
+        if self._pdf is None:
+            self._open_pdf()
+        return self._pdf
+
+    @property
+    def total_pages(self) -> int:
+        """Number of pages in the document."""
+        if self._total_pages is None:
+            self._open_pdf()
+        return self._total_pages
+
+    @property
+    def content_hash(self) -> str:
+        """SHA-256 of the PDF file bytes (computed once, without parsing)."""
+        if self._content_hash is None:
+            self._content_hash = hash_file(self.pdf_path)
+        return self._content_hash
+
+    @property
+    def pages(self) -> list:
+        """pdfplumber Page objects, in document order."""
+        return self.pdf.pages
+
+    def get_page(self, page_num: int):
+        """
+        Get a pdfplumber Page object.
+
+        Args:
+            page_num: Page number (1-indexed)
+
+        Returns:
+            pdfplumber Page object
+        """
+        if page_num < 1 or page_num > self.total_pages:
+            raise IndexError(
+                f"Page {page_num} out of range (document has {self.total_pages} pages)"
+            )
+        return self.pdf.pages[page_num - 1]
+
+    def get_text(self, page_num: int) -> str:
+        """Get the extracted text of a page (memoized)."""
+        if page_num not in self._text:
+            self._text[page_num] = self.get_page(page_num).extract_text() or ""
+        return self._text[page_num]
+
+    def get_raw_text(self, page_num: int) -> str:
+        """
+        Get a page's raw text without pdfplumber layout analysis (memoized).
+
+        Uses pdfium's native text extraction, which is orders of magnitude
+        cheaper than pdfminer's layout pass; line order and spacing may differ
+        from get_text(), so this is meant for cheap screening only. Falls back
+        to get_text() if pypdfium2 is unavailable or fails on the page.
+        """
+        if page_num not in self._raw_text:
+            text = None
+            if pypdfium2 is not None:
+                try:
+                    if self._pdfium is None:
+                        self._pdfium = pypdfium2.PdfDocument(self.pdf_path)
+                    textpage = self._pdfium[page_num - 1].get_textpage()
+                    text = textpage.get_text_range().replace("\r\n", "\n")
+                except Exception:
+                    text = None
+            self._raw_text[page_num] = text if text is not None else self.get_text(page_num)
+        return self._raw_text[page_num]
+
+    def prime_text(self, page_num: int, text: str) -> None:
+        """Seed the text memo with text already extracted elsewhere (e.g. a worker)."""
+        self._text.setdefault(page_num, text)
+
+    def get_tables(self, page_num: int) -> List:
+        """Get the tables extracted from a page (memoized)."""
+        if page_num not in self._tables:
+            self._tables[page_num] = self.get_page(page_num).extract_tables() or []
+        return self._tables[page_num]
+
+    def get_images(self, page_num: int) -> List[dict]:
+        """Get the image objects placed on a page (memoized)."""
+        if page_num not in self._images:
+            self._images[page_num] = list(self.get_page(page_num).images)
+        return self._images[page_num]
+
+    def get_vector_boxes(self, page_num: int) -> List[BBox]:
+        """Get the bounding boxes of the rects, lines and curves on a page (memoized)."""
+        if page_num not in self._vector_boxes:
+            page = self.get_page(page_num)
+            self._vector_boxes[page_num] = [
+                (obj["x0"], obj["top"], obj["x1"], obj["bottom"])
+                for obj in page.rects + page.lines + page.curves
+            ]
+        return self._vector_boxes[page_num]
+
+    def analyze_page(self, page_num: int) -> PageAnalysis:
+        """
+        Get the layout analysis record for a page (memoized).
+
+        Text and tables come from the same memoized results as get_text()
+        and get_tables(), so each pdfplumber layout pass runs at most once.
+
+        Args:
+            page_num: Page number (1-indexed)
+
+        Returns:
+            PageAnalysis for the page
+        """
+        if page_num not in self._analyses:
+            page = self.get_page(page_num)
+            words = page.extract_words()
+            self._analyses[page_num] = PageAnalysis(
+                page_number=page_num,
+                width=float(page.width),
+                height=float(page.height),
+                text=self.get_text(page_num),
+                tables=self.get_tables(page_num),
+                image_boxes=[
+                    (img["x0"], img["top"], img["x1"], img["bottom"])
+                    for img in self.get_images(page_num)
+                ],
+                word_boxes=[
+                    {
+                        "text": w["text"],
+                        "x0": w["x0"],
+                        "top": w["top"],
+                        "x1": w["x1"],
+                        "bottom": w["bottom"],
+                    }
+                    for w in words
+                ],
+            )
+        return self._analyses[page_num]
+
+    def render_page(self, page_num: int, resolution: Optional[int] = None):
+        """
+        Render a page to a pdfplumber PageImage (memoized per resolution).
+
+        Args:
+            page_num: Page number (1-indexed)
+            resolution: Render resolution in DPI (pdfplumber default if None)
+
+        Returns:
+            pdfplumber PageImage object
+        """
+        key = (page_num, resolution)
+        if key not in self._renders:
+            page = self.get_page(page_num)
+            if resolution is None:
+                self._renders[key] = page.to_image()
+            else:
+                self._renders[key] = page.to_image(resolution=resolution)
+        return self._renders[key]
+
+    def render_region(self, page_num: int, bbox: BBox, resolution: Optional[int] = None):
+        """
+        Crop a region out of the (memoized) page render.
+
+        Args:
+            page_num: Page number (1-indexed)
+            bbox: (x0, top, x1, bottom) in PDF points
+            resolution: Render resolution in DPI (pdfplumber default if None)
+
+        Returns:
+            PIL Image of the region, or None if it lies outside the page
+        """
+        original = self.render_page(page_num, resolution).original
+        page_x0, page_top, page_x1, page_bottom = self.get_page(page_num).bbox
+        scale_x = original.width / float(page_x1 - page_x0)
+        scale_y = original.height / float(page_bottom - page_top)
+
+        x0, top, x1, bottom = bbox
+        left = max(0, int((x0 - page_x0) * scale_x))
+        upper = max(0, int((top - page_top) * scale_y))
+        right = min(original.width, int(round((x1 - page_x0) * scale_x)))
+        lower = min(original.height, int(round((bottom - page_top) * scale_y)))
+        if right <= left or lower <= upper:
+            return None
+        return original.crop((left, upper, right, lower))
+
+    def render_page_png(self, page_num: int, resolution: Optional[int] = None) -> bytes:
+        """
+        Render a page to PNG bytes.
+
+        Args:
+            page_num: Page number (1-indexed)
+            resolution: Render resolution in DPI (pdfplumber default if None)
+
+        Returns:
+            PNG image data
+        """
+        page_image = self.render_page(page_num, resolution)
+        img_bytes = io.BytesIO()
+        page_image.save(img_bytes, format="PNG")
+        return img_bytes.getvalue()
+
+    def close(self) -> None:
+        """Close the PDF file and drop memoized page data."""
+        if self._pdf is not None:
+            self._pdf.close()
+            self._pdf = None
+        if self._pdfium is not None:
+            self._pdfium.close()
+            self._pdfium = None
+        self._raw_text.clear()
+        self._text.clear()
+        self._tables.clear()
+        self._images.clear()
+        self._vector_boxes.clear()
+        self._renders.clear()
+        self._analyses.clear()
+
+    def __enter__(self):
+        """Context manager entry."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit."""
+        self.close()
+
+
+def open_document(
+    source: Union[str, DatasheetDocument]
+) -> Tuple[DatasheetDocument, bool]:
+    """
+    Resolve a path or an existing document into a DatasheetDocument.
+
+    Args:
+        source: PDF path or an already open DatasheetDocument
+
+    Returns:
+        Tuple of (document, owned) where owned is True if the caller opened
+        the document and is therefore responsible for closing it
+    """
+    if isinstance(source, DatasheetDocument):
+        return source, False
+    return DatasheetDocument(str(source)), True
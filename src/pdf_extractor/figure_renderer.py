@@ -0,0 +1,324 @@
+"""
+Render the pinout figure of a page for the vision API.
+
+Instead of sending a full page at pdfplumber's default resolution, this
+locates the pinout figure (a dominant embedded image, otherwise the densest
+cluster of vector graphics, preferring the one nearest a pinout caption),
+crops to it, caps the pixel count and encodes it compactly.
+"""
+
+import io
+import math
+import re
+from dataclasses import dataclass
+from typing import List, Optional
+
+from .document import BBox, DatasheetDocument
+
+# Captions that usually sit right above or below a pinout drawing
+CAPTION_PATTERN = re.compile(
+    r"pin\s*(?:out|configuration|assignment|diagram|connection)s?|connection\s+diagram",
+    re.IGNORECASE,
+)
+
+# Grid cell size (points) for vector-graphics clustering
+GRID_CELL = 6.0
+
+# Vector objects wider than this fraction of the page are rules/frames, not figure parts
+MAX_VECTOR_WIDTH_RATIO = 0.85
+
+# Top/bottom fraction of the page holding running headers and footers (logos, rules)
+MARGIN_BAND_RATIO = 0.1
+
+IMAGE_FORMATS = ("png", "jpeg")
+COLOR_MODES = ("rgb", "gray", "palette")
+
+
+@dataclass
+class RenderOptions:
+    """Settings for rendering a figure for the vision API."""
+
+    resolution: int = 150  # DPI before the pixel ceiling is applied
+    max_pixels: int = 4_000_000  # Resolution is lowered to stay under this
+    color_mode: str = "rgb"  # "rgb", "gray" or "palette"
+    image_format: str = "png"  # "png" or "jpeg"
+    jpeg_quality: int = 85
+    crop: bool = True  # Crop to the detected figure (full page if False)
+    margin: float = 12.0  # Padding around the detected figure, in points
+
+
+@dataclass
+class RenderedFigure:
+    """An encoded figure render."""
+
+    data: bytes
+    mime_type: str
+    bbox: BBox  # Region of the page that was rendered
+    resolution: float
+    width: int
+    height: int
+
+
+def _area(bbox: BBox) -> float:
+    x0, top, x1, bottom = bbox
+    return max(0.0, x1 - x0) * max(0.0, bottom - top)
+
+
+def _union(boxes: List[BBox]) -> BBox:
+    return (
+        min(b[0] for b in boxes),
+        min(b[1] for b in boxes),
+        max(b[2] for b in boxes),
+        max(b[3] for b in boxes),
+    )
+
+
+def _in_margin_band(bbox: BBox, page_height: float) -> bool:
+    """Whether a box lies entirely in the running header or footer band."""
+    band = page_height * MARGIN_BAND_RATIO
+    return bbox[3] <= band or bbox[1] >= page_height - band
+
+
+def _vertical_overlap(a: BBox, b: BBox) -> float:
+    """Vertical overlap of two boxes, relative to the shorter one."""
+    overlap = min(a[3], b[3]) - max(a[1], b[1])
+    shorter = min(a[3] - a[1], b[3] - b[1])
+    return overlap / shorter if shorter > 0 else 0.0
+
+
+def _find_caption(word_boxes: List[dict]) -> Optional[BBox]:
+    """Find the box of a pinout caption such as "Pin Configuration"."""
+    for i, word in enumerate(word_boxes):
+        # Captions span two or three words; look at short runs on one line
+        run = [word]
+        for nxt in word_boxes[i + 1:i + 3]:
+            if abs(nxt["top"] - word["top"]) > 2:
+                break
+            run.append(nxt)
+        text = " ".join(w["text"] for w in run)
+        match = CAPTION_PATTERN.search(text)
+        if match and match.start() < len(word["text"]):
+            return _union([(w["x0"], w["top"], w["x1"], w["bottom"]) for w in run])
+    return None
+
+
+def _vector_clusters(boxes: List[BBox], width: float, height: float) -> List[dict]:
+    """
+    Group vector objects into clusters by painting them onto a coarse grid.
+
+    Args:
+        boxes: Vector object boxes
+        width: Page width
+        height: Page height
+
+    Returns:
+        List of {bbox, cells} dicts, one per connected group of grid cells
+    """
+    cols = int(width / GRID_CELL) + 1
+    rows = int(height / GRID_CELL) + 1
+    occupied = {}
+
+    for x0, top, x1, bottom in boxes:
+        if x1 - x0 > width * MAX_VECTOR_WIDTH_RATIO:
+            continue
+        c0, c1 = max(0, int(x0 / GRID_CELL)), min(cols - 1, int(x1 / GRID_CELL))
+        r0, r1 = max(0, int(top / GRID_CELL)), min(rows - 1, int(bottom / GRID_CELL))
+        for r in range(r0, r1 + 1):
+            for c in range(c0, c1 + 1):
+                occupied.setdefault((r, c), []).append((x0, top, x1, bottom))
+
+    clusters = []
+    visited = set()
+    for start in occupied:
+        if start in visited:
+            continue
+        visited.add(start)
+        stack = [start]
+        cells = []
+        while stack:
+            r, c = stack.pop()
+            cells.append((r, c))
+            # Bridge one-cell gaps so pin stubs join the package outline
+            for dr in (-2, -1, 0, 1, 2):
+                for dc in (-2, -1, 0, 1, 2):
+                    neighbor = (r + dr, c + dc)
+                    if neighbor in occupied and neighbor not in visited:
+                        visited.add(neighbor)
+                        stack.append(neighbor)
+        member_boxes = [box for cell in cells for box in occupied[cell]]
+        clusters.append({"bbox": _union(member_boxes), "cells": len(cells)})
+
+    return clusters
+
+
+def _grow_with_labels(bbox: BBox, word_boxes: List[dict], reach: float) -> BBox:
+    """Extend a drawing's box to take in nearby words (pin names and numbers)."""
+    x0, top, x1, bottom = bbox
+    changed = True
+    while changed:
+        changed = False
+        for w in word_boxes:
+            if w["x0"] >= x0 and w["x1"] <= x1 and w["top"] >= top and w["bottom"] <= bottom:
+                continue
+            near_x = w["x1"] >= x0 - reach and w["x0"] <= x1 + reach
+            near_y = w["bottom"] >= top - reach / 2 and w["top"] <= bottom + reach / 2
+            inside_x = w["x1"] > x0 and w["x0"] < x1
+            inside_y = w["bottom"] > top and w["top"] < bottom
+            if (near_x and inside_y) or (near_y and inside_x):
+                x0, top = min(x0, w["x0"]), min(top, w["top"])
+                x1, bottom = max(x1, w["x1"]), max(bottom, w["bottom"])
+                changed = True
+    return (x0, top, x1, bottom)
+
+
+def find_pinout_region(
+    document: DatasheetDocument, page_num: int, margin: float = 12.0
+) -> Optional[BBox]:
+    """
+    Locate the pinout figure on a page.
+
+    Tries, in order: the largest embedded image (if it covers at least 5%
+    of the page), then the vector-graphics cluster nearest a pinout caption
+    (or the largest cluster without a caption), grown to include its labels.
+
+    Args:
+        document: Open datasheet document
+        page_num: Page number (1-indexed)
+        margin: Padding around the figure, in points
+
+    Returns:
+        (x0, top, x1, bottom) of the figure, or None to use the whole page
+    """
+    analysis = document.analyze_page(page_num)
+    page_area = analysis.width * analysis.height
+    if page_area <= 0:
+        return None
+
+    region = None
+    if analysis.image_boxes:
+        largest = max(analysis.image_boxes, key=_area)
+        if _area(largest) / page_area >= 0.05:
+            region = largest
+
+    if region is None:
+        clusters = [
+            c for c in _vector_clusters(
+                document.get_vector_boxes(page_num), analysis.width, analysis.height
+            )
+            if c["cells"] >= 8 and not _in_margin_band(c["bbox"], analysis.height)
+        ]
+        if clusters:
+            caption = _find_caption(analysis.word_boxes)
+            if caption is not None:
+                caption_y = (caption[1] + caption[3]) / 2
+
+                def distance(cluster):
+                    _, top, _, bottom = cluster["bbox"]
+                    return 0.0 if top <= caption_y <= bottom else min(
+                        abs(caption_y - top), abs(caption_y - bottom)
+                    )
+
+                best = min(clusters, key=lambda c: (distance(c), -c["cells"]))
+            else:
+                best = max(clusters, key=lambda c: c["cells"])
+
+            # Side-by-side package views (e.g. DIP and LCCC) belong together
+            figure_boxes = [
+                c["bbox"] for c in clusters
+                if c is best or _vertical_overlap(c["bbox"], best["bbox"]) > 0.5
+            ]
+            region = _grow_with_labels(_union(figure_boxes), analysis.word_boxes, reach=4 * GRID_CELL)
+
+    if region is None:
+        return None
+
+    x0, top, x1, bottom = region
+    region = (
+        max(0.0, x0 - margin),
+        max(0.0, top - margin),
+        min(analysis.width, x1 + margin),
+        min(analysis.height, bottom + margin),
+    )
+
+    # Not worth cropping if the figure fills most of the page anyway
+    if _area(region) / page_area > 0.8:
+        return None
+    return region
+
+
+def _fit_resolution(bbox: BBox, resolution: float, max_pixels: int) -> float:
+    """Lower the resolution so the rendered region stays under max_pixels."""
+    x0, top, x1, bottom = bbox
+    scale = resolution / 72.0
+    pixels = (x1 - x0) * scale * (bottom - top) * scale
+    if max_pixels and pixels > max_pixels:
+        resolution *= math.sqrt(max_pixels / pixels)
+    return resolution
+
+
+def encode_image(image, options: RenderOptions):
+    """
+    Encode a PIL image according to the render options.
+
+    Args:
+        image: PIL Image
+        options: Color mode and format settings
+
+    Returns:
+        Tuple of (image bytes, mime type)
+    """
+    if options.color_mode == "gray":
+        image = image.convert("L")
+    elif options.color_mode == "palette" and options.image_format == "png":
+        image = image.convert("RGB").quantize(colors=64)
+    elif image.mode not in ("RGB", "L"):
+        image = image.convert("RGB")
+
+    buffer = io.BytesIO()
+    if options.image_format == "jpeg":
+        if image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+        image.save(buffer, format="JPEG", quality=options.jpeg_quality, optimize=True)
+        return buffer.getvalue(), "image/jpeg"
+
+    image.save(buffer, format="PNG", optimize=True)
+    return buffer.getvalue(), "image/png"
+
+
+def render_pinout_figure(
+    document: DatasheetDocument,
+    page_num: int,
+    options: Optional[RenderOptions] = None
+) -> RenderedFigure:
+    """
+    Render a page's pinout figure for the vision API.
+
+    Args:
+        document: Open datasheet document
+        page_num: Page number (1-indexed)
+        options: Rendering settings (defaults if None)
+
+    Returns:
+        RenderedFigure with the encoded image
+    """
+    options = options or RenderOptions()
+    page = document.get_page(page_num)
+
+    region = find_pinout_region(document, page_num, options.margin) if options.crop else None
+    if region is None:
+        region = (0.0, 0.0, float(page.width), float(page.height))
+
+    resolution = _fit_resolution(region, options.resolution, options.max_pixels)
+    # Round so repeated renders of the same page hit the document's render memo
+    resolution = max(1, int(resolution))
+
+    image = document.render_region(page_num, region, resolution)
+    data, mime_type = encode_image(image, options)
+    return RenderedFigure(
+        data=data,
+        mime_type=mime_type,
+        bbox=region,
+        resolution=resolution,
+        width=image.width,
+        height=image.height,
+    )
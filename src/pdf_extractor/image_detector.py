@@ -1,14 +1,12 @@
 """Detect and extract images from PDF pages for AI-based OCR processing."""
 
-import io
+import hashlib
 from dataclasses import dataclass, field
-from typing import List, Optional, Tuple
+from typing import List, Optional, Tuple, Union
 from pathlib import Path
 
-try:
-    import pdfplumber
-except ImportError:
-    pdfplumber = None
+from .document import DatasheetDocument, open_document
+from .image_extraction import image_payload
 
 try:
     from PIL import Image as PILImage
@@ -55,24 +53,20 @@ class ImageDetector:
         'package information'
     ]
 
-    def __init__(self, pdf_path: str):
+    def __init__(self, pdf_path: Union[str, DatasheetDocument]):
         """
         Initialize image detector.
 
         Args:
-            pdf_path: Path to the PDF datasheet
+            pdf_path: Path to the PDF datasheet, or a shared DatasheetDocument
         """
-        self.pdf_path = pdf_path
-        self.pdf = None
-        self._open_pdf()
-
-    def _open_pdf(self) -> None:
-        """Open the PDF file."""
-        if pdfplumber is None:
-            raise ImportError(
-                "pdfplumber is required. Install with: pip install pdfplumber"
-            )
-        self.pdf = pdfplumber.open(self.pdf_path)
+        self.document, self._owns_document = open_document(pdf_path)
+        self.pdf_path = self.document.pdf_path
+
+    @property
+    def pdf(self):
+        """The underlying pdfplumber PDF handle."""
+        return self.document.pdf
 
     def find_pages_with_images(
         self,
@@ -127,7 +121,7 @@ class ImageDetector:
         page_area = page.width * page.height
 
         # Get images on this page
-        images = page.images
+        images = self.document.get_images(page_num)
 
         if not images:
             return candidate  # No images
@@ -191,7 +185,7 @@ class ImageDetector:
             candidate.reasons.append(f"Multiple images ({len(candidate.images)})")
 
         # 3. Pinout keywords in page text
-        text = page.extract_text() or ""
+        text = self.document.get_text(page_num)
         text_lower = text.lower()
 
         if any(kw in text_lower for kw in self.PINOUT_IMAGE_CAPTION_KEYWORDS):
@@ -209,25 +203,16 @@ class ImageDetector:
 
     def _extract_image_data(self, page, img_obj) -> Optional[bytes]:
         """
-        Extract PIL image from PDF page.
+        Extract the data of one image object.
 
         Args:
             page: pdfplumber Page object
             img_obj: Image object from page.images
 
         Returns:
-            Image data as bytes, or None if extraction fails
+            Image data as bytes (JPEG or PNG), or None if extraction fails
         """
-        try:
-            # Try to convert page to image
-            pil_image = page.to_image()
-
-            # Save to bytes
-            img_bytes = io.BytesIO()
-            pil_image.save(img_bytes, format="PNG")
-            return img_bytes.getvalue()
-        except Exception:
-            return None
+        return image_payload(self.document, page.page_number, img_obj)
 
     def extract_all_images(
         self,
@@ -236,6 +221,9 @@ class ImageDetector:
         """
         Extract images from specific pages.
 
+        Identical payloads (e.g. a logo repeated on every page) are only
+        returned once.
+
         Args:
             page_numbers: List of page numbers to extract from
 
@@ -243,18 +231,24 @@ class ImageDetector:
             List of (page_number, image_index, image_data) tuples
         """
         extracted = []
+        seen = set()
 
         for page_num in page_numbers:
             if page_num < 1 or page_num > len(self.pdf.pages):
                 continue
 
             page = self.pdf.pages[page_num - 1]
-            images = page.images
+            images = self.document.get_images(page_num)
 
             for img_index, img_obj in enumerate(images):
                 image_data = self._extract_image_data(page, img_obj)
-                if image_data:
-                    extracted.append((page_num, img_index, image_data))
+                if not image_data:
+                    continue
+                digest = hashlib.sha256(image_data).hexdigest()
+                if digest in seen:
+                    continue
+                seen.add(digest)
+                extracted.append((page_num, img_index, image_data))
 
         return extracted
 
@@ -276,14 +270,15 @@ class ImageDetector:
         for candidate in candidates:
             for img_info in candidate.images:
                 if img_info.image_data:
-                    filename = output_path / f"page_{candidate.page_number}_img_{img_info.image_index}.png"
+                    ext = "jpg" if img_info.image_data[:2] == b"\xff\xd8" else "png"
+                    filename = output_path / f"page_{candidate.page_number}_img_{img_info.image_index}.{ext}"
                     with open(filename, 'wb') as f:
                         f.write(img_info.image_data)
 
     def close(self) -> None:
-        """Close the PDF file."""
-        if self.pdf:
-            self.pdf.close()
+        """Close the PDF file (only if this detector opened it)."""
+        if self._owns_document:
+            self.document.close()
 
     def __enter__(self):
         """Context manager entry."""
@@ -0,0 +1,198 @@
+"""
+Get image payloads for the image objects placed on a PDF page.
+
+Embedded image XObjects are decoded straight from their streams where the
+format allows it (JPEG passthrough, 8-bit RGB/gray to PNG). Anything else
+(indexed palettes, CMYK, soft masks, ...) is cropped from a single memoized
+render of the page instead of rasterizing the whole page once per image.
+"""
+
+import hashlib
+import io
+from typing import List, Optional, Set
+
+from .document import BBox, DatasheetDocument
+
+try:
+    from PIL import Image as PILImage
+except ImportError:
+    PILImage = None
+
+try:
+    from pdfminer.pdftypes import resolve1
+except ImportError:
+    resolve1 = None
+
+
+# Colorspaces whose 8-bit samples map directly onto a PIL mode
+_COLORSPACE_MODES = {
+    "DeviceRGB": "RGB",
+    "CalRGB": "RGB",
+    "DeviceGray": "L",
+    "CalGray": "L",
+}
+
+# Render resolution used when cropping images from the page
+DEFAULT_CROP_RESOLUTION = 150
+
+
+def _name(obj) -> Optional[str]:
+    """Get the name of a PDF name object (PSLiteral), or None."""
+    return getattr(obj, "name", None)
+
+
+def _pil_mode(colorspace) -> Optional[str]:
+    """
+    Map an image's colorspace onto a PIL mode.
+
+    Args:
+        colorspace: The "colorspace" entry of a pdfplumber image object
+
+    Returns:
+        "RGB" or "L", or None if the samples cannot be used as-is
+    """
+    if resolve1 is None or not colorspace:
+        return None
+
+    spec = resolve1(colorspace[0]) if isinstance(colorspace, list) else resolve1(colorspace)
+    if isinstance(spec, list) and spec:
+        family = _name(resolve1(spec[0]))
+        if family == "ICCBased" and len(spec) > 1:
+            components = resolve1(spec[1]).attrs.get("N")
+            return {3: "RGB", 1: "L"}.get(resolve1(components))
+        return _COLORSPACE_MODES.get(family)
+    return _COLORSPACE_MODES.get(_name(spec))
+
+
+def decode_image_stream(img_obj: dict) -> Optional[bytes]:
+    """
+    Decode an embedded image directly from its PDF stream.
+
+    Args:
+        img_obj: Image object from pdfplumber's page.images
+
+    Returns:
+        JPEG or PNG bytes, or None if the stream needs a full render
+    """
+    stream = img_obj.get("stream")
+    if stream is None:
+        return None
+
+    attrs = stream.attrs
+    if img_obj.get("imagemask") or attrs.get("SMask") or attrs.get("Mask") or attrs.get("Decode"):
+        return None
+
+    filters = [_name(f) for f, _ in stream.get_filters()]
+
+    try:
+        if filters and filters[-1] == "DCTDecode":
+            # pdfminer undoes the outer filters and leaves the JPEG intact
+            data = stream.get_data()
+            return data if data[:2] == b"\xff\xd8" else None
+
+        if PILImage is None or img_obj.get("bits") != 8:
+            return None
+        if any(f not in ("FlateDecode", "LZWDecode", "ASCII85Decode", "ASCIIHexDecode") for f in filters):
+            return None
+
+        mode = _pil_mode(img_obj.get("colorspace"))
+        if mode is None:
+            return None
+
+        width, height = img_obj["srcsize"]
+        image = PILImage.frombytes(mode, (int(width), int(height)), stream.get_data())
+        buffer = io.BytesIO()
+        image.save(buffer, format="PNG")
+        return buffer.getvalue()
+    except Exception:
+        return None
+
+
+def crop_image_from_render(
+    document: DatasheetDocument,
+    page_num: int,
+    bbox: BBox,
+    resolution: int = DEFAULT_CROP_RESOLUTION
+) -> Optional[bytes]:
+    """
+    Crop a region from the page render (rendered at most once per resolution).
+
+    Args:
+        document: Open datasheet document
+        page_num: Page number (1-indexed)
+        bbox: (x0, top, x1, bottom) in PDF points
+        resolution: Render resolution in DPI
+
+    Returns:
+        PNG bytes, or None if the region is empty or rendering fails
+    """
+    try:
+        image = document.render_region(page_num, bbox, resolution)
+    except Exception:
+        return None
+    if image is None:
+        return None
+
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def image_payload(
+    document: DatasheetDocument,
+    page_num: int,
+    img_obj: dict,
+    resolution: int = DEFAULT_CROP_RESOLUTION
+) -> Optional[bytes]:
+    """
+    Get image bytes for one image object, preferring the embedded stream.
+
+    Args:
+        document: Open datasheet document
+        page_num: Page number (1-indexed)
+        img_obj: Image object from pdfplumber's page.images
+        resolution: Render resolution for the crop fallback
+
+    Returns:
+        JPEG or PNG bytes, or None if the image could not be extracted
+    """
+    data = decode_image_stream(img_obj)
+    if data is None:
+        bbox = (img_obj["x0"], img_obj["top"], img_obj["x1"], img_obj["bottom"])
+        data = crop_image_from_render(document, page_num, bbox, resolution)
+    return data
+
+
+def extract_page_images(
+    document: DatasheetDocument,
+    page_num: int,
+    seen: Optional[Set[str]] = None,
+    resolution: int = DEFAULT_CROP_RESOLUTION
+) -> List[bytes]:
+    """
+    Extract the distinct images placed on a page.
+
+    Args:
+        document: Open datasheet document
+        page_num: Page number (1-indexed)
+        seen: SHA-256 digests already returned (updated in place), to
+              dedupe payloads across pages
+        resolution: Render resolution for the crop fallback
+
+    Returns:
+        List of image payloads, in page order, without duplicates
+    """
+    if seen is None:
+        seen = set()
+
+    images = []
+    for img_obj in document.get_images(page_num):
+        data = image_payload(document, page_num, img_obj, resolution)
+        if not data:
+            continue
+        digest = hashlib.sha256(data).hexdigest()
+        if digest in seen:
+            continue
+        seen.add(digest)
+        images.append(data)
+    return images
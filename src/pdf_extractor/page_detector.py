@@ -1,14 +1,16 @@
 """Hybrid page detection using rules-based patterns with LLM fallback for edge cases."""
 
 import re
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
-from typing import List, Optional, Tuple
+from typing import List, Optional, Tuple, Union
 from collections import Counter
 
-try:
-    import pdfplumber
-except ImportError:
-    pdfplumber = None
+from .document import DatasheetDocument, PageAnalysis, open_document
+from ..utils import tracing
+
+# Bump when scoring rules change so cached detection results are invalidated
+DETECTOR_VERSION = "2"
 
 
 @dataclass
@@ -22,6 +24,16 @@ class PageCandidate:
     has_table: bool = False
     has_diagram: bool = False
     needs_verification: bool = False
+    prefiltered: bool = False  # Skipped by the text-only first tier
+
+
+@dataclass
+class DetectionStats:
+    """Summary of the last detect_relevant_pages() run."""
+
+    total_pages: int = 0
+    analyzed_pages: int = 0  # Pages that ran the full table/diagram checks
+    skipped_pages: int = 0  # Pages dropped by the text-only prefilter
 
 
 class PageDetector:
@@ -69,29 +81,36 @@ class PageDetector:
         r"mechanical\s*drawing",
     ]
 
-    def __init__(self, pdf_path: str):
+    def __init__(self, pdf_path: Union[str, DatasheetDocument], cache=None):
         """
         Initialize the page detector.
 
         Args:
-            pdf_path: Path to the PDF datasheet
+            pdf_path: Path to the PDF datasheet, or a shared DatasheetDocument
+            cache: Optional DetectionCache for results across runs
         """
-        self.pdf_path = pdf_path
-        self.pdf = None
-        self.total_pages = 0
-        self._open_pdf()
-
-    def _open_pdf(self) -> None:
-        """Open the PDF file."""
-        if pdfplumber is None:
-            raise ImportError(
-                "pdfplumber is required. Install with: pip install pdfplumber"
-            )
-        self.pdf = pdfplumber.open(self.pdf_path)
-        self.total_pages = len(self.pdf.pages)
+        self.document, self._owns_document = open_document(pdf_path)
+        self.pdf_path = self.document.pdf_path
+        self.cache = cache
+        self.last_stats = DetectionStats()
+
+    @property
+    def pdf(self):
+        """The underlying pdfplumber PDF handle."""
+        return self.document.pdf
+
+    @property
+    def total_pages(self) -> int:
+        """Number of pages in the document."""
+        return self.document.total_pages
 
     def detect_relevant_pages(
-        self, min_confidence: int = 5, require_verification_threshold: int = 3
+        self,
+        min_confidence: int = 5,
+        require_verification_threshold: int = 3,
+        workers: int = 1,
+        prefilter_min_score: int = 0,
+        include_ambiguous: bool = False,
     ) -> List[PageCandidate]:
         """
         Detect pages that likely contain pinout information.
@@ -99,20 +118,82 @@ class PageDetector:
         Args:
             min_confidence: Minimum confidence score to consider a page relevant
             require_verification_threshold: Score below which pages require LLM verification
+            workers: Number of processes used to score pages (1 = score in-process)
+            prefilter_min_score: Minimum text-only (heading + keyword density)
+                score a page needs before the table and diagram checks run;
+                0 disables the prefilter. Skipped pages are counted in
+                self.last_stats.
+            include_ambiguous: Also return the pages scoring between
+                require_verification_threshold and min_confidence (marked
+                needs_verification), for the LLM to confirm or drop
 
         Returns:
             List of PageCandidate objects sorted by confidence score
         """
-        candidates = []
+        # The thresholds only filter scored pages, so every scored page is
+        # cached and a different --min-confidence still hits the cache
+        cache_settings = {
+            "detector": type(self).__name__,
+            "prefilter_min_score": prefilter_min_score,
+        }
+        with tracing.span("detect", "pdf") as span:
+            scored = None
+            if self.cache is not None:
+                cached = self.cache.load_candidates(self.document, cache_settings)
+                if cached is not None:
+                    scored, self.last_stats = cached
+                    span.set(cache_hit=True)
+
+            if scored is None:
+                scored = self._score_all_pages(workers, prefilter_min_score)
+                span.set(
+                    cache_hit=False,
+                    total_pages=self.last_stats.total_pages,
+                    skipped_pages=self.last_stats.skipped_pages,
+                )
+                if self.cache is not None:
+                    self.cache.store_candidates(
+                        self.document, cache_settings, scored, self.last_stats
+                    )
+
+            relevant_pages = self._select_relevant(
+                scored, min_confidence, require_verification_threshold, include_ambiguous
+            )
+            span.set(relevant_pages=len(relevant_pages))
 
-        for page_num, page in enumerate(self.pdf.pages, start=1):
-            text = page.extract_text() or ""
-            candidate = self._analyze_page(page_num, page, text)
-            candidates.append(candidate)
+        return relevant_pages
+
+    def _score_all_pages(self, workers: int, prefilter_min_score: int) -> List[PageCandidate]:
+        """Score every page and record last_stats."""
+        page_numbers = list(range(1, self.total_pages + 1))
+
+        if workers > 1 and self.total_pages > 1:
+            candidates = self._score_pages_parallel(
+                page_numbers, workers, prefilter_min_score
+            )
+        else:
+            candidates = self._score_pages(page_numbers, prefilter_min_score)
+
+        skipped = sum(1 for c in candidates if c.prefiltered)
+        self.last_stats = DetectionStats(
+            total_pages=self.total_pages,
+            analyzed_pages=len(candidates) - skipped,
+            skipped_pages=skipped,
+        )
+        return candidates
 
+    @staticmethod
+    def _select_relevant(
+        candidates: List[PageCandidate],
+        min_confidence: int,
+        require_verification_threshold: int,
+        include_ambiguous: bool = False,
+    ) -> List[PageCandidate]:
+        """Apply the confidence thresholds to scored pages, best first."""
         # Filter and sort
+        floor = require_verification_threshold if include_ambiguous else min_confidence
         relevant_pages = [
-            c for c in candidates if c.confidence_score >= min_confidence
+            c for c in candidates if c.confidence_score >= floor
         ]
         # Mark pages that need LLM verification
         for c in candidates:
@@ -128,20 +209,102 @@ class PageDetector:
 
         return relevant_pages
 
-    def _analyze_page(
-        self, page_num: int, page, text: str
-    ) -> PageCandidate:
+    def _score_pages(
+        self, page_numbers: List[int], prefilter_min_score: int = 0
+    ) -> List[PageCandidate]:
+        """Score the given pages in-process, in page order."""
+        candidates = []
+        for page_num in page_numbers:
+            with tracing.span("detect.page", "pdf", page=page_num) as span:
+                if prefilter_min_score > 0:
+                    candidate = self._prefilter_page(page_num)
+                    if candidate.confidence_score < prefilter_min_score:
+                        # Tier 1 failed: keep the text-only result and skip the
+                        # expensive layout, table and image analysis
+                        candidate.prefiltered = True
+                        position_score, position_reason = self._check_page_position(page_num)
+                        if position_score > 0:
+                            candidate.confidence_score += position_score
+                            candidate.reasons.append(position_reason)
+                        candidates.append(candidate)
+                        span.set(prefiltered=True, score=candidate.confidence_score)
+                        continue
+                candidate = self._analyze_page(self.document.analyze_page(page_num))
+                candidates.append(candidate)
+                span.set(prefiltered=False, score=candidate.confidence_score)
+        return candidates
+
+    def _prefilter_page(self, page_num: int) -> PageCandidate:
+        """
+        Tier 1: score a page from its raw text only.
+
+        Uses the heading and keyword density checks on pdfium's raw text,
+        which needs no pdfplumber layout analysis.
+        """
+        text = self.document.get_raw_text(page_num)
+        candidate = PageCandidate(page_number=page_num, confidence_score=0, text=text)
+
+        heading_score, heading_reason = self._check_pinout_heading(text)
+        if heading_score > 0:
+            candidate.confidence_score += heading_score
+            candidate.reasons.append(heading_reason)
+
+        keyword_score, keyword_reason = self._check_keyword_density(text)
+        if keyword_score > 0:
+            candidate.confidence_score += keyword_score
+            candidate.reasons.append(keyword_reason)
+
+        return candidate
+
+    def _score_pages_parallel(
+        self, page_numbers: List[int], workers: int, prefilter_min_score: int = 0
+    ) -> List[PageCandidate]:
+        """
+        Score pages across a process pool.
+
+        Pages are split into contiguous chunks (several per worker, so one
+        slow chunk does not stall the pool). Each worker opens the PDF itself
+        and returns plain PageCandidate records; results come back in page
+        order, so the outcome matches the serial path exactly.
+        """
+        chunk_size = max(1, -(-len(page_numbers) // (workers * 4)))
+        chunks = [
+            page_numbers[i:i + chunk_size]
+            for i in range(0, len(page_numbers), chunk_size)
+        ]
+
+        candidates = []
+        with tracing.span("detect.parallel", "pdf", workers=workers, chunks=len(chunks)), \
+                ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as executor:
+            results = executor.map(
+                _score_page_chunk,
+                [type(self)] * len(chunks),
+                [self.pdf_path] * len(chunks),
+                chunks,
+                [prefilter_min_score] * len(chunks),
+            )
+            for chunk_candidates in results:
+                candidates.extend(chunk_candidates)
+
+        # Seed the shared document so later stages don't re-extract page text
+        for candidate in candidates:
+            if not candidate.prefiltered:
+                self.document.prime_text(candidate.page_number, candidate.text)
+
+        return candidates
+
+    def _analyze_page(self, analysis: PageAnalysis) -> PageCandidate:
         """
         Analyze a single page and calculate confidence score.
 
         Args:
-            page_num: Page number (1-indexed)
-            page: pdfplumber Page object
-            text: Extracted text from the page
+            analysis: Shared PageAnalysis record for the page
 
         Returns:
             PageCandidate object with analysis results
         """
+        page_num = analysis.page_number
+        text = analysis.text
         candidate = PageCandidate(
             page_number=page_num,
             confidence_score=0,
@@ -155,14 +318,14 @@ class PageDetector:
             candidate.reasons.append(heading_reason)
 
         # 2. Check for pinout tables (+4)
-        table_score, has_table, table_reason = self._check_pinout_table(page)
+        table_score, has_table, table_reason = self._check_pinout_table(analysis)
         candidate.has_table = has_table
         if table_score > 0:
             candidate.confidence_score += table_score
             candidate.reasons.append(table_reason)
 
         # 3. Check for diagrams with captions (+2)
-        diagram_score, has_diagram, diagram_reason = self._check_diagram(page)
+        diagram_score, has_diagram, diagram_reason = self._check_diagram(analysis)
         candidate.has_diagram = has_diagram
         if diagram_score > 0:
             candidate.confidence_score += diagram_score
@@ -207,9 +370,9 @@ class PageDetector:
                 return True
         return False
 
-    def _check_pinout_table(self, page) -> Tuple[int, bool, str]:
+    def _check_pinout_table(self, analysis: PageAnalysis) -> Tuple[int, bool, str]:
         """Check if page contains a pinout table."""
-        tables = page.extract_tables()
+        tables = analysis.tables
 
         if not tables:
             return 0, False, ""
@@ -232,23 +395,17 @@ class PageDetector:
 
         return 0, False, ""
 
-    def _check_diagram(self, page) -> Tuple[int, bool, str]:
+    def _check_diagram(self, analysis: PageAnalysis) -> Tuple[int, bool, str]:
         """Check if page contains a diagram with pinout caption."""
-        images = page.images
-
-        if not images:
+        if not analysis.image_boxes:
             return 0, False, ""
 
         # Check if page has significant image content
-        image_area = sum(img["width"] * img["height"] for img in images)
-        page_area = page.width * page.height
-
-        if image_area / page_area < 0.2:  # Less than 20% image content
+        if analysis.image_area_ratio < 0.2:  # Less than 20% image content
             return 0, False, ""
 
         # Look for captions in text
-        text = page.extract_text() or ""
-        text_lower = text.lower()
+        text_lower = analysis.text.lower()
 
         for pattern in self.DIAGRAM_CAPTION_PATTERNS:
             if re.search(pattern, text_lower, re.IGNORECASE):
@@ -319,18 +476,17 @@ class PageDetector:
             List of PageCandidate objects with low confidence
         """
         candidates = []
-        for page_num, page in enumerate(self.pdf.pages, start=1):
-            text = page.extract_text() or ""
-            candidate = self._analyze_page(page_num, page, text)
+        for page_num in range(1, self.total_pages + 1):
+            candidate = self._analyze_page(self.document.analyze_page(page_num))
             if threshold <= candidate.confidence_score < 5:
                 candidates.append(candidate)
 
         return candidates
 
     def close(self) -> None:
-        """Close the PDF file."""
-        if self.pdf:
-            self.pdf.close()
+        """Close the PDF file (only if this detector opened it)."""
+        if self._owns_document:
+            self.document.close()
 
     def __enter__(self):
         """Context manager entry."""
@@ -339,3 +495,11 @@ class PageDetector:
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Context manager exit."""
         self.close()
+
+
+def _score_page_chunk(
+    detector_cls, pdf_path: str, page_numbers: List[int], prefilter_min_score: int = 0
+) -> List[PageCandidate]:
+    """Process-pool worker: open the PDF and score a chunk of pages."""
+    with detector_cls(pdf_path) as detector:
+        return detector._score_pages(page_numbers, prefilter_min_score)
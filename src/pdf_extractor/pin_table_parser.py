@@ -0,0 +1,323 @@
+"""
+Rule-based pin extraction from pinout tables.
+
+Many datasheets have a clean pin table ("Pin No. | Name | Type |
+Description") that PageDetector already recognizes. PinTableParser maps the
+header columns to pin number, name and function and builds PinData from
+the ContentExtractor tables directly. The result is only trusted when it
+validates (numbering 1..N without gaps, no pin number listed under two
+different names, a package with that pin count named in the text);
+otherwise the caller falls back to the LLM.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from ..models.pin_data import PackageInfo, Pin, PinData
+from ..utils import tracing
+from .content_extractor import ExtractedContent
+from .pinout_filter import PinoutFilter
+
+# Header rows are looked for in the first rows of a table (title rows first)
+HEADER_ROWS = 3
+
+# Smallest pin table trusted without the LLM
+MIN_PINS = 2
+
+_NUMBER_HEADER = re.compile(r"\b(?:no|num|number|nr)\b\.?|#|^pins?$")
+_NAME_HEADER = re.compile(r"\b(?:name|symbol|signal)\b")
+_DESCRIPTION_HEADER = re.compile(r"\b(?:function|description|desc)\b")
+_TYPE_HEADER = re.compile(r"\b(?:type|i/o|io|direction)\b")
+
+# Pin number cells: "3", "4, 8", "9-12"
+_NUMBERS = r"\d{1,3}(?:\s*[-–]\s*\d{1,3})?(?:\s*,\s*\d{1,3}(?:\s*[-–]\s*\d{1,3})?)*"
+_NUMBERS_CELL = re.compile(rf"^{_NUMBERS}$")
+
+# Combined "PIN NAME NO." cells: "EN 3" (or "3 EN")
+_NAME_THEN_NUMBERS = re.compile(rf"^(?P<name>.*?\S)\s+(?P<numbers>{_NUMBERS})$")
+_NUMBERS_THEN_NAME = re.compile(rf"^(?P<numbers>{_NUMBERS})\s+(?P<name>\S.*)$")
+
+# Trailing footnote markers: "PA0(1)"
+_FOOTNOTE = re.compile(r"\s*\(\d\)$")
+
+# Package designators with a pin count: "SOIC-8", "PDIP28", "LQFP64"
+_PACKAGE_COUNT = re.compile(
+    r"\b(P?DIP|SOIC|SOP|SSOP|TSSOP|MSOP|VSSOP|QFN|VQFN|WQFN|UQFN|DFN|SON|WSON|VSON|"
+    r"TQFP|LQFP|QFP|SOT-?23)[-\s]?(\d{1,3})\b",
+    re.IGNORECASE
+)
+
+# First-line part numbers: "TPS63060", "NE555", "MC74HC595A"
+_PART_NUMBER = re.compile(r"^[A-Z]{2,}[A-Z0-9]*\d{2,}[A-Z0-9\-]*$")
+
+_POWER_NAMES = re.compile(r"^(?:[AD]?V(?:CC|DD|IN|BAT|BUS)\w*)$")
+_GROUND_NAMES = re.compile(r"^(?:[AD]?GND\w*|[AD]?VSS\w*|PGND\w*)$")
+_TYPE_FUNCTIONS = {
+    "i": "input",
+    "in": "input",
+    "input": "input",
+    "di": "input",
+    "o": "output",
+    "out": "output",
+    "output": "output",
+    "do": "output",
+    "od": "output",
+    "i/o": "input/output",
+    "io": "input/output",
+    "ai": "analog",
+    "ao": "analog",
+    "a": "analog",
+    "p": "power",
+    "pwr": "power",
+    "s": "power",
+    "g": "ground",
+    "gnd": "ground",
+}
+
+
+@dataclass
+class ColumnMap:
+    """Column indexes of a pin table (None if the table has no such column)."""
+
+    header_row: int
+    number: Optional[int] = None
+    name: Optional[int] = None
+    combined: Optional[int] = None  # One column holding both name and number
+    pin_type: Optional[int] = None
+    description: Optional[int] = None
+
+
+@dataclass
+class PinTableResult:
+    """Outcome of PinTableParser.parse()."""
+
+    pin_data: Optional[PinData] = None  # None unless every check passed
+    pages: List[int] = field(default_factory=list)  # Pages of the tables used
+    problems: List[str] = field(default_factory=list)  # Why the LLM is needed
+
+    @property
+    def ok(self) -> bool:
+        """Whether the pin data can be used without the LLM."""
+        return self.pin_data is not None
+
+
+def _cell(value) -> str:
+    """Cell text with line breaks and repeated spaces collapsed."""
+    return " ".join(str(value or "").split())
+
+
+def _expand_numbers(text: str) -> List[int]:
+    """Pin numbers of a number cell ("4, 8" -> [4, 8]; "9-12" -> [9, 10, 11, 12])."""
+    numbers = []
+    for part in re.split(r"\s*,\s*", text.strip()):
+        bounds = [int(n) for n in re.split(r"\s*[-–]\s*", part)]
+        if len(bounds) == 2 and bounds[0] < bounds[1]:
+            numbers.extend(range(bounds[0], bounds[1] + 1))
+        else:
+            numbers.append(bounds[0])
+    return numbers
+
+
+class PinTableParser:
+    """Build PinData from pinout tables without the LLM."""
+
+    def __init__(self, pinout_filter: Optional[PinoutFilter] = None):
+        """
+        Initialize the parser.
+
+        Args:
+            pinout_filter: PinoutFilter used to pick the pinout tables
+        """
+        self.filter = pinout_filter or PinoutFilter()
+
+    def parse(self, content: ExtractedContent, part_number: Optional[str] = None) -> PinTableResult:
+        """
+        Extract and validate pin data from the content's tables.
+
+        Args:
+            content: ExtractedContent from ContentExtractor
+            part_number: Optional part number, used as the component name
+
+        Returns:
+            PinTableResult; result.ok is False (and result.problems says why)
+            when the tables cannot be trusted on their own
+        """
+        with tracing.span("extract.pin_table", "pdf", tables=len(content.tables)) as span:
+            result = self._parse(content, part_number)
+            span.set(ok=result.ok, pins=len(result.pin_data.pins) if result.ok else 0)
+            return result
+
+    def _parse(self, content: ExtractedContent, part_number: Optional[str]) -> PinTableResult:
+        result = PinTableResult()
+
+        rows: List[Tuple[List[int], str, Optional[str]]] = []
+        for page_number, table in self.filter.filter_tables(content.tables):
+            columns = self.map_columns(table)
+            if columns is None:
+                continue
+            table_rows, skipped = self.parse_rows(table, columns)
+            # Mostly non-numeric pins (BGA balls, package variant grids): not ours
+            if not table_rows or skipped > len(table_rows):
+                continue
+            rows.extend(table_rows)
+            result.pages.append(page_number)
+
+        if not rows:
+            result.problems.append("no pin table with pin number and name columns")
+            return result
+
+        pins = self._collect_pins(rows, result.problems)
+        numbers = sorted(pins)
+        if len(numbers) < MIN_PINS:
+            result.problems.append(f"only {len(numbers)} pin(s) in the table")
+        missing = sorted(set(range(1, numbers[-1] + 1)) - set(numbers)) if numbers else []
+        if missing:
+            shown = ", ".join(str(n) for n in missing[:8]) + (", ..." if len(missing) > 8 else "")
+            result.problems.append(f"pin numbering has gaps (missing {shown})")
+
+        # Guessing the package from the pin count alone is not good enough
+        packages = self.find_packages(content.text_content)
+        package_type = next((name for name, count in packages if count == len(numbers)), None)
+        if not packages:
+            result.problems.append("no package named in the text")
+        elif package_type is None:
+            named = ", ".join(f"{name}-{count}" for name, count in packages)
+            result.problems.append(f"table has {len(numbers)} pins but the text names {named}")
+
+        if result.problems:
+            return result
+
+        pin_data = PinData(
+            component_name=part_number or self.guess_component_name(content.text_content),
+            package=PackageInfo(
+                type=package_type, pin_count=len(numbers), width=0.0, height=0.0
+            ),
+            pins=[pins[number] for number in numbers],
+            extraction_method="Table",
+        )
+        result.pin_data = pin_data
+        return result
+
+    def map_columns(self, table: List) -> Optional[ColumnMap]:
+        """
+        Map a table's header cells to pin number, name and function columns.
+
+        Returns:
+            ColumnMap, or None if no header row has both a number and a name
+            column, or it has several number columns (one per package)
+        """
+        for index, row in enumerate(table[:HEADER_ROWS]):
+            columns = ColumnMap(header_row=index)
+            number_columns = []
+            for col, value in enumerate(row):
+                header = _cell(value).lower()
+                if not header:
+                    continue
+                is_number = bool(_NUMBER_HEADER.search(header))
+                is_name = bool(_NAME_HEADER.search(header))
+                if is_number and is_name:
+                    columns.combined = col
+                elif is_number:
+                    number_columns.append(col)
+                elif is_name and columns.name is None:
+                    columns.name = col
+                elif _TYPE_HEADER.search(header) and columns.pin_type is None:
+                    columns.pin_type = col
+                elif _DESCRIPTION_HEADER.search(header) and columns.description is None:
+                    columns.description = col
+
+            if len(number_columns) > 1:
+                return None
+            columns.number = number_columns[0] if number_columns else None
+            if columns.combined is not None:
+                return columns
+            if columns.number is not None and columns.name is not None:
+                return columns
+        return None
+
+    def parse_rows(
+        self, table: List, columns: ColumnMap
+    ) -> Tuple[List[Tuple[List[int], str, Optional[str]]], int]:
+        """
+        Read (pin numbers, name, function) from the rows below the header.
+
+        Returns:
+            Tuple of (rows, number of skipped rows); repeated header rows
+            and blank rows are not counted as skipped
+        """
+        header = [_cell(value) for value in table[columns.header_row]]
+        rows = []
+        skipped = 0
+        for row in table[columns.header_row + 1:]:
+            cells = [_cell(value) for value in row]
+            if cells == header or not any(cells):
+                continue
+
+            def get(col: Optional[int]) -> str:
+                return cells[col] if col is not None and col < len(cells) else ""
+
+            if columns.combined is not None:
+                text = get(columns.combined)
+                match = _NAME_THEN_NUMBERS.match(text) or _NUMBERS_THEN_NAME.match(text)
+                numbers, name = (match.group("numbers"), match.group("name")) if match else ("", "")
+            else:
+                numbers, name = get(columns.number), get(columns.name)
+
+            name = _FOOTNOTE.sub("", name).strip()
+            if not name or not _NUMBERS_CELL.match(numbers):
+                skipped += 1
+                continue
+            rows.append((_expand_numbers(numbers), name, self.classify(name, get(columns.pin_type))))
+        return rows, skipped
+
+    @staticmethod
+    def _collect_pins(
+        rows: List[Tuple[List[int], str, Optional[str]]], problems: List[str]
+    ) -> Dict[int, Pin]:
+        """Pins by number; a number given two different names is a problem."""
+        pins: Dict[int, Pin] = {}
+        for numbers, name, function in rows:
+            for number in numbers:
+                existing = pins.get(number)
+                if existing is None:
+                    pins[number] = Pin(number=number, name=name, function=function)
+                elif existing.name.upper() != name.upper():
+                    problems.append(f"pin {number} is listed as both {existing.name} and {name}")
+        return pins
+
+    @staticmethod
+    def classify(name: str, pin_type: str) -> Optional[str]:
+        """Pin function ("power", "ground", "input", ...) from its name and type column."""
+        upper = name.upper()
+        if _GROUND_NAMES.match(upper):
+            return "ground"
+        if _POWER_NAMES.match(upper):
+            return "power"
+        return _TYPE_FUNCTIONS.get(pin_type.lower().replace(" ", ""))
+
+    @staticmethod
+    def find_packages(text: str) -> List[Tuple[str, int]]:
+        """
+        Packages named in the text with their pin counts.
+
+        Returns:
+            Distinct (type, pin count) pairs in order of appearance, e.g.
+            [("PDIP", 14), ("SOIC", 8)]
+        """
+        packages = []
+        for name, count in _PACKAGE_COUNT.findall(text):
+            package = (name.upper(), int(count))
+            if package[1] > 0 and package not in packages:
+                packages.append(package)
+        return packages
+
+    @staticmethod
+    def guess_component_name(text: str) -> str:
+        """Part number from the first line of the first page, else "Unknown"."""
+        for line in text.split("\n"):
+            line = line.strip()
+            if not line or line.startswith("--- Page"):
+                continue
+            return line if _PART_NUMBER.match(line) else "Unknown"
+        return "Unknown"
@@ -6,7 +6,7 @@ reducing LLM confusion from irrelevant content.
 """
 
 from dataclasses import dataclass, field
-from typing import List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 
 @dataclass
@@ -127,34 +127,29 @@ class PinoutFilter:
 
         return filtered
 
-    def filter_content(self, extracted) -> FilteredContent:
-        """Filter extracted content to only pinout-relevant information."""
+    def filter_content(self, extracted, analyses: Optional[Dict] = None) -> FilteredContent:
+        """
+        Filter extracted content to only pinout-relevant information.
+
+        Args:
+            extracted: ExtractedContent to filter
+            analyses: Optional {page_number: PageAnalysis} mapping; when given,
+                      per-page text is taken from the shared analysis records
+                      instead of re-splitting the combined text on page markers
+        """
         # Filter tables
         filtered_tables = self.filter_tables(extracted.tables)
 
         # Get pages that have pinout tables
         pages_with_pinout_tables = {page_num for page_num, _ in filtered_tables}
 
-        # Split text into blocks by page markers
-        text_blocks = []
-        current_page = None
-        current_block = []
-
-        for line in extracted.text_content.split('\n'):
-            if line.strip().startswith('--- Page'):
-                if current_page is not None and current_block:
-                    text_blocks.append((current_page, "\n".join(current_block)))
-                current_block = []
-                try:
-                    current_page = int(line.strip().replace('--- Page', '').replace('---', '').strip())
-                except:
-                    current_page = None
-            elif current_page is not None:
-                current_block.append(line)
-
-        # Add last block
-        if current_page is not None and current_block:
-            text_blocks.append((current_page, "\n".join(current_block)))
+        if analyses:
+            text_blocks = [
+                (page_num, analyses[page_num].text)
+                for page_num in sorted(analyses)
+            ]
+        else:
+            text_blocks = self._split_text_blocks(extracted.text_content)
 
         # Filter text blocks with improved logic
         filtered_text_blocks = []
@@ -205,6 +200,30 @@ class PinoutFilter:
             images=extracted.images  # Keep all images for multimodal
         )
 
+    def _split_text_blocks(self, text_content: str) -> List[Tuple[int, str]]:
+        """Split combined text into (page_number, text) blocks by page markers."""
+        text_blocks = []
+        current_page = None
+        current_block = []
+
+        for line in text_content.split('\n'):
+            if line.strip().startswith('--- Page'):
+                if current_page is not None and current_block:
+                    text_blocks.append((current_page, "\n".join(current_block)))
+                current_block = []
+                try:
+                    current_page = int(line.strip().replace('--- Page', '').replace('---', '').strip())
+                except:
+                    current_page = None
+            elif current_page is not None:
+                current_block.append(line)
+
+        # Add last block
+        if current_page is not None and current_block:
+            text_blocks.append((current_page, "\n".join(current_block)))
+
+        return text_blocks
+
     def format_for_llm(self, filtered: FilteredContent) -> str:
         """Format filtered content for LLM input."""
         parts = []
@@ -0,0 +1,314 @@
+"""
+Datasheet processing pipeline.
+
+Runs the standard flow for one datasheet - page detection, optional LLM
+page verification, content extraction, LLM pin extraction and schematic
+generation - so the CLI, the batch runner and the service share one
+implementation.
+"""
+
+import os
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from .config import get_settings
+from .llm import FileResponseCache
+from .models import PinData
+from .pdf_extractor import (
+    ContentExtractor,
+    ContentPacker,
+    DatasheetDocument,
+    DetectionCache,
+    PageDetector,
+    PinTableParser,
+)
+from .utils import PackageDetector, tracing
+from .utils.tokens import DEFAULT_PROMPT_TOKEN_BUDGET
+
+
+class PipelineError(RuntimeError):
+    """Raised when a datasheet cannot be turned into a schematic."""
+
+
+@dataclass
+class PipelineOptions:
+    """
+    Settings for one pipeline run (mirrors the src.main CLI flags).
+
+    model, workers and verify_workers default to the active src.config
+    settings.
+    """
+
+    model: str = field(default_factory=lambda: get_settings().llm_model)
+    min_confidence: int = 5
+    workers: int = field(default_factory=lambda: get_settings().detect_workers)
+    prefilter_min_score: int = 2
+    cache_dir: Optional[str] = None
+    no_cache: bool = False
+    llm_cache_ttl: float = 168  # Hours
+    verify_ambiguity: bool = False
+    verify_batch: bool = False
+    verify_workers: int = field(default_factory=lambda: get_settings().verify_workers)
+    verify_stop_after: Optional[int] = None
+    prompt_token_budget: int = DEFAULT_PROMPT_TOKEN_BUDGET  # 0 = no packing
+    map_reduce: bool = False
+    no_table_fast_path: bool = False
+    verbose: bool = False
+
+    @classmethod
+    def from_args(cls, args) -> "PipelineOptions":
+        """
+        Build options from parsed CLI arguments.
+
+        Args:
+            args: argparse Namespace (missing attributes keep their defaults)
+
+        Returns:
+            PipelineOptions
+        """
+        defaults = cls()
+        return cls(**{
+            name: getattr(args, name, getattr(defaults, name))
+            for name in defaults.__dataclass_fields__
+        })
+
+
+@dataclass
+class PipelineResult:
+    """Outcome of processing one datasheet."""
+
+    input_path: str
+    output_path: str
+    pin_data: PinData
+    pages: List[int] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a JSON-serializable dict."""
+        return {
+            "input_path": self.input_path,
+            "output_path": self.output_path,
+            "pages": self.pages,
+            "pin_data": asdict(self.pin_data),
+        }
+
+
+def resolve_api_key(api_key: Optional[str] = None) -> Optional[str]:
+    """
+    Get the LLM API key.
+
+    Checks the explicit key first, then DATASHEET_PARSER_API_KEY, then
+    FASTCHAT_API_KEY.
+    """
+    return (
+        api_key
+        or os.environ.get("DATASHEET_PARSER_API_KEY")
+        or os.environ.get("FASTCHAT_API_KEY")
+    )
+
+
+@tracing.traced("pipeline")
+def process_datasheet(
+    input_path: Union[str, Path],
+    output_path: Union[str, Path],
+    api_key: Optional[str] = None,
+    options: Optional[PipelineOptions] = None,
+    part_number: Optional[str] = None
+) -> PipelineResult:
+    """
+    Extract pin data from a datasheet and write its schematic symbol.
+
+    Args:
+        input_path: PDF datasheet
+        output_path: Output GLB file (parent directories are created)
+        api_key: LLM API key (see resolve_api_key for fallbacks)
+        options: Pipeline settings (defaults if None)
+        part_number: Optional part number; the LLM uses it to pick the
+                     matching package variant, and it becomes the component
+                     name if none is identified
+
+    Returns:
+        PipelineResult with the extracted pin data
+
+    Raises:
+        PipelineError: If no relevant pages are found, no API key is
+                       available when the LLM is needed, or the schematic
+                       cannot be generated
+    """
+    options = options or PipelineOptions()
+    verbose = options.verbose
+    api_key = resolve_api_key(api_key)
+
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    cache = None if options.no_cache else DetectionCache(options.cache_dir)
+
+    # Open the datasheet once; detection and extraction share its page cache
+    with DatasheetDocument(str(input_path)) as document:
+        # Step 1: Detect relevant pages
+        if verbose:
+            print("\n[1/3] Detecting relevant pages...")
+
+        with PageDetector(document, cache=cache) as detector:
+            # Pages just below the threshold are only kept if the LLM confirms them
+            candidates = detector.detect_relevant_pages(
+                min_confidence=options.min_confidence,
+                workers=options.workers,
+                prefilter_min_score=options.prefilter_min_score,
+                include_ambiguous=options.verify_ambiguity and bool(api_key)
+            )
+
+            if verbose:
+                stats = detector.last_stats
+                print(f"Prefilter skipped {stats.skipped_pages} of {stats.total_pages} pages")
+                print(f"Found {len(candidates)} relevant pages:")
+                for c in candidates:
+                    print(
+                        f"  - Page {c.page_number} (confidence: {c.confidence_score}): "
+                        f"{', '.join(c.reasons)}"
+                    )
+
+        # Optionally confirm ambiguous pages with the LLM, highest confidence first
+        if options.verify_ambiguity and api_key and any(c.needs_verification for c in candidates):
+            if verbose:
+                print("Verifying ambiguous pages with LLM...")
+            from .llm import LLMClient, PageVerifier
+            verifier = PageVerifier(LLMClient(api_key=api_key, model=options.model))
+            with tracing.span("verify", "llm", candidates=len(candidates)), \
+                    ContentExtractor(document) as page_source:
+                candidates = verifier.verify_pages(
+                    candidates,
+                    page_source,
+                    batch=options.verify_batch,
+                    max_concurrency=options.verify_workers,
+                    stop_after=options.verify_stop_after
+                )
+            if verbose:
+                print(f"{len(candidates)} page(s) after verification")
+
+        if not candidates:
+            raise PipelineError(
+                "No relevant pages found in datasheet (try lowering --min-confidence)"
+            )
+
+        # Step 2: Extract content from relevant pages
+        if verbose:
+            print("\n[2/3] Extracting content from relevant pages...")
+
+        with ContentExtractor(document, cache=cache) as extractor:
+            content = extractor.extract_content(candidates)
+
+            if verbose:
+                print(f"Extracted content from {len(content.pages)} pages")
+                print(f"Found {len(content.tables)} table(s)")
+                print(f"Found {len(content.images)} image(s)")
+
+        # Keep the most pinout-relevant content that fits the prompt budget
+        # (map-reduce sends every page in its own request instead)
+        prompt_content = content.text_content
+        if options.prompt_token_budget > 0 and not options.map_reduce:
+            packed = ContentPacker(options.prompt_token_budget).pack(content, candidates)
+            prompt_content = packed.text
+            if verbose:
+                print(
+                    f"Packed content: {packed.tokens_in} -> {packed.tokens} estimated tokens "
+                    f"({packed.dropped_blocks} block(s) dropped, "
+                    f"{packed.deduped_lines} repeated header/footer line(s) removed)"
+                )
+
+        # Clean pin tables are read directly; the LLM is only needed when they don't validate
+        table_result = None
+        if not options.no_table_fast_path:
+            table_result = PinTableParser().parse(content, part_number=part_number)
+            if verbose and table_result.ok:
+                print(
+                    f"Read {len(table_result.pin_data.pins)} pins from the pin table "
+                    f"(page(s) {', '.join(map(str, table_result.pages))}), skipping the LLM"
+                )
+            elif verbose:
+                print(f"Pin table not used: {'; '.join(table_result.problems)}")
+
+    # Step 3: Extract pin data with LLM (unless the pin table was read directly)
+    llm_cache = None
+    if table_result is not None and table_result.ok:
+        pin_data = table_result.pin_data
+    else:
+        if verbose:
+            print("\n[3/3] Extracting pin data with LLM...")
+
+        if not api_key:
+            raise PipelineError(
+                "API key required for pin data extraction "
+                "(set --api-key or FASTCHAT_API_KEY environment variable)"
+            )
+
+        if not options.no_cache:
+            llm_cache = FileResponseCache(
+                Path(options.cache_dir) / "llm" if options.cache_dir else None,
+                ttl_seconds=options.llm_cache_ttl * 3600
+            )
+
+        from .llm import LLMClient
+        llm_client = LLMClient(api_key=api_key, model=options.model, cache=llm_cache)
+        if options.map_reduce:
+            pin_data = llm_client.extract_pin_data_map_reduce(
+                content.text_content, part_number=part_number
+            )
+            if verbose and llm_client.last_merge is not None:
+                conflicts = llm_client.last_merge.conflicts
+                print(f"Merged page chunks ({len(conflicts)} pin name conflict(s))")
+                for conflict in conflicts:
+                    names = " / ".join(conflict.names)
+                    print(f"  - Pin {conflict.number}: {names} -> {conflict.chosen}")
+        else:
+            pin_data = llm_client.extract_pin_data(
+                content=prompt_content,
+                images=[img_data for _, img_data in content.images] if content.images else None,
+                part_number=part_number
+            )
+
+    if part_number and pin_data.component_name in ("", "Unknown"):
+        pin_data.component_name = part_number
+
+    if verbose:
+        print("Extracted pin data:")
+        print(f"  Component: {pin_data.component_name}")
+        print(f"  Package: {pin_data.package.type}-{pin_data.package.pin_count}")
+        if pin_data.package.width > 0:
+            print(f"  Dimensions: {pin_data.package.width}mm x {pin_data.package.height}mm")
+        else:
+            print("  Dimensions: N/A (will be estimated from package type)")
+        print(f"  Pin count: {len(pin_data.pins)}")
+        print(f"  Extraction method: {pin_data.extraction_method}")
+        if llm_cache is not None:
+            print(f"  LLM cache: {llm_cache.hits} hit(s), {llm_cache.misses} miss(es)")
+
+        if len(pin_data.pins) > 0:
+            print(f"  Pins (all {len(pin_data.pins)} pins):")
+            for i, pin in enumerate(pin_data.pins, 1):
+                func = f" ({pin.function})" if pin.function else ""
+                print(f"    {i:2d}. Pin {pin.number}: {pin.name}{func}")
+
+    # Validate and normalize package
+    with tracing.span("normalize_package"):
+        detector = PackageDetector()
+        pin_data.package.type = detector.normalize_package_name(pin_data.package.type)
+
+    # Step 4: Generate schematic symbol
+    if verbose:
+        print("\n[3/3] Generating schematic symbol...")
+
+    # CadQuery is only loaded for this step
+    with tracing.span("schematic", "cad", pins=len(pin_data.pins)):
+        from .schematic_generator import build_schematic_from_pin_data
+        built = build_schematic_from_pin_data(pin_data=pin_data, output_path=str(output_path))
+    if not built:
+        raise PipelineError("Failed to generate schematic")
+
+    return PipelineResult(
+        input_path=str(input_path),
+        output_path=str(output_path),
+        pin_data=pin_data,
+        pages=[c.page_number for c in candidates],
+    )
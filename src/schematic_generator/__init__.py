@@ -1,5 +1,7 @@
 """Schematic generator module for creating IC schematic symbols."""
 
+import importlib
+
 from .package_geometry import (
     PackageType,
     PinGeometry,
@@ -19,14 +21,15 @@ from .pin_layout import (
     PinLayout,
     layout_pins,
 )
-from .schematic_builder import (
-    SchematicBuilder,
-    build_schematic_from_pin_data as builder_build_schematic,
-)
-from .adapter import (
-    pin_data_to_builder_format,
-    build_schematic_from_pin_data,
-)
+
+# The builder needs CadQuery/OCC, which takes seconds to import; load it on
+# first access (PEP 562) so geometry and layout helpers stay cheap
+_LAZY_ATTRS = {
+    "SchematicBuilder": (".schematic_builder", "SchematicBuilder"),
+    "builder_build_schematic": (".schematic_builder", "build_schematic_from_pin_data"),
+    "pin_data_to_builder_format": (".adapter", "pin_data_to_builder_format"),
+    "build_schematic_from_pin_data": (".adapter", "build_schematic_from_pin_data"),
+}
 
 __all__ = [
     "PackageType",
@@ -49,3 +52,16 @@ __all__ = [
     "pin_data_to_builder_format",
     "build_schematic_from_pin_data",
 ]
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRS:
+        module_name, attr = _LAZY_ATTRS[name]
+        value = getattr(importlib.import_module(module_name, __name__), attr)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -7,7 +7,6 @@ This module provides functions to convert between the PinData model
 
 from typing import List, Dict, Any, Optional
 from src.models.pin_data import PinData, Pin
-from .schematic_builder import build_schematic_from_pin_data as build_schematic
 
 
 def pin_data_to_builder_format(pin_data: PinData) -> tuple:
@@ -67,5 +66,6 @@ def build_schematic_from_pin_data(pin_data: PinData, output_path: str, custom_la
     # Convert PinData to builder format
     package_type, pin_count, component_name, pins_for_builder = pin_data_to_builder_format(pin_data)
 
-    # Build schematic
+    # Build schematic (imported here: the builder loads CadQuery)
+    from .schematic_builder import build_schematic_from_pin_data as build_schematic
     return build_schematic(package_type, pin_count, component_name, pins_for_builder, output_path, custom_layout)
@@ -17,6 +17,7 @@ from .package_geometry import (
     get_schematic_parameters,
 )
 from .pin_layout import PinPosition, layout_pins
+from ..utils import tracing
 
 # Setup logging
 logger = logging.getLogger(__name__)
@@ -268,6 +269,7 @@ class SchematicBuilder:
         assy.add(value, color=self.BLACK_COLOR)
         return assy
 
+    @tracing.traced("cad.build", "cad")
     def build_schematic(self, pin_data: List[Dict[str, Any]]) -> cq.Assembly:
         """
         Build complete schematic symbol assembly.
@@ -283,23 +285,26 @@ class SchematicBuilder:
 
         # 1. Add body border
         logger.info("Building body border...")
-        body_line = self.build_body_border()
+        with tracing.span("cad.body", "cad"):
+            body_line = self.build_body_border()
         package_assy.add(body_line, name="BodyLine")
 
         # 2. Add all pins
         logger.info("Building pins...")
-        legs = self.build_all_pins(pin_data)
+        with tracing.span("cad.pins", "cad", pins=len(pin_data)):
+            legs = self.build_all_pins(pin_data)
         package_assy.add(legs, name="Legs")
 
         # 3. Add designator label
         logger.info("Adding designator label...")
-        designator = self.build_designator()
-        package_assy.add(designator, name="DesignatorName")
+        with tracing.span("cad.labels", "cad"):
+            designator = self.build_designator()
+            package_assy.add(designator, name="DesignatorName")
 
-        # 4. Add package value label
-        logger.info("Adding package value label...")
-        value = self.build_package_value()
-        package_assy.add(value, name="PackageValue")
+            # 4. Add package value label
+            logger.info("Adding package value label...")
+            value = self.build_package_value()
+            package_assy.add(value, name="PackageValue")
 
         logger.info(
             "Schematic assembly built: %d top-level components" % len(package_assy.children)
@@ -326,7 +331,10 @@ class SchematicBuilder:
 
             # Save to GLB
             logger.info("Saving to %s..." % output_path)
-            assembly.save(output_path)
+            with tracing.span("cad.export_glb", "cad") as span:
+                assembly.save(output_path)
+                if os.path.exists(output_path):
+                    span.set(bytes=os.path.getsize(output_path))
 
             logger.info("Successfully saved schematic to %s" % output_path)
 
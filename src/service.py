@@ -0,0 +1,707 @@
+#!/usr/bin/env python3
+"""
+Datasheet Parser service
+
+Long-running local HTTP service around the extraction pipeline. Worker
+processes are started (and have imported pdfplumber, cadquery and the LLM
+client) before the first request, so jobs never pay interpreter cold start.
+
+Endpoints:
+    POST /jobs              Submit a job. Either a JSON body
+                            {"pdf_path": ..., "part_number": ..., "options": {...}},
+                            a raw PDF upload (Content-Type: application/pdf,
+                            optional ?part_number=...), or a multipart form with
+                            a "file" and optional "part_number" field.
+                            Returns 202 with the job id.
+    GET  /jobs/<id>         Job status (and pin data once done)
+    GET  /jobs/<id>/result  Pin data JSON of a finished job
+    GET  /jobs/<id>/glb     Generated GLB file
+    GET  /health            Worker and queue counts
+"""
+
+import argparse
+import email.parser
+import email.policy
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import CancelledError, Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field, fields, replace
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, Optional, Union, get_args, get_origin
+from urllib.parse import parse_qs, urlparse
+
+from . import config
+from .config import Settings
+from .pipeline import PipelineOptions, process_datasheet
+from .utils.tokens import DEFAULT_PROMPT_TOKEN_BUDGET
+
+# Largest accepted PDF upload
+DEFAULT_MAX_UPLOAD_BYTES = 100 * 1024 * 1024
+
+# Times a job is resubmitted after a worker crash took down the pool
+MAX_CRASH_RETRIES = 1
+
+# Finished jobs (and their GLB files) are forgotten after this many hours,
+# or once more than DEFAULT_MAX_FINISHED_JOBS have finished
+DEFAULT_JOB_TTL_HOURS = 24
+DEFAULT_MAX_FINISHED_JOBS = 1000
+
+# Service CLI flags backed by settings (flag dest -> field)
+SERVICE_ARG_FIELDS = {"model": "llm_model", "workers": "service_workers"}
+
+
+def _warm_worker(settings: Optional[Settings] = None) -> None:
+    """
+    Worker initializer: apply the service's settings and load the modules
+    the pipeline imports lazily.
+    """
+    if settings is not None:
+        config.configure(settings)
+
+    import openai  # noqa: F401
+
+    from .llm import LLMClient, PageVerifier  # noqa: F401
+
+    try:
+        from .schematic_generator import schematic_builder  # noqa: F401  (CadQuery/OCC)
+    except ImportError:
+        pass  # Reported per job by the schematic step
+
+    if os.environ.get("FASTCHAT_API_KEY"):
+        try:
+            from .chat_bot import _get_client
+            _get_client()
+        except Exception:
+            pass
+
+
+def _ping() -> int:
+    """No-op task used to start every worker at startup."""
+    return os.getpid()
+
+
+def _run_job(
+    pdf_path: str,
+    output_path: str,
+    part_number: Optional[str],
+    api_key: Optional[str],
+    options: PipelineOptions
+) -> Dict[str, Any]:
+    """Run the pipeline for one job in a worker process."""
+    result = process_datasheet(
+        pdf_path,
+        output_path,
+        api_key=api_key,
+        options=options,
+        part_number=part_number
+    )
+    return result.to_dict()
+
+
+@dataclass
+class Job:
+    """A submitted extraction job."""
+
+    job_id: str
+    pdf_path: str
+    output_path: str
+    part_number: Optional[str] = None
+    options: Optional[PipelineOptions] = None
+    status: str = "queued"  # queued, running, done, error
+    created: float = field(default_factory=time.time)
+    finished: Optional[float] = None
+    error: Optional[str] = None
+    result: Optional[Dict[str, Any]] = None
+    attempts: int = 0
+    uploaded: bool = False  # pdf_path is a service-owned upload, deleted when done
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Public view of the job."""
+        data = {
+            "job_id": self.job_id,
+            "status": self.status,
+            "pdf_path": self.pdf_path,
+            "part_number": self.part_number,
+            "created": self.created,
+            "finished": self.finished,
+        }
+        if self.status == "error":
+            data["error"] = self.error
+        if self.status == "done":
+            data["output_path"] = self.output_path
+            data["result"] = self.result
+        return data
+
+
+def _check_option(name: str, value: Any, expected: Any) -> None:
+    """
+    Check a PipelineOptions override against the field's type.
+
+    Raises:
+        ValueError: If the value has the wrong type (ints are accepted for
+                    float fields, None only for Optional fields)
+    """
+    allowed = get_args(expected) if get_origin(expected) is Union else (expected,)
+    if value is None and type(None) in allowed:
+        return
+    for kind in allowed:
+        if kind is bool and isinstance(value, bool):
+            return
+        if kind in (int, float) and isinstance(value, int) and not isinstance(value, bool):
+            return
+        if kind in (float, str) and isinstance(value, kind):
+            return
+    names = " or ".join("null" if kind is type(None) else kind.__name__ for kind in allowed)
+    raise ValueError(f"Option {name} must be {names}, got {value!r}")
+
+
+class ExtractionService:
+    """Job queue in front of a pool of warm worker processes."""
+
+    def __init__(
+        self,
+        work_dir: str,
+        workers: int = 2,
+        api_key: Optional[str] = None,
+        options: Optional[PipelineOptions] = None,
+        job_ttl: Optional[float] = DEFAULT_JOB_TTL_HOURS * 3600,
+        max_finished_jobs: int = DEFAULT_MAX_FINISHED_JOBS
+    ):
+        """
+        Initialize the service and start its workers.
+
+        Args:
+            work_dir: Directory for uploaded PDFs and generated GLB files
+            workers: Number of worker processes
+            api_key: LLM API key for all jobs
+            options: Default pipeline settings (jobs may override fields)
+            job_ttl: Seconds a finished job (and its GLB) is kept; None keeps
+                     them until max_finished_jobs is exceeded
+            max_finished_jobs: Finished jobs kept; the oldest are removed first
+        """
+        self.work_dir = Path(work_dir)
+        (self.work_dir / "uploads").mkdir(parents=True, exist_ok=True)
+        (self.work_dir / "outputs").mkdir(parents=True, exist_ok=True)
+
+        self.workers = workers
+        self.api_key = api_key
+        self.options = options or PipelineOptions()
+        self.job_ttl = job_ttl
+        self.max_finished_jobs = max_finished_jobs
+
+        self._jobs: Dict[str, Job] = {}
+        self._futures: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self._pool = None
+        self._start_pool()
+
+    def _start_pool(self, wait: bool = True) -> None:
+        """Start the worker pool, optionally waiting until every worker is warm."""
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_warm_worker,
+            initargs=(config.get_settings(),)
+        )
+        pings = [self._pool.submit(_ping) for _ in range(self.workers)]
+        if wait:
+            for ping in pings:
+                ping.result()
+
+    def submit(
+        self,
+        pdf_path: Optional[str] = None,
+        pdf_bytes: Optional[bytes] = None,
+        part_number: Optional[str] = None,
+        overrides: Optional[Dict[str, Any]] = None
+    ) -> Job:
+        """
+        Queue a job.
+
+        Args:
+            pdf_path: Path of a PDF readable by the service
+            pdf_bytes: Uploaded PDF contents (used if pdf_path is None)
+            part_number: Optional part number
+            overrides: Optional PipelineOptions fields for this job
+
+        Returns:
+            The queued Job
+
+        Raises:
+            ValueError: If the input is missing or an override is unknown or mistyped
+        """
+        job_id = uuid.uuid4().hex
+        options = self.options
+        if overrides:
+            if not isinstance(overrides, dict):
+                raise ValueError("options must be an object")
+            types = {f.name: f.type for f in fields(PipelineOptions)}
+            unknown = set(overrides) - set(types)
+            if unknown:
+                raise ValueError(f"Unknown options: {', '.join(sorted(unknown))}")
+            for name, value in overrides.items():
+                _check_option(name, value, types[name])
+            options = replace(options, **overrides)
+
+        upload = None
+        if pdf_path is None:
+            if not pdf_bytes:
+                raise ValueError("Provide pdf_path or upload a PDF")
+            upload = self.work_dir / "uploads" / f"{job_id}.pdf"
+            upload.write_bytes(pdf_bytes)
+            pdf_path = str(upload)
+        elif not Path(pdf_path).is_file():
+            raise ValueError(f"File not found: {pdf_path}")
+
+        job = Job(
+            job_id=job_id,
+            pdf_path=pdf_path,
+            output_path=str(self.work_dir / "outputs" / f"{job_id}.glb"),
+            part_number=part_number,
+            options=options,
+            uploaded=upload is not None,
+        )
+        with self._lock:
+            self._prune()
+            self._jobs[job_id] = job
+            future = self._dispatch(job)
+        self._watch(job_id, future)
+        return job
+
+    def _dispatch(self, job: Job) -> Optional[Future]:
+        """
+        Send a job to the pool (caller holds the lock).
+
+        Returns:
+            The job's future, to be passed to _watch() once the lock is
+            released; None if the pool refused the job, which is then
+            recorded as an error
+        """
+        job.attempts += 1
+        try:
+            future = self._pool.submit(
+                _run_job, job.pdf_path, job.output_path, job.part_number, self.api_key, job.options
+            )
+        except (BrokenProcessPool, RuntimeError) as error:
+            self._finish(job, error=error)
+            return None
+        self._futures[job.job_id] = future
+        return future
+
+    def _watch(self, job_id: str, future: Optional[Future]) -> None:
+        """
+        Call _on_done when the future finishes.
+
+        Must be called without the lock held: for a future that has already
+        finished, add_done_callback runs the callback in this thread.
+        """
+        if future is not None:
+            future.add_done_callback(lambda f: self._on_done(job_id, f))
+
+    def _on_done(self, job_id: str, future: Future) -> None:
+        """Record a finished job."""
+        retry = None
+        with self._lock:
+            job = self._jobs[job_id]
+            if future.cancelled():
+                error = CancelledError("service shut down before the job ran")
+            else:
+                error = future.exception()
+
+            if isinstance(error, BrokenProcessPool):
+                # A worker died and took the pool with it; restart it and retry
+                if self._pool_is_broken():
+                    self._pool.shutdown(wait=False)
+                    self._start_pool(wait=False)
+                if job.attempts <= MAX_CRASH_RETRIES:
+                    retry = self._dispatch(job)
+
+            # A refused retry was already recorded as an error by _dispatch
+            if retry is None and job.finished is None:
+                self._finish(job, future=future, error=error)
+        self._watch(job_id, retry)
+
+    def _finish(
+        self, job: Job, future: Optional[Future] = None, error: Optional[BaseException] = None
+    ) -> None:
+        """Record a job's result or error (caller holds the lock)."""
+        self._futures.pop(job.job_id, None)
+        job.finished = time.time()
+        if job.uploaded:
+            Path(job.pdf_path).unlink(missing_ok=True)
+        if error is None:
+            job.status = "done"
+            job.result = future.result()
+        else:
+            job.status = "error"
+            job.error = f"{type(error).__name__}: {error}"
+        self._prune()
+
+    def _prune(self) -> None:
+        """Forget expired and excess finished jobs and their GLB files (caller holds the lock)."""
+        finished = sorted(
+            (job for job in self._jobs.values() if job.finished is not None),
+            key=lambda job: job.finished
+        )
+        excess = max(0, len(finished) - self.max_finished_jobs)
+        cutoff = None if self.job_ttl is None else time.time() - self.job_ttl
+        for index, job in enumerate(finished):
+            if index >= excess and (cutoff is None or job.finished >= cutoff):
+                break
+            del self._jobs[job.job_id]
+            Path(job.output_path).unlink(missing_ok=True)
+
+    def _pool_is_broken(self) -> bool:
+        """Whether the current pool can no longer accept work."""
+        try:
+            self._pool.submit(_ping).cancel()
+            return False
+        except BrokenProcessPool:
+            return True
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Get a job by id, with its status refreshed."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            future = self._futures.get(job_id)
+            running = future is not None and future.running()
+            if job is not None and job.status == "queued" and running:
+                job.status = "running"
+            return job
+
+    def stats(self) -> Dict[str, int]:
+        """Job counts by status."""
+        with self._lock:
+            counts = {"workers": self.workers, "queued": 0, "running": 0, "done": 0, "error": 0}
+            for job_id, job in self._jobs.items():
+                future = self._futures.get(job_id)
+                status = job.status
+                if status == "queued" and future is not None and future.running():
+                    status = "running"
+                counts[status] += 1
+            return counts
+
+    def shutdown(self) -> None:
+        """Stop the workers (queued jobs are cancelled, running jobs are abandoned)."""
+        with self._lock:
+            pending = list(self._futures.values())
+        for future in pending:
+            future.cancel()
+        self._pool.shutdown(wait=False)
+
+
+def parse_multipart(body: bytes, content_type: str) -> Dict[str, Any]:
+    """
+    Parse a multipart/form-data body.
+
+    Args:
+        body: Raw request body
+        content_type: Full Content-Type header (with boundary)
+
+    Returns:
+        Dict of field name to bytes (file parts) or str (plain fields)
+    """
+    message = email.parser.BytesParser(policy=email.policy.HTTP).parsebytes(
+        f"Content-Type: {content_type}\r\n\r\n".encode("latin-1") + body
+    )
+    form = {}
+    for part in message.iter_parts():
+        name = part.get_param("name", header="content-disposition")
+        if not name:
+            continue
+        payload = part.get_payload(decode=True) or b""
+        form[name] = payload if part.get_filename() else payload.decode("utf-8")
+    return form
+
+
+def make_handler(
+    service: ExtractionService,
+    max_upload_bytes: int = DEFAULT_MAX_UPLOAD_BYTES,
+    verbose: bool = False
+):
+    """
+    Build the HTTP request handler class bound to a service.
+
+    Args:
+        service: ExtractionService handling the jobs
+        max_upload_bytes: Largest accepted request body
+        verbose: Log each request to stderr
+
+    Returns:
+        BaseHTTPRequestHandler subclass
+    """
+
+    class ServiceHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _send_json(self, status: int, payload: Dict[str, Any]) -> None:
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _error(self, status: int, message: str) -> None:
+            self._send_json(status, {"error": message})
+
+        def do_POST(self):
+            url = urlparse(self.path)
+            if url.path.rstrip("/") != "/jobs":
+                return self._error(404, "Not found")
+
+            length = int(self.headers.get("Content-Length") or 0)
+            if length > max_upload_bytes:
+                return self._error(413, f"Request body larger than {max_upload_bytes} bytes")
+            body = self.rfile.read(length)
+
+            content_type = (self.headers.get("Content-Type") or "").split(";")[0].strip()
+            query = parse_qs(url.query)
+            try:
+                if content_type == "application/json":
+                    request = json.loads(body or b"{}")
+                    if not isinstance(request, dict):
+                        return self._error(400, "JSON body must be an object")
+                    job = service.submit(
+                        pdf_path=request.get("pdf_path"),
+                        part_number=request.get("part_number"),
+                        overrides=request.get("options")
+                    )
+                elif content_type in ("application/pdf", "application/octet-stream"):
+                    job = service.submit(
+                        pdf_bytes=body,
+                        part_number=query.get("part_number", [None])[0]
+                    )
+                elif content_type == "multipart/form-data":
+                    form = parse_multipart(body, self.headers["Content-Type"])
+                    if not isinstance(form.get("file"), bytes):
+                        return self._error(400, 'Multipart upload needs a "file" part')
+                    job = service.submit(
+                        pdf_bytes=form["file"],
+                        part_number=form.get("part_number") or None
+                    )
+                else:
+                    return self._error(
+                        415, "Send application/json, application/pdf or multipart/form-data"
+                    )
+            except (ValueError, TypeError) as e:
+                return self._error(400, str(e))
+
+            self._send_json(202, job.to_dict())
+
+        def do_GET(self):
+            parts = [p for p in urlparse(self.path).path.split("/") if p]
+
+            if parts == ["health"]:
+                return self._send_json(200, service.stats())
+
+            if len(parts) < 2 or parts[0] != "jobs":
+                return self._error(404, "Not found")
+
+            job = service.get(parts[1])
+            if job is None:
+                return self._error(404, "Unknown job")
+
+            if len(parts) == 2:
+                return self._send_json(200, job.to_dict())
+
+            if job.status != "done":
+                return self._error(409, f"Job is {job.status}")
+
+            if parts[2:] == ["result"]:
+                return self._send_json(200, job.result)
+
+            if parts[2:] == ["glb"]:
+                data = Path(job.output_path).read_bytes()
+                self.send_response(200)
+                self.send_header("Content-Type", "model/gltf-binary")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+                return
+
+            self._error(404, "Not found")
+
+        def log_message(self, format, *args):
+            if verbose:
+                super().log_message(format, *args)
+
+    return ServiceHandler
+
+
+def parse_arguments():
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Run the datasheet extraction service with warm worker processes",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python -m src.service --port 8700 --workers 4
+
+  curl -X POST localhost:8700/jobs -H 'Content-Type: application/pdf' \\
+       --data-binary @datasheet.pdf
+  curl -X POST localhost:8700/jobs -F file=@datasheet.pdf -F part_number=NE555
+  curl localhost:8700/jobs/<job_id>
+  curl -o out.glb localhost:8700/jobs/<job_id>/glb
+        """
+    )
+
+    parser.add_argument(
+        "--host", default="127.0.0.1", help="Address to bind (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--port", type=int, default=8700, help="Port to listen on (default: %(default)s)"
+    )
+
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Number of worker processes (default: service_workers setting, else CPU count)"
+    )
+
+    parser.add_argument(
+        "--work-dir",
+        default="output/service",
+        help="Directory for uploads and generated files (default: %(default)s)"
+    )
+
+    parser.add_argument(
+        "--max-upload-mb",
+        type=float,
+        default=DEFAULT_MAX_UPLOAD_BYTES / 1024 / 1024,
+        help="Largest accepted PDF upload in MB (default: %(default)s)"
+    )
+
+    parser.add_argument(
+        "--job-ttl",
+        type=float,
+        default=DEFAULT_JOB_TTL_HOURS,
+        help="Hours a finished job and its GLB file are kept (default: %(default)s)"
+    )
+
+    parser.add_argument(
+        "--max-finished-jobs",
+        type=int,
+        default=DEFAULT_MAX_FINISHED_JOBS,
+        help="Finished jobs kept; the oldest are removed first (default: %(default)s)"
+    )
+
+    parser.add_argument("--api-key", help="LLM API key (or set FASTCHAT_API_KEY env var)")
+    parser.add_argument(
+        "--model",
+        help=f"LLM model to use (default: llm_model setting, {Settings.llm_model})"
+    )
+
+    parser.add_argument(
+        "--min-confidence",
+        type=int,
+        default=5,
+        help="Minimum confidence score for page detection (default: %(default)s)"
+    )
+
+    parser.add_argument(
+        "--prefilter-min-score",
+        type=int,
+        default=2,
+        help="Minimum text-only score before a page gets full table/diagram "
+             "analysis; 0 disables the prefilter (default: %(default)s)"
+    )
+
+    parser.add_argument(
+        "--cache-dir",
+        help="Directory for cached detection results "
+             "(default: $DATASHEET_PARSER_CACHE_DIR or ~/.cache/datasheet-parser)"
+    )
+
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Do not read or write cached detection results or LLM responses"
+    )
+
+    parser.add_argument(
+        "--llm-cache-ttl",
+        type=float,
+        default=168,
+        help="Hours before a cached LLM response expires (default: %(default)s)"
+    )
+
+    parser.add_argument(
+        "--prompt-token-budget",
+        type=int,
+        default=DEFAULT_PROMPT_TOKEN_BUDGET,
+        help="Estimated-token budget for datasheet content in the pin extraction prompt; "
+             "the most pinout-relevant blocks are kept, 0 sends everything (default: %(default)s)"
+    )
+
+    parser.add_argument(
+        "--no-table-fast-path",
+        action="store_true",
+        help="Always extract pins with the LLM, even when a pin table can be read directly"
+    )
+
+    parser.add_argument(
+        "--map-reduce",
+        action="store_true",
+        help="Extract pins page by page with concurrent LLM requests and merge the results "
+             "(for pinouts spanning many pages; --prompt-token-budget is not applied)"
+    )
+
+    parser.add_argument("--verbose", "-v", action="store_true", help="Log requests")
+
+    config.add_config_arguments(parser)
+
+    return parser.parse_args()
+
+
+def main():
+    """Service entry point."""
+    args = parse_arguments()
+
+    try:
+        config.configure_from_args(args, SERVICE_ARG_FIELDS)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    args.workers = args.workers or os.cpu_count() or 1
+
+    # Workers inherit the environment, so the key only has to be set once
+    if args.api_key:
+        os.environ["FASTCHAT_API_KEY"] = args.api_key
+
+    options = PipelineOptions.from_args(args)
+    # --verbose logs requests; pipeline progress would interleave across workers
+    options.verbose = False
+
+    print(f"Starting {args.workers} worker(s)...")
+    service = ExtractionService(
+        args.work_dir,
+        args.workers,
+        args.api_key,
+        options,
+        job_ttl=args.job_ttl * 3600,
+        max_finished_jobs=args.max_finished_jobs
+    )
+
+    server = ThreadingHTTPServer(
+        (args.host, args.port),
+        make_handler(service, int(args.max_upload_mb * 1024 * 1024), args.verbose)
+    )
+    print(f"Listening on http://{args.host}:{server.server_port}")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.shutdown()
+
+
+if __name__ == "__main__":
+    main()
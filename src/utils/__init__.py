@@ -1,5 +1,6 @@
 """Utility modules."""
 
+from .disk_cache import DiskCache, default_cache_dir
 from .package_detector import PackageDetector
 
-__all__ = ["PackageDetector"]
+__all__ = ["PackageDetector", "DiskCache", "default_cache_dir"]
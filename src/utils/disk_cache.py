@@ -0,0 +1,178 @@
+"""
+Small persistent key/value cache stored as files in a local directory.
+
+Used to keep expensive results (page detection, extracted content) across
+runs. Entries are evicted least-recently-used first once the directory grows
+beyond a size limit.
+"""
+
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from typing import Optional, Union
+
+# Default size limit for a cache directory
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+def default_cache_dir() -> Path:
+    """
+    Get the base cache directory.
+
+    Uses DATASHEET_PARSER_CACHE_DIR if set, otherwise
+    $XDG_CACHE_HOME/datasheet-parser (~/.cache/datasheet-parser).
+    """
+    env_dir = os.environ.get("DATASHEET_PARSER_CACHE_DIR")
+    if env_dir:
+        return Path(env_dir).expanduser()
+    xdg_cache = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    return Path(xdg_cache) / "datasheet-parser"
+
+
+def hash_file(path: Union[str, Path], chunk_size: int = 1024 * 1024) -> str:
+    """Return the SHA-256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class DiskCache:
+    """
+    Directory-backed byte cache with size-based LRU eviction.
+
+    Each entry is one file named by the SHA-256 of its key. Reads refresh
+    the file's modification time, which serves as the LRU clock.
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            directory: Directory to store entries in (created if missing)
+            max_bytes: Total size limit; oldest entries are evicted beyond it
+        """
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def _path_for(self, key: str) -> Path:
+        """Get the file path for a key."""
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return self.directory / digest[:2] / digest
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Get a cached value.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached bytes, or None on a miss
+        """
+        path = self._path_for(key)
+        try:
+            data = path.read_bytes()
+        except OSError:
+            self.misses += 1
+            return None
+
+        try:
+            os.utime(path, None)  # Mark as recently used
+        except OSError:
+            pass
+        self.hits += 1
+        return data
+
+    def set(self, key: str, value: bytes) -> None:
+        """
+        Store a value, evicting old entries if the size limit is exceeded.
+
+        Args:
+            key: Cache key
+            value: Bytes to store
+        """
+        path = self._path_for(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Write atomically so concurrent readers never see partial entries
+        fd, tmp_path = tempfile.mkstemp(dir=str(path.parent), prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(value)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+        self._evict()
+
+    def delete(self, key: str) -> None:
+        """Remove an entry if present."""
+        try:
+            self._path_for(key).unlink()
+        except OSError:
+            pass
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        for path in self._entries():
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+    def size_bytes(self) -> int:
+        """Total size of all entries."""
+        total = 0
+        for path in self._entries():
+            try:
+                total += path.stat().st_size
+            except OSError:
+                pass
+        return total
+
+    def _entries(self):
+        """Iterate over entry files (skipping in-progress temp files)."""
+        if not self.directory.exists():
+            return
+        for path in self.directory.glob("*/*"):
+            if path.is_file() and not path.name.startswith(".tmp-"):
+                yield path
+
+    def _evict(self) -> None:
+        """Delete least-recently-used entries until under max_bytes."""
+        entries = []
+        total = 0
+        for path in self._entries():
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        if total <= self.max_bytes:
+            return
+
+        entries.sort(key=lambda entry: entry[0])
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+                total -= size
+            except OSError:
+                pass
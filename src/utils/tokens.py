@@ -0,0 +1,64 @@
+"""
+Local token-count estimates for sizing LLM prompts.
+
+These are heuristics, not a real tokenizer: English/datasheet text averages
+about 4 characters per token for Llama/GPT-style BPE vocabularies, while
+dense tables of short symbols (pin names, numbers) come out closer to one
+token per word piece. Taking the larger of both estimates errs on the safe
+side for budget decisions.
+"""
+
+import re
+
+CHARS_PER_TOKEN = 4
+
+# Default estimated-token budget for the datasheet content in the pin
+# extraction prompt (see pdf_extractor.content_packer)
+DEFAULT_PROMPT_TOKEN_BUDGET = 4000
+
+_WORD_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of tokens in a text.
+
+    Args:
+        text: Text to measure
+
+    Returns:
+        Estimated token count
+    """
+    if not text:
+        return 0
+    char_estimate = len(text) / CHARS_PER_TOKEN
+    piece_estimate = len(_WORD_PATTERN.findall(text)) * 0.75
+    return int(max(char_estimate, piece_estimate)) + 1
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """
+    Truncate text to roughly max_tokens tokens.
+
+    Args:
+        text: Text to truncate
+        max_tokens: Token limit
+
+    Returns:
+        Text cut at a line boundary where possible, with a marker if truncated
+    """
+    if estimate_tokens(text) <= max_tokens:
+        return text
+
+    # Shrink by characters until the estimate fits
+    limit = max_tokens * CHARS_PER_TOKEN
+    truncated = text[:limit]
+    while limit > 0 and estimate_tokens(truncated) > max_tokens:
+        limit = int(limit * 0.9)
+        truncated = text[:limit]
+
+    # Prefer cutting at a line break
+    newline = truncated.rfind("\n")
+    if newline > limit // 2:
+        truncated = truncated[:newline]
+    return truncated + "\n[... truncated]"
@@ -0,0 +1,297 @@
+"""
+Lightweight stage tracing.
+
+Pipeline stages open nested spans with span(); when tracing is enabled
+(see enable()) each finished span is recorded with its wall time, thread
+and attributes such as bytes sent or estimated tokens. Recorded spans can
+be written as a Chrome trace (chrome://tracing, Perfetto) or summarized
+as a per-stage table.
+
+When tracing is disabled, span() returns a shared no-op object, so
+instrumented code pays only a function call.
+
+Spans opened in other processes (e.g. detection workers) are not recorded.
+"""
+
+import contextvars
+import functools
+import itertools
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+# Id of the innermost open span; a ContextVar so asyncio tasks and threads
+# each get their own nesting
+_current_span: contextvars.ContextVar = contextvars.ContextVar("current_span", default=None)
+
+
+@dataclass
+class SpanRecord:
+    """A finished span."""
+
+    span_id: int
+    parent_id: Optional[int]
+    name: str
+    category: str
+    start: float  # Seconds since the tracer was reset
+    duration: float  # Seconds
+    thread_id: int
+    args: Dict[str, Any] = field(default_factory=dict)
+
+
+class Span:
+    """An open span; use as a context manager."""
+
+    __slots__ = ("tracer", "name", "category", "args", "span_id", "parent_id", "_start", "_token")
+
+    def __init__(self, tracer: "Tracer", name: str, category: str, args: Dict[str, Any]):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+        self.span_id = next(tracer._ids)
+        self.parent_id = None
+        self._start = 0.0
+        self._token = None
+
+    def set(self, **args) -> None:
+        """Attach attributes (bytes, tokens, cache hits, ...) to the span."""
+        self.args.update(args)
+
+    def __enter__(self):
+        self.parent_id = _current_span.get()
+        self._token = _current_span.set(self.span_id)
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        end = time.perf_counter()
+        _current_span.reset(self._token)
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        self.tracer._record(SpanRecord(
+            span_id=self.span_id,
+            parent_id=self.parent_id,
+            name=self.name,
+            category=self.category,
+            start=self._start - self.tracer.origin,
+            duration=end - self._start,
+            thread_id=threading.get_ident(),
+            args=self.args,
+        ))
+        return False
+
+
+class _NullSpan:
+    """Span stand-in used while tracing is disabled."""
+
+    __slots__ = ()
+
+    def set(self, **args) -> None:
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Tracer:
+    """Collects finished spans."""
+
+    def __init__(self):
+        self.enabled = False
+        self.origin = time.perf_counter()
+        self._ids = itertools.count(1)
+        self._records: List[SpanRecord] = []
+        self._lock = threading.Lock()
+
+    def _record(self, record: SpanRecord) -> None:
+        with self._lock:
+            self._records.append(record)
+
+    @property
+    def records(self) -> List[SpanRecord]:
+        """Finished spans in completion order."""
+        with self._lock:
+            return list(self._records)
+
+    def reset(self) -> None:
+        """Drop recorded spans and restart the clock."""
+        with self._lock:
+            self._records.clear()
+            self.origin = time.perf_counter()
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """
+        Convert recorded spans to Chrome trace format.
+
+        Returns:
+            Dict with "traceEvents" holding one complete ("X") event per span
+        """
+        pid = os.getpid()
+        events = [
+            {
+                "name": r.name,
+                "cat": r.category,
+                "ph": "X",
+                "ts": round(r.start * 1e6, 3),
+                "dur": round(r.duration * 1e6, 3),
+                "pid": pid,
+                "tid": r.thread_id,
+                "args": r.args,
+            }
+            for r in sorted(self.records, key=lambda r: r.start)
+        ]
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_chrome_trace(self, path: Union[str, Path]) -> None:
+        """
+        Write recorded spans as a Chrome trace JSON file.
+
+        Args:
+            path: Output file (open in chrome://tracing or ui.perfetto.dev)
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_chrome_trace(), f, default=str)
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """
+        Aggregate recorded spans by name.
+
+        Self time is a span's duration minus that of its direct children
+        (never below zero, as concurrent children can overlap).
+
+        Returns:
+            One row per span name with count, total, self and max seconds,
+            ordered by total time
+        """
+        records = self.records
+        child_time: Dict[int, float] = {}
+        for r in records:
+            if r.parent_id is not None:
+                child_time[r.parent_id] = child_time.get(r.parent_id, 0.0) + r.duration
+
+        rows: Dict[str, Dict[str, Any]] = {}
+        for r in records:
+            row = rows.setdefault(r.name, {
+                "name": r.name, "count": 0, "total": 0.0, "self": 0.0, "max": 0.0,
+            })
+            row["count"] += 1
+            row["total"] += r.duration
+            row["self"] += max(0.0, r.duration - child_time.get(r.span_id, 0.0))
+            row["max"] = max(row["max"], r.duration)
+
+        return sorted(rows.values(), key=lambda row: row["total"], reverse=True)
+
+    def format_summary(self) -> str:
+        """Format summary() as a text table (times in milliseconds)."""
+        rows = self.summary()
+        if not rows:
+            return "No spans recorded"
+
+        # Percentages are of the traced wall time (first span start to last span end)
+        records = self.records
+        wall = max(r.start + r.duration for r in records) - min(r.start for r in records)
+        width = max(len("Stage"), *(len(row["name"]) for row in rows))
+        lines = [
+            f"{'Stage':<{width}}  {'Count':>5}  {'Total ms':>10}  {'Self ms':>10}  {'Max ms':>10}  {'%':>5}",
+            "-" * (width + 51),
+        ]
+        for row in rows:
+            share = 100.0 * row["total"] / wall if wall > 0 else 0.0
+            lines.append(
+                f"{row['name']:<{width}}  {row['count']:>5}  {row['total'] * 1000:>10.1f}  "
+                f"{row['self'] * 1000:>10.1f}  {row['max'] * 1000:>10.1f}  {share:>5.1f}"
+            )
+        return "\n".join(lines)
+
+
+_tracer = Tracer()
+
+
+def get_tracer() -> Tracer:
+    """Get the process-wide tracer."""
+    return _tracer
+
+
+def enable() -> None:
+    """Start recording spans (clears earlier records)."""
+    _tracer.reset()
+    _tracer.enabled = True
+
+
+def disable() -> None:
+    """Stop recording spans (records are kept)."""
+    _tracer.enabled = False
+
+
+def is_enabled() -> bool:
+    """Whether spans are being recorded."""
+    return _tracer.enabled
+
+
+def span(name: str, category: str = "pipeline", **args):
+    """
+    Open a span around a block of work.
+
+    Args:
+        name: Stage name, e.g. "detect.page" or "llm.completion"
+        category: Trace category (e.g. "pdf", "llm", "vision", "cad")
+        **args: Attributes to record with the span
+
+    Returns:
+        Context manager; call .set(**args) on it to add attributes later
+    """
+    if not _tracer.enabled:
+        return _NULL_SPAN
+    return Span(_tracer, name, category, args)
+
+
+def report(profile: bool = False, trace_file: Optional[Union[str, Path]] = None) -> None:
+    """
+    Print the summary table and/or write the Chrome trace (CLI helper).
+
+    Args:
+        profile: Print the per-stage summary table
+        trace_file: Path for the Chrome trace JSON (skipped if None)
+    """
+    if profile:
+        print("\nProfile:")
+        print(_tracer.format_summary())
+    if trace_file:
+        _tracer.write_chrome_trace(trace_file)
+        print(f"Trace written to {trace_file}")
+
+
+def traced(name: Optional[str] = None, category: str = "pipeline"):
+    """
+    Decorator that wraps every call of a function in a span.
+
+    Args:
+        name: Span name (defaults to the function's qualified name)
+        category: Trace category
+    """
+    def decorator(func):
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _tracer.enabled:
+                return func(*args, **kwargs)
+            with Span(_tracer, span_name, category, {}):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,37 @@
+"""Tests for the batch runner."""
+
+import json
+
+import pytest
+
+pytest.importorskip("pdfplumber")
+
+from src.batch import load_items
+
+
+def test_load_items_from_jsonl_manifest(tmp_path):
+    """Test manifest paths resolve relative to the manifest and outputs default to the PDF name."""
+    manifest = tmp_path / "manifest.jsonl"
+    manifest.write_text(
+        json.dumps({"pdf": "a/NE555.pdf", "part_number": "NE555"}) + "\n"
+        + json.dumps({"pdf": "b/NE555.pdf", "output": "custom.glb"}) + "\n"
+        + json.dumps({"pdf": "c/NE555.pdf"}) + "\n"
+    )
+
+    items = load_items(str(manifest), tmp_path / "out")
+
+    assert [item.pdf for item in items] == [str(tmp_path / d / "NE555.pdf") for d in "abc"]
+    assert items[0].part_number == "NE555"
+    assert items[0].output == str(tmp_path / "out" / "NE555.glb")
+    assert items[1].output == str(tmp_path / "custom.glb")
+    assert items[2].output == str(tmp_path / "out" / "NE555-2.glb")
+
+
+def test_load_items_from_directory(tmp_path):
+    """Test that a directory yields its PDFs in name order."""
+    for name in ("b.PDF", "a.pdf", "notes.txt"):
+        (tmp_path / name).write_bytes(b"")
+
+    items = load_items(str(tmp_path), tmp_path / "out")
+
+    assert [item.pdf for item in items] == [str(tmp_path / "a.pdf"), str(tmp_path / "b.PDF")]
@@ -0,0 +1,33 @@
+"""Tests for the benchmark harness."""
+
+from benchmarks.run import compare_to_baseline
+from benchmarks.standins import load_recording
+
+
+def _result(wall, rss=100.0, detect=1.0):
+    return {"wall": wall, "cpu": wall, "peak_rss_mb": rss, "stages": {"detect": detect}}
+
+
+def test_compare_to_baseline_flags_only_real_slowdowns():
+    """Test regressions need both the relative tolerance and a minimum delta."""
+    baseline = {"a.pdf": _result(2.0), "b.pdf": _result(0.01), "c.pdf": _result(2.0)}
+    results = {
+        "a.pdf": _result(3.0, detect=2.0),  # 50% slower
+        "b.pdf": _result(0.03),  # 3x slower, but only 20 ms
+        "c.pdf": _result(2.2, rss=300.0),  # Within tolerance, RSS tripled
+        "new.pdf": _result(9.0),  # Not in the baseline
+    }
+
+    regressions = compare_to_baseline(results, baseline, tolerance=0.25)
+
+    assert any(r.startswith("a.pdf: wall") for r in regressions)
+    assert any(r.startswith("a.pdf: detect") for r in regressions)
+    assert any(r.startswith("c.pdf: peak_rss") for r in regressions)
+    assert not any(r.startswith(("b.pdf", "new.pdf", "c.pdf: wall")) for r in regressions)
+
+
+def test_recordings_fall_back_to_default():
+    """Test datasheets without a recording get the default one."""
+    assert load_recording("NE555").name == "NE555"
+    assert '"VCC"' in load_recording("NE555").chat
+    assert load_recording("no-such-part").name == "default"
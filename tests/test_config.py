@@ -0,0 +1,67 @@
+"""Tests for runtime settings."""
+
+import argparse
+
+import pytest
+
+from src import config
+from src.config import Settings, load_settings
+
+
+def test_precedence(tmp_path):
+    """Test CLI overrides beat the environment, which beats the config file."""
+    config_file = tmp_path / "settings.toml"
+    config_file.write_text(
+        'llm_base_url = "http://file/v1"\n'
+        'llm_model = "file-model"\n'
+        "vision_timeout = 30\n"
+    )
+    environ = {
+        "DATASHEET_PARSER_LLM_MODEL": "env-model",
+        "DATASHEET_PARSER_LLM_TIMEOUT": "12.5",
+        "DATASHEET_PARSER_VISION_TIMEOUT": "45",
+    }
+
+    settings = load_settings(config_file, {"vision_timeout": 60, "llm_max_retries": None}, environ)
+
+    assert settings.llm_base_url == "http://file/v1"
+    assert settings.llm_model == "env-model"
+    assert settings.llm_timeout == 12.5
+    assert settings.vision_timeout == 60
+    assert settings.llm_max_retries == Settings.llm_max_retries
+    assert settings.vision_url == Settings.vision_url
+
+
+def test_invalid_settings(tmp_path):
+    """Test unknown keys and bad values are reported with their source."""
+    config_file = tmp_path / "settings.json"
+    config_file.write_text('{"llm_base_ulr": "http://typo/v1"}')
+    with pytest.raises(ValueError, match="llm_base_ulr"):
+        load_settings(config_file, environ={})
+
+    with pytest.raises(ValueError, match="DATASHEET_PARSER_DETECT_WORKERS"):
+        load_settings(environ={"DATASHEET_PARSER_DETECT_WORKERS": "many"})
+
+    with pytest.raises(ValueError, match="Cannot read"):
+        load_settings(tmp_path / "missing.toml", environ={})
+
+
+def test_configure_from_args(monkeypatch):
+    """Test flags left unset resolve to settings and are written back to args."""
+    monkeypatch.setattr(config, "_settings", None)
+    monkeypatch.setenv("DATASHEET_PARSER_VERIFY_WORKERS", "8")
+    monkeypatch.delenv("DATASHEET_PARSER_CONFIG", raising=False)
+    monkeypatch.chdir("/")
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--model")
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--verify-workers", type=int)
+    config.add_config_arguments(parser)
+    args = parser.parse_args(["--model", "cli-model", "--llm-base-url", "http://near/v1"])
+
+    settings = config.configure_from_args(args, config.PIPELINE_ARG_FIELDS)
+
+    assert config.get_settings() is settings
+    assert settings.llm_base_url == "http://near/v1"
+    assert (args.model, args.workers, args.verify_workers) == ("cli-model", 1, 8)
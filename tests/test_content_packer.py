@@ -0,0 +1,75 @@
+"""Tests for token-budget content packing."""
+
+import pytest
+
+pytest.importorskip("pdfplumber")
+
+from src.pdf_extractor.content_extractor import ExtractedContent
+from src.pdf_extractor.content_packer import ContentPacker
+from src.pdf_extractor.page_detector import PageCandidate
+from src.utils.tokens import estimate_tokens
+
+
+def _page(number, body):
+    return (
+        f"--- Page {number} ---\n"
+        "ACME MCU Family Datasheet\n"
+        f"{body}\n"
+        f"DS-1234 Rev 2 {number}/40"
+    )
+
+
+PINOUT = "\n".join(f"{n} PA{n} I/O GPIO port A bit {n}" for n in range(16))
+ELECTRICAL = "\n".join(
+    f"Absolute maximum ratings: supply voltage limit {n} V at 25 C" for n in range(40)
+)
+
+
+def _content(*pages):
+    return ExtractedContent(pages=[], text_content="\n\n".join(pages), images=[], tables=[])
+
+
+def test_dedupes_running_headers_and_footers():
+    """Test repeated edge lines are kept once and page order is preserved."""
+    content = _content(_page(3, "Pin configuration\n1 VCC"), _page(4, "2 GND"))
+
+    packed = ContentPacker(10_000).pack(content)
+
+    assert packed.text.count("ACME MCU Family Datasheet") == 1
+    assert packed.text.count("DS-1234 Rev 2") == 1
+    assert packed.deduped_lines == 2
+    assert packed.text.index("1 VCC") < packed.text.index("--- Page 4 ---") < packed.text.index("2 GND")
+
+
+def test_budget_keeps_pinout_blocks():
+    """Test a tight budget drops off-topic pages before the pin table."""
+    content = _content(_page(5, ELECTRICAL), _page(12, "Pin descriptions\n" + PINOUT))
+    candidates = [PageCandidate(5, 5), PageCandidate(12, 10)]
+
+    packed = ContentPacker(200).pack(content, candidates)
+
+    assert estimate_tokens(packed.text) <= 200
+    assert "0 PA0" in packed.text and "15 PA15" in packed.text
+    assert "limit 0 V" not in packed.text
+    assert packed.text.index("--- Page 5 ---") < packed.text.index("--- Page 12 ---")
+    assert packed.dropped_blocks > 0
+    assert packed.tokens_in > packed.tokens
+
+
+def test_keeps_edge_lines_that_differ_in_package():
+    """Test captions that differ only in the package name are not treated as repeats."""
+    content = _content(
+        "--- Page 20 ---\nFigure 7. ACME performance line LQFP64 pinout\nbody a",
+        "--- Page 21 ---\nFigure 8. ACME performance line LQFP48 pinout\nbody b\n"
+        "64636261605958575655545352515049",
+        "--- Page 22 ---\nFigure 9. ACME performance line LQFP48 pinout\nbody c\n"
+        "48474645444342414039383736353433",
+    )
+
+    packed = ContentPacker(10_000).pack(content)
+
+    assert "LQFP64 pinout" in packed.text
+    assert packed.text.count("LQFP48 pinout") == 2
+    assert "64636261605958575655545352515049" in packed.text
+    assert "48474645444342414039383736353433" in packed.text
+    assert packed.deduped_lines == 0
@@ -0,0 +1,36 @@
+"""Tests for the on-disk cache."""
+
+import os
+
+from src.utils.disk_cache import DiskCache
+
+
+def test_get_set_roundtrip(tmp_path):
+    """Test storing and loading a value."""
+    cache = DiskCache(tmp_path)
+
+    assert cache.get("missing") is None
+    cache.set("key", b"value")
+
+    assert cache.get("key") == b"value"
+    assert cache.hits == 1
+    assert cache.misses == 1
+
+
+def test_lru_eviction(tmp_path):
+    """Test that least-recently-used entries are evicted beyond max_bytes."""
+    cache = DiskCache(tmp_path, max_bytes=250)
+
+    cache.set("a", b"x" * 100)
+    cache.set("b", b"x" * 100)
+    # Age both entries, then touch "a" so "b" becomes least recently used
+    for key in ("a", "b"):
+        os.utime(cache._path_for(key), (1, 1))
+    assert cache.get("a") is not None
+
+    cache.set("c", b"x" * 100)
+
+    assert cache.get("a") is not None
+    assert cache.get("b") is None
+    assert cache.get("c") is not None
+    assert cache.size_bytes() <= 250
@@ -0,0 +1,34 @@
+"""Tests for pinout figure rendering."""
+
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("pdfplumber")
+
+from src.pdf_extractor.document import DatasheetDocument
+from src.pdf_extractor.figure_renderer import RenderOptions, render_pinout_figure
+
+NE555_PDF = Path(__file__).resolve().parent.parent / "pdfs" / "NE555.PDF"
+
+
+def test_crops_to_pin_configuration_figure():
+    """Test that the render covers the pinout drawing, not the whole page."""
+    with DatasheetDocument(str(NE555_PDF)) as document:
+        page = document.get_page(1)
+        figure = render_pinout_figure(document, 1)
+
+    x0, top, x1, bottom = figure.bbox
+    assert (x1 - x0) * (bottom - top) < 0.5 * page.width * page.height
+    assert figure.mime_type == "image/png"
+
+
+def test_pixel_ceiling_and_jpeg_encoding():
+    """Test that the resolution is lowered to respect max_pixels."""
+    options = RenderOptions(resolution=300, max_pixels=200_000, image_format="jpeg", crop=False)
+    with DatasheetDocument(str(NE555_PDF)) as document:
+        figure = render_pinout_figure(document, 1, options)
+
+    assert figure.width * figure.height <= 200_000
+    assert figure.data[:2] == b"\xff\xd8"
+    assert figure.mime_type == "image/jpeg"
@@ -0,0 +1,34 @@
+"""Tests for embedded image extraction."""
+
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("pdfplumber")
+
+from src.pdf_extractor.document import DatasheetDocument
+from src.pdf_extractor.image_extraction import decode_image_stream, extract_page_images
+
+MC74HC595A_PDF = Path(__file__).resolve().parent.parent / "pdfs" / "MC74HC595A.PDF"
+
+
+def test_jpeg_stream_is_passed_through():
+    """Test that a DCT-encoded image is returned as JPEG without rendering the page."""
+    with DatasheetDocument(str(MC74HC595A_PDF)) as document:
+        img_obj = document.get_images(1)[0]
+        data = decode_image_stream(img_obj)
+
+        assert data is not None
+        assert data[:2] == b"\xff\xd8"
+        assert document._renders == {}
+
+
+def test_duplicate_images_are_skipped():
+    """Test that a payload already seen is not returned again."""
+    with DatasheetDocument(str(MC74HC595A_PDF)) as document:
+        seen = set()
+        first = extract_page_images(document, 1, seen)
+        again = extract_page_images(document, 1, seen)
+
+    assert len(first) == 1
+    assert again == []
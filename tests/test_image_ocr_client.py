@@ -0,0 +1,99 @@
+"""Tests for the vision API client."""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip("requests")
+
+from src.llm.image_ocr_client import ImageOCRClient, PinoutExtractionResult, sniff_image_type
+from src.llm.response_cache import FileResponseCache
+
+
+@pytest.fixture
+def flaky_server():
+    """Local server that answers 503 once, then 200, over keep-alive connections."""
+    state = {"requests": 0, "clients": set()}
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers["Content-Length"]))
+            state["requests"] += 1
+            state["clients"].add(self.client_address)
+            description = {"component_name": "NE555", "pin_count": 1, "pins": [{"number": 1, "name": "GND"}]}
+            body = json.dumps({"description": description}).encode()
+            self.send_response(503 if state["requests"] == 1 else 200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}/describe_image/", state
+    server.shutdown()
+
+
+def test_sniff_image_type():
+    """Test MIME detection from magic bytes."""
+    assert sniff_image_type(b"\xff\xd8\xff\xe0rest") == "image/jpeg"
+    assert sniff_image_type(b"\x89PNG\r\n\x1a\nrest") == "image/png"
+
+
+def test_retries_and_reuses_connection(flaky_server):
+    """Test that a 503 is retried and later calls reuse the pooled connection."""
+    url, state = flaky_server
+
+    with ImageOCRClient(api_url=url, backoff_factor=0.01) as client:
+        results = [client.extract_pinout_from_image(b"\x89PNG\r\n\x1a\n") for _ in range(2)]
+
+    assert [r.component_name for r in results] == ["NE555", "NE555"]
+    assert state["requests"] == 3
+    assert len(state["clients"]) == 1
+
+
+def test_multi_image_returns_first_conclusive_result():
+    """Test that a complete, confident result ends the run without waiting for slower images."""
+    client = ImageOCRClient()
+    started = []
+
+    def fake_extract(image_data, page_number=None, part_number=None):
+        started.append(page_number)
+        delay, confidence, pin_count = image_data
+        time.sleep(delay / 100)
+        return PinoutExtractionResult("NE555", "DIP", 8, [{}] * pin_count, confidence / 10)
+
+    client.extract_pinout_from_image = fake_extract
+
+    images = [
+        (1, bytes([20, 6, 8])),
+        (2, bytes([1, 9, 8])),  # Fast and conclusive
+        (3, bytes([1, 5, 8])),
+    ]
+    result = client.extract_pinout_from_images(images, max_in_flight=2)
+
+    assert result.confidence == 0.9
+    assert 3 not in started
+
+
+def test_cached_result_skips_network(flaky_server, tmp_path):
+    """Test that a repeated image/prompt is served from the cache unless bypassed."""
+    url, state = flaky_server
+    cache = FileResponseCache(tmp_path)
+
+    with ImageOCRClient(api_url=url, backoff_factor=0.01, cache=cache) as client:
+        first = client.extract_pinout_from_image(b"\x89PNG\r\n\x1a\n")
+        second = client.extract_pinout_from_image(b"\x89PNG\r\n\x1a\n")
+    assert second == first
+    assert state["requests"] == 2  # 503 + 200, then a cache hit
+
+    with ImageOCRClient(api_url=url, cache=cache, bypass_cache=True) as client:
+        client.extract_pinout_from_image(b"\x89PNG\r\n\x1a\n")
+    assert state["requests"] == 3
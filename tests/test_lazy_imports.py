@@ -0,0 +1,68 @@
+"""Import-time regression tests: light entry points must not load heavy dependencies."""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+HEAVY_MODULES = ["cadquery", "OCP", "openai", "src.schematic_generator.schematic_builder"]
+
+
+def _loaded_after(code: str) -> list:
+    """Run code in a fresh interpreter and list the heavy modules it loaded."""
+    script = (
+        "import sys\n"
+        f"{code}\n"
+        "import json\n"
+        f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+@pytest.mark.parametrize("module", [
+    "src.main",
+    "src.main_layout",
+    "src.pipeline",
+    "src.batch",
+    "src.service",
+    "src.llm",
+    "src.schematic_generator",
+])
+def test_import_is_light(module):
+    """Test importing an entry point or package loads neither CadQuery nor OpenAI."""
+    assert _loaded_after(f"import {module}") == []
+
+
+def test_help_is_light():
+    """Test --help exits without loading CadQuery or OpenAI."""
+    code = (
+        "sys.argv = ['datasheet-parser', '--help']\n"
+        "from src.main import main\n"
+        "try:\n"
+        "    main()\n"
+        "except SystemExit:\n"
+        "    pass"
+    )
+    assert _loaded_after(code) == []
+
+
+def test_lazy_attributes_resolve():
+    """Test lazily exported names still resolve on access."""
+    pytest.importorskip("openai")
+    import src.llm
+    from src.llm.client import LLMClient
+
+    assert src.llm.LLMClient is LLMClient
+    assert "PageVerifier" in dir(src.llm)
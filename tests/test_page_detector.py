@@ -0,0 +1,69 @@
+"""Tests for page detection."""
+
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("pdfplumber")
+
+from src.pdf_extractor.page_detector import PageDetector
+
+NE555_PDF = Path(__file__).resolve().parent.parent / "pdfs" / "NE555.PDF"
+
+
+def _summary(candidates):
+    return [(c.page_number, c.confidence_score, c.has_table, c.has_diagram) for c in candidates]
+
+
+def test_prefilter_keeps_relevant_pages():
+    """Test that the text-only prefilter does not change the result."""
+    with PageDetector(str(NE555_PDF)) as detector:
+        full = detector.detect_relevant_pages(min_confidence=3)
+        assert detector.last_stats.skipped_pages == 0
+        assert detector.last_stats.analyzed_pages == detector.total_pages
+
+        filtered = detector.detect_relevant_pages(min_confidence=3, prefilter_min_score=2)
+        stats = detector.last_stats
+
+    assert _summary(filtered) == _summary(full)
+    assert stats.skipped_pages + stats.analyzed_pages == stats.total_pages
+
+
+def test_parallel_detection_matches_serial():
+    """Test that process-pool detection returns the same candidates."""
+    with PageDetector(str(NE555_PDF)) as detector:
+        serial = detector.detect_relevant_pages(min_confidence=3)
+        parallel = detector.detect_relevant_pages(min_confidence=3, workers=2)
+
+    assert _summary(parallel) == _summary(serial)
+
+
+def test_cache_hit_across_confidence_thresholds(tmp_path, monkeypatch):
+    """Test that changing min_confidence reuses the cached page scores."""
+    from src.pdf_extractor import DetectionCache
+
+    cache = DetectionCache(tmp_path)
+    with PageDetector(str(NE555_PDF), cache=cache) as detector:
+        fresh = detector.detect_relevant_pages(min_confidence=5)
+
+    with PageDetector(str(NE555_PDF), cache=cache) as detector:
+        def no_scoring(*args, **kwargs):
+            raise AssertionError("pages were scored again")
+
+        monkeypatch.setattr(detector, "_score_all_pages", no_scoring)
+        cached = detector.detect_relevant_pages(min_confidence=5)
+        lower = detector.detect_relevant_pages(min_confidence=2)
+
+    assert _summary(cached) == _summary(fresh)
+    assert len(lower) >= len(fresh)
+
+
+def test_include_ambiguous_returns_pages_below_threshold():
+    """Test pages in the verification band are returned, marked for verification."""
+    with PageDetector(str(NE555_PDF)) as detector:
+        strict = detector.detect_relevant_pages(min_confidence=8)
+        with_ambiguous = detector.detect_relevant_pages(min_confidence=8, include_ambiguous=True)
+
+    extra = [c for c in with_ambiguous if c.page_number not in {s.page_number for s in strict}]
+    assert all(3 <= c.confidence_score < 8 and c.needs_verification for c in extra)
+    assert len(with_ambiguous) == len(strict) + len(extra)
@@ -0,0 +1,83 @@
+"""Tests for LLM page verification."""
+
+import pytest
+
+pytest.importorskip("openai")
+
+from src.llm import page_verifier
+from src.llm.page_verifier import PageVerifier
+from src.pdf_extractor.page_detector import PageCandidate
+
+
+class FakeExtractor:
+    """ContentExtractor stand-in returning fixed page text."""
+
+    def extract_single_page(self, page_num):
+        return f"Pin {page_num} description"
+
+
+def test_parse_batch_response():
+    """Test parsing a per-page YES/NO list."""
+    verifier = PageVerifier(None)
+    response = "Page 3: YES\npage 5 - no\nPage 9: YES"
+
+    assert verifier._parse_batch_response(response, [3, 5, 7]) == {3: True, 5: False}
+
+
+def test_batch_mode_falls_back_for_unparsed_pages(monkeypatch):
+    """Test that one call covers the batch and missing answers are retried per page."""
+    calls = []
+
+    def fake_completion(messages, model=None):
+        calls.append(messages)
+        if len(calls) == 1:
+            return "Page 1: YES\nPage 2: NO"
+        return "YES"
+
+    monkeypatch.setattr(page_verifier, "get_completion_from_messages", fake_completion)
+
+    candidates = [PageCandidate(n, 4, needs_verification=True) for n in (1, 2, 3)]
+    candidates.append(PageCandidate(10, 9))
+
+    verified = PageVerifier(None).verify_pages(candidates, FakeExtractor(), batch=True)
+
+    assert [c.page_number for c in verified] == [1, 3, 10]
+    assert len(calls) == 2
+
+
+def test_concurrent_verification_stops_early(monkeypatch):
+    """Test that highest-confidence pages go first and verification stops once enough are confirmed."""
+    asked = []
+
+    async def fake_completion(messages, model=None):
+        page_text = messages[-1]["content"]
+        asked.append(page_text)
+        return "YES" if "Pin 2 " in page_text else "NO"
+
+    monkeypatch.setattr(page_verifier, "aget_completion_from_messages", fake_completion)
+
+    candidates = [PageCandidate(n, n, needs_verification=True) for n in (1, 2, 3)]
+    candidates.append(PageCandidate(10, 9))
+
+    verified = PageVerifier(None).verify_pages(
+        candidates, FakeExtractor(), max_concurrency=1, stop_after=1
+    )
+
+    assert [c.page_number for c in verified] == [2, 10]
+    assert len(asked) == 2  # pages 3 and 2; page 1 is never sent
+
+
+def test_run_async_closes_loop_client(monkeypatch):
+    """Test the per-loop AsyncOpenAI client is closed when the loop ends."""
+    from src import chat_bot
+
+    monkeypatch.setenv("FASTCHAT_API_KEY", "test")
+    clients = []
+
+    async def use_client():
+        clients.append(chat_bot._get_async_client())
+        return "done"
+
+    assert chat_bot.run_async(use_client()) == "done"
+    assert clients[0].is_closed()
+    assert len(chat_bot._async_clients) == 0
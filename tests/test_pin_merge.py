@@ -0,0 +1,85 @@
+"""Tests for merging per-chunk pin extraction results."""
+
+import json
+
+import pytest
+
+from src.llm.pin_merge import PinMerger
+from src.models.pin_data import PackageInfo, Pin, PinData
+
+
+def _chunk(pins, package="LQFP", pin_count=64, name="STM32F103RB"):
+    return PinData(
+        component_name=name,
+        package=PackageInfo(type=package, pin_count=pin_count, width=0.0, height=0.0),
+        pins=[Pin(number, pin_name) for number, pin_name in pins],
+        extraction_method="LLM",
+    )
+
+
+def test_dedupes_pins_and_votes_conflicts():
+    """Test overlapping chunks are deduplicated and disagreeing names are voted."""
+    chunks = [
+        _chunk([(1, "VBAT"), (2, "PC13"), (3, "PC14")]),
+        _chunk([(3, "PC14"), (4, "PC15"), (99, "PA0")]),
+        _chunk([(3, "OSC32_IN"), (4, "PC15")], package="Unknown", pin_count=0),
+    ]
+    merger = PinMerger()
+
+    merged = merger.merge(chunks)
+
+    assert [(p.number, p.name) for p in merged.pins] == [
+        (1, "VBAT"), (2, "PC13"), (3, "PC14"), (4, "PC15")
+    ]
+    assert (merged.package.type, merged.package.pin_count) == ("LQFP", 64)
+    assert merged.component_name == "STM32F103RB"
+    assert len(merger.conflicts) == 1
+    assert merger.conflicts[0].number == 3
+    assert merger.conflicts[0].names == ["PC14", "OSC32_IN"]
+
+
+def test_merge_is_independent_of_completion_order():
+    """Test the same chunk results in the same order always merge the same way."""
+    chunks = [_chunk([(1, "VDD"), (2, "PA0")]), _chunk([(2, "PA0-WKUP"), (3, "PA1")])]
+
+    first = PinMerger().merge(chunks)
+    second = PinMerger().merge(list(chunks))
+
+    assert first == second
+    # A tie between two names goes to the more specific one
+    assert first.pins[1].name == "PA0-WKUP"
+
+
+def test_map_reduce_sends_one_request_per_page(monkeypatch):
+    """Test each page chunk is extracted separately and the results merged."""
+    pytest.importorskip("openai")
+    from src.llm.client import LLMClient
+
+    pages = {
+        5: "\n".join(f"{n} PA{n} I/O GPIO port A bit {n} alternate functions" for n in range(1, 9)),
+        6: "\n".join(f"{n} PB{n} I/O GPIO port B bit {n} alternate functions" for n in range(9, 17)),
+    }
+    content = "\n\n".join(f"--- Page {page} ---\n{text}" for page, text in pages.items())
+    prompts = []
+
+    async def fake_acomplete(messages):
+        prompt = messages[-1]["content"]
+        prompts.append(prompt)
+        port = "PA" if "PA1 I/O" in prompt else "PB"
+        numbers = range(1, 9) if port == "PA" else range(8, 17)
+        return json.dumps({
+            "component_name": "ACME1",
+            "package": {"type": "LQFP", "pin_count": 16, "width": 0, "height": 0},
+            "pins": [{"number": n, "name": f"{port}{n}"} for n in numbers],
+        })
+
+    client = LLMClient(api_key="test", model="test-model")
+    monkeypatch.setattr(client, "acomplete", fake_acomplete)
+
+    pin_data = client.extract_pin_data_map_reduce(content)
+
+    assert len(prompts) == 2
+    assert all("chunk" in prompt and "of 2" in prompt for prompt in prompts)
+    assert [p.number for p in pin_data.pins] == list(range(1, 17))
+    assert pin_data.pins[7].name == "PA8"  # Overlap resolved toward the earlier page
+    assert [c.number for c in client.last_merge.conflicts] == [8]
@@ -0,0 +1,97 @@
+"""Tests for rule-based pin table parsing."""
+
+import pytest
+
+pytest.importorskip("pdfplumber")
+
+from src.pdf_extractor.content_extractor import ExtractedContent
+from src.pdf_extractor.pin_table_parser import PinTableParser
+
+
+def _content(tables, text="--- Page 3 ---\nNE555\nSOIC-8 package\nPin Functions"):
+    return ExtractedContent(pages=[3], text_content=text, images=[], tables=tables)
+
+
+HEADER = ["Pin No.", "Pin Name", "I/O", "Description"]
+ROWS = [
+    ["1", "GND", "", "Ground reference"],
+    ["2", "TRIG", "I", "Trigger input"],
+    ["3", "OUT", "O", "Output"],
+    ["4", "RESET(1)", "I", "Reset, active low"],
+    ["5", "CONT", "I", "Control voltage"],
+    ["6", "THRES", "I", "Threshold"],
+    ["7", "DISCH", "O", "Discharge"],
+    ["8", "VCC", "", "Supply voltage"],
+]
+
+
+def test_clean_table_skips_llm():
+    """Test a complete table (split over two pages) becomes PinData."""
+    tables = [(3, [HEADER] + ROWS[:5]), (4, [HEADER] + ROWS[5:])]
+
+    result = PinTableParser().parse(_content(tables))
+
+    assert result.ok, result.problems
+    assert result.pages == [3, 4]
+    pin_data = result.pin_data
+    assert pin_data.component_name == "NE555"
+    assert (pin_data.package.type, pin_data.package.pin_count) == ("SOIC", 8)
+    assert [p.name for p in pin_data.pins][:4] == ["GND", "TRIG", "OUT", "RESET"]
+    assert [p.function for p in pin_data.pins][:3] == ["ground", "input", "output"]
+    assert pin_data.pins[-1].function == "power"
+    assert pin_data.extraction_method == "Table"
+
+
+def test_combined_name_and_number_column():
+    """Test "PIN NAME NO." columns with cells like "EN 3" and unnumbered pads."""
+    table = [
+        ["PIN\nNAME NO.", "I/O", "DESCRIPTION"],
+        ["EN 2", "I", "Enable"],
+        ["VIN 1", "I", "Supply"],
+        ["GND 3, 4", "", "Ground"],
+        ["PowerPAD™", "", "Exposed pad"],
+    ]
+
+    text = "--- Page 5 ---\nDRV SON-4 package\nPin Functions"
+    result = PinTableParser().parse(_content([(5, table)], text=text))
+
+    assert result.ok, result.problems
+    assert [(p.number, p.name) for p in result.pin_data.pins] == [
+        (1, "VIN"), (2, "EN"), (3, "GND"), (4, "GND")
+    ]
+
+
+@pytest.mark.parametrize("rows, problem", [
+    (ROWS[:3] + ROWS[4:], "gaps"),  # Pin 4 missing
+    (ROWS + [["3", "THRES", "I", ""]], "both OUT and THRES"),
+    (ROWS[:6] + [["7", "DISCH", "O", ""]], "names SOIC-8"),  # 7 pins
+])
+def test_invalid_tables_fall_back(rows, problem):
+    """Test gaps, conflicting duplicates and count mismatches are rejected."""
+    result = PinTableParser().parse(_content([(3, [HEADER] + rows)]))
+
+    assert not result.ok
+    assert any(problem in p for p in result.problems)
+
+
+def test_unnamed_package_falls_back():
+    """Test a valid table is not trusted when the text names no package."""
+    result = PinTableParser().parse(_content([(3, [HEADER] + ROWS)], text="--- Page 3 ---\nNE555"))
+
+    assert not result.ok
+    assert result.problems == ["no package named in the text"]
+
+
+def test_package_variant_grid_is_not_parsed():
+    """Test tables numbered by ball (one column per package) are left to the LLM."""
+    table = [
+        ["Pins", None, "Pin name", "Type"],
+        ["LFBGA100", "LQFP64", None, None],
+        ["A3", "-", "PE2", "I/O"],
+        ["B3", "-", "PE3", "I/O"],
+        ["C3", "1", "PE4", "I/O"],
+    ]
+
+    result = PinTableParser().parse(_content([(28, table)]))
+
+    assert not result.ok
@@ -0,0 +1,51 @@
+"""Tests for the LLM response cache."""
+
+import time
+
+import pytest
+
+from src.llm.response_cache import FileResponseCache, ResponseCache, make_cache_key
+
+
+def test_cache_key_is_stable():
+    """Test that keys depend only on the request content."""
+    messages = [{"role": "user", "content": "pins?"}]
+
+    key = make_cache_key("chat", "llama-3", 0, messages)
+
+    assert key == make_cache_key("chat", "llama-3", 0, [dict(messages[0])])
+    assert key != make_cache_key("chat", "llama-3", 0.7, messages)
+    assert key != make_cache_key("chat", "other-model", 0, messages)
+
+
+def test_file_cache_hits_and_misses(tmp_path):
+    """Test hit/miss counters of the file backend."""
+    cache = FileResponseCache(tmp_path)
+
+    assert cache.get("k") is None
+    cache.set("k", '{"pins": []}')
+
+    assert cache.get("k") == '{"pins": []}'
+    assert cache.stats() == {"hits": 1, "misses": 1}
+
+
+def test_file_cache_ttl(tmp_path):
+    """Test that expired entries are treated as misses."""
+    cache = FileResponseCache(tmp_path, ttl_seconds=60)
+    cache.set("k", "value")
+
+    cache.ttl_seconds = -1
+    time.sleep(0.01)
+
+    assert cache.get("k") is None
+    assert cache.misses == 1
+
+
+def test_incomplete_backend_fails_at_construction():
+    """Test a backend missing _store cannot be instantiated."""
+    class LoadOnly(ResponseCache):
+        def _load(self, key):
+            return None
+
+    with pytest.raises(TypeError):
+        LoadOnly()
@@ -0,0 +1,133 @@
+"""Tests for the extraction service."""
+
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+pytest.importorskip("pdfplumber")
+
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+
+from src.service import ExtractionService, ThreadingHTTPServer, make_handler, parse_multipart
+
+
+def test_parse_multipart():
+    """Test file parts come back as bytes and plain fields as text."""
+    body = (
+        b"--XX\r\n"
+        b'Content-Disposition: form-data; name="file"; filename="a.pdf"\r\n'
+        b"Content-Type: application/pdf\r\n\r\n"
+        b"%PDF-1.4\r\n"
+        b"--XX\r\n"
+        b'Content-Disposition: form-data; name="part_number"\r\n\r\n'
+        b"NE555\r\n"
+        b"--XX--\r\n"
+    )
+
+    form = parse_multipart(body, "multipart/form-data; boundary=XX")
+
+    assert form == {"file": b"%PDF-1.4", "part_number": "NE555"}
+
+
+@pytest.fixture
+def service_url(tmp_path):
+    """Run the service with one worker on a free local port."""
+    service = ExtractionService(str(tmp_path), workers=1)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(service))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+    service.shutdown()
+
+
+def _post_json(url, payload):
+    request = urllib.request.Request(
+        url, data=json.dumps(payload).encode(), headers={"Content-Type": "application/json"}
+    )
+    return urllib.request.urlopen(request)
+
+
+def test_rejects_bad_jobs(service_url):
+    """Test bad bodies, missing files, bad options and unknown jobs are client errors."""
+    with pytest.raises(urllib.error.HTTPError) as error:
+        _post_json(f"{service_url}/jobs", {"pdf_path": "/no/such/file.pdf"})
+    assert error.value.code == 400
+
+    with pytest.raises(urllib.error.HTTPError) as error:
+        _post_json(f"{service_url}/jobs", {"pdf_path": __file__, "options": {"bogus": 1}})
+    assert error.value.code == 400
+    assert "bogus" in json.load(error.value)["error"]
+
+    for payload in ([], {"pdf_path": __file__, "options": {"workers": "x"}}):
+        with pytest.raises(urllib.error.HTTPError) as error:
+            _post_json(f"{service_url}/jobs", payload)
+        assert error.value.code == 400
+
+    with pytest.raises(urllib.error.HTTPError) as error:
+        urllib.request.urlopen(f"{service_url}/jobs/unknown")
+    assert error.value.code == 404
+
+    health = json.load(urllib.request.urlopen(f"{service_url}/health"))
+    assert health["workers"] == 1
+
+
+def test_finished_future_and_refused_submit(tmp_path, monkeypatch):
+    """Test an already-finished future does not deadlock and a refused submit is an error."""
+    service = ExtractionService(str(tmp_path), workers=1)
+    try:
+        done = Future()
+        done.set_result({"pins": 8})
+        monkeypatch.setattr(service._pool, "submit", lambda *args, **kwargs: done)
+        job = service.submit(pdf_path=__file__)
+        assert job.status == "done"
+
+        def refuse(*args, **kwargs):
+            raise BrokenProcessPool("pool is gone")
+
+        monkeypatch.setattr(service._pool, "submit", refuse)
+        job = service.submit(pdf_path=__file__)
+        assert job.status == "error"
+        assert "BrokenProcessPool" in job.error
+    finally:
+        service.shutdown()
+
+
+def test_finished_jobs_and_uploads_are_removed(tmp_path, monkeypatch):
+    """Test uploads are deleted when a job finishes and old jobs are forgotten."""
+    service = ExtractionService(str(tmp_path), workers=1, max_finished_jobs=1)
+    try:
+        done = Future()
+        done.set_result({"pins": 8})
+        monkeypatch.setattr(service._pool, "submit", lambda *args, **kwargs: done)
+        first = service.submit(pdf_bytes=b"%PDF-1.4")
+        assert first.status == "done"
+        assert not (tmp_path / "uploads" / f"{first.job_id}.pdf").exists()
+
+        second = service.submit(pdf_bytes=b"%PDF-1.4")
+        third = service.submit(pdf_bytes=b"%PDF-1.4")
+        assert service.get(first.job_id) is None
+        assert service.get(second.job_id) is None
+        assert service.get(third.job_id) is third
+    finally:
+        service.shutdown()
+
+
+def test_shutdown_cancels_queued_jobs(tmp_path, monkeypatch):
+    """Test jobs still queued at shutdown are cancelled and recorded as errors."""
+    service = ExtractionService(str(tmp_path), workers=1)
+    pending = Future()
+    monkeypatch.setattr(service._pool, "submit", lambda *args, **kwargs: pending)
+    job = service.submit(pdf_bytes=b"%PDF-1.4")
+
+    service.shutdown()
+
+    assert pending.cancelled()
+    assert job.status == "error"
+    assert "CancelledError" in job.error
+    assert not (tmp_path / "uploads" / f"{job.job_id}.pdf").exists()
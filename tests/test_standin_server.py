@@ -0,0 +1,59 @@
+"""Tests for the stand-in LLM and vision server."""
+
+import json
+
+import pytest
+
+pytest.importorskip("openai")
+pytest.importorskip("requests")
+
+from benchmarks.standin_server import StandinConfig, start_in_thread
+from src import chat_bot, config
+from src.llm import LLMClient
+from src.llm.image_ocr_client import ImageOCRClient
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 32
+
+
+@pytest.fixture
+def standin():
+    """Stand-in server on a free port."""
+    servers = []
+
+    def start(**config):
+        server = start_in_thread(StandinConfig(**config))
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def test_llm_client_gets_recorded_pin_data(standin, monkeypatch):
+    """Test chat completions over the OpenAI client, matched by part number."""
+    server = standin()
+    monkeypatch.setattr(config, "_settings", config.Settings(llm_base_url=f"{server.base_url}/v1"))
+    monkeypatch.setattr(chat_bot, "client", None)
+    monkeypatch.setenv("FASTCHAT_API_KEY", "standin")
+
+    pin_data = LLMClient(api_key="standin").extract_pin_data("NE555 pin configuration")
+
+    assert pin_data.component_name == "NE555"
+    assert [p.name for p in pin_data.pins][:3] == ["GND", "TRIG", "OUT"]
+    assert server.stats["chat"] == 1
+
+
+def test_vision_retries_injected_errors(standin):
+    """Test describe_image errors are retried and pinout prompts get JSON pins."""
+    server = standin(fail_first=1, error_status=503)
+
+    with ImageOCRClient(api_url=f"{server.base_url}/describe_image/", backoff_factor=0) as client:
+        result = client.extract_pinout_from_image(PNG, part_number="MC74HC595A")
+        layout = client.describe_image(PNG, "Describe the pin layout")
+
+    assert result.component_name == "MC74HC595A"
+    assert len(result.pins) == 16
+    assert "Pin Count: 16" in json.loads(layout.text)["description"]
+    assert server.stats == {"chat": 0, "vision": 3, "errors": 1}
@@ -0,0 +1,77 @@
+"""Tests for stage tracing."""
+
+import asyncio
+import json
+
+import pytest
+
+from src.utils import tracing
+
+
+@pytest.fixture
+def tracer():
+    """Enable tracing for one test."""
+    tracing.enable()
+    yield tracing.get_tracer()
+    tracing.disable()
+    tracing.get_tracer().reset()
+
+
+def test_disabled_spans_are_not_recorded():
+    """Test spans are no-ops while tracing is off."""
+    tracing.get_tracer().reset()
+    with tracing.span("ignored") as span:
+        span.set(bytes=1)
+    assert tracing.get_tracer().records == []
+
+
+def test_nested_spans_and_summary(tracer):
+    """Test parent links, attributes and self time."""
+    with tracing.span("outer"):
+        with tracing.span("inner", "llm", page=3) as span:
+            span.set(prompt_tokens=10)
+        with tracing.span("inner"):
+            pass
+
+    records = {r.name: r for r in tracer.records}
+    inner = [r for r in tracer.records if r.name == "inner"]
+    assert all(r.parent_id == records["outer"].span_id for r in inner)
+    assert inner[0].args == {"page": 3, "prompt_tokens": 10}
+
+    rows = {row["name"]: row for row in tracer.summary()}
+    assert rows["inner"]["count"] == 2
+    assert rows["outer"]["self"] <= rows["outer"]["total"]
+    assert "outer" in tracer.format_summary()
+
+
+def test_concurrent_tasks_nest_under_their_own_parent(tracer):
+    """Test asyncio tasks do not see each other's open spans."""
+    async def task(name):
+        with tracing.span(name):
+            await asyncio.sleep(0.01)
+            with tracing.span(f"{name}.child"):
+                await asyncio.sleep(0)
+
+    async def run():
+        await asyncio.gather(task("a"), task("b"))
+
+    asyncio.run(run())
+
+    records = {r.name: r for r in tracer.records}
+    assert records["a.child"].parent_id == records["a"].span_id
+    assert records["b.child"].parent_id == records["b"].span_id
+
+
+def test_chrome_trace(tracer, tmp_path):
+    """Test the trace file holds one complete event per span."""
+    with pytest.raises(ValueError):
+        with tracing.span("failing"):
+            raise ValueError("boom")
+
+    path = tmp_path / "trace.json"
+    tracer.write_chrome_trace(path)
+    events = json.loads(path.read_text())["traceEvents"]
+
+    assert len(events) == 1
+    assert events[0]["ph"] == "X"
+    assert events[0]["args"] == {"error": "ValueError"}